@@ -1,22 +1,21 @@
 """Utilities for fetching CGM data from the UC backend without saving to disk."""
 from __future__ import annotations
 
+import asyncio
 import os
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta, timezone
-from typing import Iterable, List, Sequence
+from functools import partial
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Sequence
 
+import numpy as np
 import pandas as pd
-import requests
 
-from api_clients.cgm_client import (
-    convert_excursion_trend_result,
-    convert_rolling_stats_response,
-)
-from models.cgm_models import (
-    CgmExcursionTrendResult,
-    CgmRollingStatsResponse,
-)
+# requests, the pydantic response models and the API clients are imported
+# where they are used so that importing this module stays cheap.
+from cgm_patterns.parsing import entries_to_columns, loads, parse_local_times, parse_utc_timestamps
 from cgm_patterns.models import (
     CGMDay,
     ExcursionTrendSummary,
@@ -28,6 +27,9 @@ from cgm_patterns.models import (
 _BASE_URL = os.getenv("AI_RAG_UC_BACKEND_API_BASE_URL") or "https://uc-prod.ihealth-eng.com/v1/uc"
 _SESSION_TOKEN = os.getenv("AI_RAG_UC_BACKEND_SESSION_TOKEN")
 _TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_DEFAULT_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DEFAULT_CHUNK_DAYS = 30
+DEFAULT_CONCURRENCY = 4
 
 
 @dataclass(frozen=True)
@@ -49,9 +51,11 @@ def _request(path: str, payload: dict) -> dict:
         "accept": "application/json",
         "origin": "https://portal.ihealthunifiedcare.com",
     }
+    import requests
+
     response = requests.post(url, json=payload, headers=headers, timeout=30)
     response.raise_for_status()
-    return response.json()
+    return loads(response.content)
 
 
 def _format_utc_offset(offset: timedelta) -> str:
@@ -65,65 +69,56 @@ def _format_utc_offset(offset: timedelta) -> str:
 
 
 def _parse_flat_readings(entries: Sequence[dict], patient_id: str) -> List[CGMDay]:
-    frame = pd.DataFrame(entries)
-    if frame.empty:
-        return []
-
-    timestamp_key = next((key for key in ("timestamp", "utc", "time") if key in frame.columns), None)
-    if timestamp_key is None:
-        return []
-
-    frame["timestamp"] = pd.to_datetime(frame[timestamp_key], errors="coerce", utc=True)
-    frame = frame.dropna(subset=["timestamp"])
-    if frame.empty:
+    columns = entries_to_columns(entries)
+    timestamp_key = next((key for key in ("timestamp", "utc", "time") if key in columns), None)
+    glucose_key = next((key for key in ("glucose_mg_dL", "value", "glucoseValue") if key in columns), None)
+    if timestamp_key is None or glucose_key is None:
         return []
 
-    if "glucose_mg_dL" not in frame.columns:
-        if "value" in frame.columns:
-            frame["glucose_mg_dL"] = frame["value"]
-        elif "glucoseValue" in frame.columns:
-            frame["glucose_mg_dL"] = frame["glucoseValue"]
-
-    if "glucose_mg_dL" not in frame.columns:
-        return []
+    timestamps = parse_utc_timestamps(columns[timestamp_key])
+    utc_wall = timestamps.tz_localize(None).to_numpy()
+    glucose = pd.to_numeric(pd.Series(columns[glucose_key], dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    if "localTime" in columns:
+        local_wall = parse_local_times(columns["localTime"])
+    else:
+        local_wall = np.full(len(utc_wall), np.datetime64("NaT"), dtype="datetime64[ns]")
 
-    frame["glucose_mg_dL"] = pd.to_numeric(frame["glucose_mg_dL"], errors="coerce")
-    frame = frame.dropna(subset=["glucose_mg_dL"])
-    if frame.empty:
+    keep = ~np.isnat(utc_wall) & ~np.isnan(glucose)
+    if not keep.any():
         return []
-
-    if "localTime" in frame.columns:
-        frame["local_timestamp"] = pd.to_datetime(frame["localTime"], errors="coerce")
+    # Service dates come from local time when any is present; rows without one are dropped.
+    if (~np.isnat(local_wall[keep])).any():
+        day_keys = local_wall.astype("datetime64[D]")
+        keep &= ~np.isnat(local_wall)
     else:
-        frame["local_timestamp"] = pd.NaT
+        day_keys = utc_wall.astype("datetime64[D]")
 
-    if frame["local_timestamp"].notna().any():
-        frame["service_date"] = frame["local_timestamp"].dt.date
-    else:
-        frame["service_date"] = frame["timestamp"].dt.tz_convert(timezone.utc).dt.date
+    positions = np.flatnonzero(keep)
+    positions = positions[np.lexsort((utc_wall[positions], day_keys[positions]))]
+    sorted_days = day_keys[positions]
+    starts = np.concatenate(([0], np.flatnonzero(sorted_days[1:] != sorted_days[:-1]) + 1))
+    ends = np.append(starts[1:], len(positions))
+    offsets = local_wall - utc_wall
 
-    frame = frame.sort_values("timestamp")
+    frame = pd.DataFrame(columns)
+    frame["timestamp"] = timestamps
+    frame["glucose_mg_dL"] = glucose
 
     results: List[CGMDay] = []
-    for service_date, group in frame.groupby("service_date", sort=True):
-        group = group.copy()
+    for first, last in zip(starts, ends):
+        group_positions = positions[first:last]
         timezone_label = None
-        local_samples = group["local_timestamp"].dropna()
-        if not local_samples.empty:
-            idx = local_samples.index[0]
-            local_dt = local_samples.iloc[0].to_pydatetime()
-            utc_dt = group.loc[idx, "timestamp"].to_pydatetime()
-            offset = local_dt - utc_dt.replace(tzinfo=None)
+        group_offsets = offsets[group_positions]
+        valid = group_offsets[~np.isnat(group_offsets)]
+        if valid.size:
+            offset = timedelta(microseconds=int(valid[0].astype("timedelta64[us]").astype(np.int64)))
             if abs(offset) <= timedelta(hours=14):
                 timezone_label = _format_utc_offset(offset)
-        readings = group.drop(columns=["service_date"])
-        if "local_timestamp" in readings.columns:
-            readings = readings.drop(columns=["local_timestamp"])
         results.append(
             CGMDay(
                 patient_id=patient_id,
-                service_date=service_date,
-                readings=readings,
+                service_date=sorted_days[first].astype(date),
+                readings=frame.take(group_positions),
                 local_timezone=timezone_label,
             )
         )
@@ -144,10 +139,10 @@ def _parse_days(container: dict, patient_id: str) -> List[CGMDay]:
 
     results: List[CGMDay] = []
     for item in days:
-        readings = pd.DataFrame(item.get("readings", []))
+        readings = pd.DataFrame(entries_to_columns(item.get("readings", [])))
         if readings.empty:
             continue
-        readings["timestamp"] = pd.to_datetime(readings["timestamp"], utc=True)
+        readings["timestamp"] = parse_utc_timestamps(readings["timestamp"].tolist(), errors="raise")
         service_date_str = item.get("serviceDate")
         service_dt = datetime.fromisoformat(service_date_str.replace("Z", "+00:00")) if service_date_str else None
         results.append(
@@ -161,44 +156,233 @@ def _parse_days(container: dict, patient_id: str) -> List[CGMDay]:
     return results
 
 
-def _fetch_raw_days(patient_id: str, start: datetime, end: datetime) -> List[CGMDay]:
-    payload = {
+def _reading_payload(patient_id: str, start: datetime, end: datetime) -> dict:
+    return {
         "patientId": patient_id,
         "startTime": start.strftime(_TIME_FORMAT),
         "endTime": end.strftime(_TIME_FORMAT),
-        "includeAvailableDates": True,
         "includeRawData": True,
     }
+
+
+def _fetch_reading_index(patient_id: str, start: datetime, end: datetime) -> dict:
+    """Fetch the range request, returning its unparsed ``data`` container with the available dates."""
+
+    payload = _reading_payload(patient_id, start, end)
+    payload["includeAvailableDates"] = True
     response = _request("/cgm/reading", payload)
-    data = response.get("data", {}) or {}
+    return response.get("data", {}) or {}
+
+
+def _available_start(date_str: str) -> datetime:
+    return datetime.fromisoformat(date_str.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+def _fetch_available_date(patient_id: str, date_str: str) -> dict:
+    narrowed_start = _available_start(date_str)
+    narrowed_end = narrowed_start + timedelta(days=1) - timedelta(seconds=1)
+    sub_response = _request("/cgm/reading", _reading_payload(patient_id, narrowed_start, narrowed_end))
+    return sub_response.get("data", {}) or {}
+
+
+def _chunk_ranges(start: datetime, end: datetime, chunk_days: int) -> list[tuple[datetime, datetime]]:
+    """Split ``[start, end]`` into contiguous ranges of at most ``chunk_days`` days."""
+
+    if chunk_days < 1:
+        raise ValueError("chunk_days must be >= 1")
+    ranges: list[tuple[datetime, datetime]] = []
+    step = timedelta(days=chunk_days)
+    cursor = start
+    while cursor <= end:
+        chunk_end = min(cursor + step - timedelta(seconds=1), end)
+        ranges.append((cursor, chunk_end))
+        cursor = chunk_end + timedelta(seconds=1)
+    return ranges
 
-    days = _parse_days(data, patient_id)
-    available_dates = data.get("availableDates") or []
 
+def _plan_date_requests(
+    available_dates: Iterable[str],
+    start: datetime,
+    end: datetime,
+    *,
+    bounds: tuple[datetime, datetime],
+    first: bool,
+    last: bool,
+) -> list[str]:
+    """Return the available dates a chunk still has to fetch individually.
+
+    A date is owned by the chunk whose range contains its start, so
+    neighbouring chunks never request it twice. Dates whose whole local day
+    lies inside ``bounds`` are skipped because the range requests already
+    return every reading for them. Only days cut off at the edges of the
+    overall range are completed with a per-date request.
+    """
+
+    range_start, range_end = bounds
+    planned: list[str] = []
     for date_str in available_dates:
-        narrowed_start = datetime.fromisoformat(date_str.replace("Z", "+00:00")).astimezone(timezone.utc)
-        narrowed_end = narrowed_start + timedelta(days=1) - timedelta(seconds=1)
-        sub_payload = {
-            "patientId": patient_id,
-            "startTime": narrowed_start.strftime(_TIME_FORMAT),
-            "endTime": narrowed_end.strftime(_TIME_FORMAT),
-            "includeRawData": True,
-        }
-        sub_response = _request("/cgm/reading", sub_payload)
-        days.extend(_parse_days(sub_response.get("data", {}) or {}, patient_id))
+        date_start = _available_start(date_str)
+        if not ((first or date_start >= start) and (last or date_start <= end)):
+            continue
+        date_end = date_start + timedelta(days=1) - timedelta(seconds=1)
+        if range_start <= date_start and date_end <= range_end:
+            continue
+        planned.append(date_str)
+    return planned
+
+
+def _fetch_chunk_payloads(
+    patient_id: str,
+    start: datetime,
+    end: datetime,
+    *,
+    bounds: tuple[datetime, datetime] | None = None,
+    first: bool = True,
+    last: bool = True,
+) -> list[dict]:
+    """Fetch one range plus its planned per-date requests as unparsed ``data`` containers."""
+
+    index = _fetch_reading_index(patient_id, start, end)
+    planned = _plan_date_requests(
+        list(index.get("availableDates") or []),
+        start,
+        end,
+        bounds=bounds or (start, end),
+        first=first,
+        last=last,
+    )
+    return [index, *(_fetch_available_date(patient_id, date_str) for date_str in planned)]
+
+
+def _fetch_chunk(
+    patient_id: str,
+    start: datetime,
+    end: datetime,
+    *,
+    bounds: tuple[datetime, datetime] | None = None,
+    first: bool = True,
+    last: bool = True,
+) -> List[CGMDay]:
+    """Fetch one range plus its planned per-date requests, merged by service date."""
+
+    containers = _fetch_chunk_payloads(patient_id, start, end, bounds=bounds, first=first, last=last)
+    return parse_reading_payloads(patient_id, containers)
+
+
+def _chunk_job(
+    patient_id: str,
+    ranges: Sequence[tuple[datetime, datetime]],
+    index: int,
+) -> Callable[[], List[CGMDay]]:
+    chunk_start, chunk_end = ranges[index]
+    return partial(
+        _fetch_chunk,
+        patient_id,
+        chunk_start,
+        chunk_end,
+        bounds=(ranges[0][0], ranges[-1][1]),
+        first=index == 0,
+        last=index == len(ranges) - 1,
+    )
+
+
+def _merge_days(first: CGMDay, second: CGMDay) -> CGMDay:
+    """Union two partial copies of the same service date, dropping repeated readings."""
+
+    readings = pd.concat([first.readings, second.readings], ignore_index=True)
+    if "timestamp" in readings.columns:
+        readings = readings.drop_duplicates(subset="timestamp").sort_values("timestamp", kind="stable")
+    return replace(
+        first,
+        readings=readings.reset_index(drop=True),
+        local_timezone=first.local_timezone or second.local_timezone,
+    )
+
 
-    return days
+def _merge_into(merged: dict[date, CGMDay], days: Iterable[CGMDay]) -> None:
+    for day in days:
+        existing = merged.get(day.service_date)
+        merged[day.service_date] = day if existing is None else _merge_days(existing, day)
+
+
+def _merge_by_service_date(days: Iterable[CGMDay]) -> List[CGMDay]:
+    """Collapse days sharing a service date into one, in date order."""
+
+    merged: dict[date, CGMDay] = {}
+    _merge_into(merged, days)
+    return [merged[service_date] for service_date in sorted(merged)]
+
+
+class _DayStitcher:
+    """Merge chunk results by service date and release days in date order."""
+
+    def __init__(self) -> None:
+        self._pending: dict[date, CGMDay] = {}
+
+    def add(self, days: Iterable[CGMDay]) -> None:
+        _merge_into(self._pending, days)
+
+    def release(self, before: date | None = None) -> list[CGMDay]:
+        """Pop days earlier than ``before`` (all days when ``before`` is None)."""
+
+        ready = sorted(d for d in self._pending if before is None or d < before)
+        return [self._pending.pop(service_date) for service_date in ready]
+
+
+def _release_horizon(ranges: Sequence[tuple[datetime, datetime]], index: int) -> date | None:
+    # A local date can start up to 14h before its UTC date, so the next chunk
+    # may still contribute readings to the day before its own start.
+    if index + 1 >= len(ranges):
+        return None
+    return ranges[index + 1][0].date() - timedelta(days=1)
+
+
+def _iter_raw_days(
+    patient_id: str,
+    start: datetime,
+    end: datetime,
+    *,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[CGMDay]:
+    """Fetch ``[start, end]`` in chunks, at most ``concurrency`` at a time, yielding days in order."""
+
+    ranges = _chunk_ranges(start, end, chunk_days)
+    stitcher = _DayStitcher()
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    in_flight: deque[Future[List[CGMDay]]] = deque()
+    try:
+        for index in range(len(ranges)):
+            while len(in_flight) < max(1, concurrency) and index + len(in_flight) < len(ranges):
+                in_flight.append(executor.submit(_chunk_job(patient_id, ranges, index + len(in_flight))))
+            stitcher.add(in_flight.popleft().result())
+            yield from stitcher.release(_release_horizon(ranges, index))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _fetch_raw_days(patient_id: str, start: datetime, end: datetime) -> List[CGMDay]:
+    return list(_iter_raw_days(patient_id, start, end))
 
 
 def build_input_bundle(
     patient_id: str,
     *,
-    start: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc),
+    start: datetime = _DEFAULT_START,
     end: datetime | None = None,
 ) -> PatternInputBundle:
     if end is None:
         end = datetime.now(timezone.utc)
 
+    from api_clients.cgm_client import (
+        convert_excursion_trend_result,
+        convert_rolling_stats_response,
+    )
+    from models.cgm_models import (
+        CgmExcursionTrendResult,
+        CgmRollingStatsResponse,
+    )
+
     days = _fetch_raw_days(patient_id, start, end)
     days.sort(key=lambda d: d.service_date)
 
@@ -228,11 +412,102 @@ def build_input_bundle(
     )
 
 
-def iter_cgm_days(patient_id: str, *, start: datetime | None = None, end: datetime | None = None) -> Iterable[CGMDay]:
-    bundle = build_input_bundle(
+def count_available_dates(
+    patient_id: str,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> int:
+    """Return how many days have readings in ``[start, end]``, without fetching the readings."""
+
+    payload = _reading_payload(patient_id, start or _DEFAULT_START, end or datetime.now(timezone.utc))
+    payload["includeRawData"] = False
+    payload["includeAvailableDates"] = True
+    data = _request("/cgm/reading", payload).get("data", {}) or {}
+    return len(data.get("availableDates") or [])
+
+
+def fetch_reading_payloads(
+    patient_id: str,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+) -> list[dict]:
+    """Fetch a patient's ``/cgm/reading`` containers without parsing them into days.
+
+    Only the network round-trips and JSON decoding happen here; pass the result
+    to :func:`parse_reading_payloads`. Chunks are fetched one after another, so
+    callers control concurrency across patients.
+    """
+
+    ranges = _chunk_ranges(start or _DEFAULT_START, end or datetime.now(timezone.utc), chunk_days)
+    bounds = (ranges[0][0], ranges[-1][1]) if ranges else None
+    containers: list[dict] = []
+    for index, (chunk_start, chunk_end) in enumerate(ranges):
+        containers.extend(
+            _fetch_chunk_payloads(
+                patient_id,
+                chunk_start,
+                chunk_end,
+                bounds=bounds,
+                first=index == 0,
+                last=index == len(ranges) - 1,
+            )
+        )
+    return containers
+
+
+def parse_reading_payloads(patient_id: str, containers: Iterable[dict]) -> List[CGMDay]:
+    """Parse fetched ``/cgm/reading`` containers into days merged by service date."""
+
+    return _merge_by_service_date(day for container in containers for day in _parse_days(container, patient_id))
+
+
+def iter_cgm_days(
+    patient_id: str,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterable[CGMDay]:
+    # Only readings are needed here; rolling stats and excursions are left to build_input_bundle.
+    yield from _iter_raw_days(
         patient_id,
-        start=start or datetime(2024, 1, 1, tzinfo=timezone.utc),
-        end=end,
+        start or _DEFAULT_START,
+        end or datetime.now(timezone.utc),
+        chunk_days=chunk_days,
+        concurrency=concurrency,
     )
-    for day in bundle.analysis_days:
-        yield day
+
+
+async def aiter_cgm_days(
+    patient_id: str,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> AsyncIterator[CGMDay]:
+    """Stream a patient's days in date order while later chunks are still in flight.
+
+    Up to ``concurrency`` chunk requests run in worker threads ahead of the
+    consumer, so callers can start on the first days before the rest of the
+    history has arrived.
+    """
+
+    ranges = _chunk_ranges(start or _DEFAULT_START, end or datetime.now(timezone.utc), chunk_days)
+    stitcher = _DayStitcher()
+    in_flight: deque[asyncio.Task[List[CGMDay]]] = deque()
+    try:
+        for index in range(len(ranges)):
+            while len(in_flight) < max(1, concurrency) and index + len(in_flight) < len(ranges):
+                job = _chunk_job(patient_id, ranges, index + len(in_flight))
+                in_flight.append(asyncio.create_task(asyncio.to_thread(job)))
+            stitcher.add(await in_flight.popleft())
+            for day in stitcher.release(_release_horizon(ranges, index)):
+                yield day
+    finally:
+        for task in in_flight:
+            task.cancel()
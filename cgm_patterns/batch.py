@@ -0,0 +1,253 @@
+"""Resumable, chunked batch runs over a patient list.
+
+:class:`BatchManifest` records every patient's status, attempt count and
+result in SQLite, committing each patient as it finishes. :func:`run_chunked`
+numbers the list in chunks of ``chunk_size``, runs every pending patient on
+one thread pool, retries failed patients in later rounds with exponential
+backoff, and skips patients the manifest already marks done, so rerunning
+after a crash only processes what is left. Chunks group patients for resume
+and progress reporting only; workers are never held back at a chunk boundary.
+:meth:`BatchManifest.results` merges the completed patients into one dataset.
+The manifest also records the run parameters it was started with, so a rerun
+with other parameters is refused instead of merging results that no longer
+match.
+"""
+from __future__ import annotations
+
+import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from .cache import _SqliteBackend
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class BatchManifest(_SqliteBackend):
+    """Per-patient completion records for one batch run.
+
+    A manifest may hold patients from earlier lists; queries take the
+    current ``patient_ids`` so those are neither run nor merged.
+    """
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS batch_patients ("
+        " patient_id TEXT PRIMARY KEY,"
+        " chunk INTEGER NOT NULL,"
+        " status TEXT NOT NULL,"
+        " attempts INTEGER NOT NULL DEFAULT 0,"
+        " error TEXT,"
+        " result TEXT,"
+        " seconds REAL,"
+        " updated_at TEXT NOT NULL);"
+        "CREATE TABLE IF NOT EXISTS batch_parameters ("
+        " id INTEGER PRIMARY KEY CHECK (id = 0),"
+        " parameters TEXT NOT NULL)"
+    )
+
+    def bind(self, parameters: Mapping[str, Any], *, reset: bool = False) -> None:
+        """Record the run ``parameters``, or check them against the recorded ones.
+
+        Results are only valid for the parameters that produced them, so a
+        mismatch raises ``ValueError`` unless ``reset`` is set, in which case
+        every patient record is dropped and the new parameters are recorded.
+        """
+
+        encoded = json.dumps(parameters, sort_keys=True, default=str)
+        connection = self._connection()
+        with connection:
+            row = connection.execute("SELECT parameters FROM batch_parameters WHERE id = 0").fetchone()
+            if row is not None and row[0] == encoded:
+                return
+            if row is not None and not reset:
+                recorded = json.loads(row[0])
+                current = json.loads(encoded)
+                changed = sorted(key for key in recorded.keys() | current.keys() if recorded.get(key) != current.get(key))
+                raise ValueError(
+                    f"Manifest was started with different run parameters ({', '.join(changed)}); "
+                    "use a new manifest or reset it"
+                )
+            if row is not None:
+                connection.execute("DELETE FROM batch_patients")
+            connection.execute("INSERT OR REPLACE INTO batch_parameters (id, parameters) VALUES (0, ?)", (encoded,))
+
+    def register(self, patient_ids: Iterable[str], chunk_size: int) -> None:
+        """Add new patients as pending, numbering chunks in list order.
+
+        Patients already in the manifest keep their chunk and status.
+        """
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        now = _now()
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO batch_patients (patient_id, chunk, status, updated_at) VALUES (?, ?, ?, ?)",
+                [
+                    (patient_id, index // chunk_size, PENDING, now)
+                    for index, patient_id in enumerate(dict.fromkeys(patient_ids))
+                ],
+            )
+
+    def pending_chunks(self, patient_ids: Iterable[str], max_attempts: int) -> dict[int, list[str]]:
+        """Return ``patient_ids`` that are unfinished with attempts left, by chunk."""
+
+        wanted = set(patient_ids)
+        rows = self._connection().execute(
+            "SELECT chunk, patient_id FROM batch_patients"
+            " WHERE status != ? AND attempts < ? ORDER BY chunk, rowid",
+            (DONE, max_attempts),
+        ).fetchall()
+        chunks: dict[int, list[str]] = {}
+        for chunk, patient_id in rows:
+            if patient_id in wanted:
+                chunks.setdefault(chunk, []).append(patient_id)
+        return chunks
+
+    def mark_done(self, patient_id: str, result: Any, seconds: float) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "UPDATE batch_patients SET status = ?, attempts = attempts + 1, error = NULL,"
+                " result = ?, seconds = ?, updated_at = ? WHERE patient_id = ?",
+                (DONE, json.dumps(result), seconds, _now(), patient_id),
+            )
+
+    def mark_failed(self, patient_id: str, error: str) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "UPDATE batch_patients SET status = ?, attempts = attempts + 1, error = ?, updated_at = ?"
+                " WHERE patient_id = ?",
+                (FAILED, error, _now(), patient_id),
+            )
+
+    def counts(self, patient_ids: Iterable[str]) -> dict[str, int]:
+        wanted = set(patient_ids)
+        counts: dict[str, int] = {}
+        for patient_id, status in self._connection().execute("SELECT patient_id, status FROM batch_patients"):
+            if patient_id in wanted:
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def failures(self, patient_ids: Iterable[str]) -> dict[str, str]:
+        wanted = set(patient_ids)
+        rows = self._connection().execute(
+            "SELECT patient_id, error FROM batch_patients WHERE status = ? ORDER BY rowid", (FAILED,)
+        )
+        return {patient_id: error for patient_id, error in rows if patient_id in wanted}
+
+    def results(self, patient_ids: Iterable[str]) -> dict[str, Any]:
+        """Return the completed results of ``patient_ids``, in manifest order."""
+
+        wanted = set(patient_ids)
+        rows = self._connection().execute(
+            "SELECT patient_id, result FROM batch_patients WHERE status = ? ORDER BY rowid", (DONE,)
+        )
+        return {patient_id: json.loads(result) for patient_id, result in rows if patient_id in wanted}
+
+
+@dataclass
+class BatchReport:
+    """Outcome of one :func:`run_chunked` invocation."""
+
+    completed: int = 0
+    already_done: int = 0
+    retries: int = 0
+    failed: Mapping[str, str] = field(default_factory=dict)
+
+
+def run_chunked(
+    patient_ids: Sequence[str],
+    task: Callable[[str], Any],
+    manifest: BatchManifest,
+    *,
+    chunk_size: int = 50,
+    workers: int = 1,
+    max_attempts: int = 3,
+    backoff: float = 2.0,
+    max_backoff: float = 60.0,
+    on_complete: Callable[[str, int, int], None] | None = None,
+    on_chunk: Callable[[int, int], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    parameters: Mapping[str, Any] | None = None,
+) -> BatchReport:
+    """Run ``task`` for every patient not yet done in ``manifest``.
+
+    ``task`` returns a JSON-serializable result that is committed with the
+    patient's status. After each round, patients that raised are retried
+    once ``backoff * 2 ** (round - 1)`` seconds (capped at ``max_backoff``)
+    have passed, until they succeed or reach ``max_attempts``.
+    ``on_complete(patient_id, done, total)`` is called after each success and
+    ``on_chunk(chunk, failed)`` once every patient of a chunk has finished
+    its attempt in the current round. ``parameters`` are checked with
+    :meth:`BatchManifest.bind` before anything runs.
+    """
+
+    if parameters is not None:
+        manifest.bind(parameters)
+    manifest.register(patient_ids, chunk_size)
+    counts = manifest.counts(patient_ids)
+    report = BatchReport(already_done=counts.get(DONE, 0))
+    total = sum(counts.values())
+    done = report.already_done
+
+    def _timed(patient_id: str) -> tuple[Any, float]:
+        began = time.perf_counter()
+        result = task(patient_id)
+        return result, time.perf_counter() - began
+
+    retry_round = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        while chunks := manifest.pending_chunks(patient_ids, max_attempts):
+            if retry_round:
+                report.retries += sum(len(chunk) for chunk in chunks.values())
+                sleep(min(max_backoff, backoff * 2 ** (retry_round - 1)))
+            # Submit the whole round at once; chunk order only sets the queue order.
+            futures = {
+                executor.submit(_timed, patient_id): (index, patient_id)
+                for index, chunk in chunks.items()
+                for patient_id in chunk
+            }
+            remaining = {index: len(chunk) for index, chunk in chunks.items()}
+            failed = dict.fromkeys(chunks, 0)
+            try:
+                for future in as_completed(futures):
+                    index, patient_id = futures[future]
+                    try:
+                        result, seconds = future.result()
+                    except Exception:
+                        manifest.mark_failed(patient_id, traceback.format_exc(limit=5))
+                        failed[index] += 1
+                    else:
+                        manifest.mark_done(patient_id, result, seconds)
+                        report.completed += 1
+                        done += 1
+                        if on_complete is not None:
+                            on_complete(patient_id, done, total)
+                    remaining[index] -= 1
+                    if not remaining[index] and on_chunk is not None:
+                        on_chunk(index, failed[index])
+            except BaseException:
+                # A crash leaves queued patients pending for the next run instead of running them unrecorded.
+                for future in futures:
+                    future.cancel()
+                raise
+            retry_round += 1
+
+    report.failed = manifest.failures(patient_ids)
+    return report
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+__all__ = ["BatchManifest", "BatchReport", "DONE", "FAILED", "PENDING", "run_chunked"]
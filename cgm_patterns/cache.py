@@ -1,28 +1,555 @@
 """Caches for incremental CGM computations."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, Tuple
+import json
+import math
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from concurrent.futures import Executor, Future
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Generic, Protocol, TypeVar
 
-from .models import DailyCGMSummary
+from .models import DailyCGMSummary, PatternDetection, PatternStatus
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a summary cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+
+
+class SummaryCache(Protocol):
+    """Interface shared by the in-memory daily-summary cache backends.
+
+    Entries are keyed by date alone, so they only live for a run; summaries
+    reused across runs go through :class:`PersistentSummaryStore`, which
+    checks each day's ``summary_key`` first.
+    """
+
+    def get(self, patient_id: str, service_date: str) -> DailyCGMSummary | None:
+        ...
+
+    def set(self, summary: DailyCGMSummary) -> None:
+        ...
+
+    def evict_before(self, patient_id: str, service_date: str) -> None:
+        ...
+
+    def stats(self) -> CacheStats:
+        ...
 
 
 @dataclass
 class DailySummaryCache:
-    """Simple in-memory cache keyed by patient/date."""
+    """In-memory cache keyed by patient/date.
+
+    Entries are kept per patient in date order, so dropping the oldest day of
+    a sliding window is O(1). Days normally arrive in order; an older day
+    (e.g. the same patient run again) re-sorts that patient's entries.
+    ``max_entries`` optionally caps the total across patients; when exceeded,
+    the least recently used patient loses its oldest entries first.
+    """
 
-    _store: Dict[Tuple[str, str], DailyCGMSummary] = field(default_factory=dict)
+    max_entries: int | None = None
+    _store: OrderedDict[str, OrderedDict[str, DailyCGMSummary]] = field(default_factory=OrderedDict)
+    _size: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __len__(self) -> int:
+        return self._size
 
     def get(self, patient_id: str, service_date: str) -> DailyCGMSummary | None:
-        return self._store.get((patient_id, service_date))
+        entries = self._store.get(patient_id)
+        summary = entries.get(service_date) if entries is not None else None
+        if summary is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._store.move_to_end(patient_id)
+        return summary
 
     def set(self, summary: DailyCGMSummary) -> None:
-        key = (summary.patient_id, summary.service_date.isoformat())
-        self._store[key] = summary
+        patient_id = summary.patient_id
+        key = summary.service_date.isoformat()
+        entries = self._store.get(patient_id)
+        if entries is None:
+            entries = self._store[patient_id] = OrderedDict()
+        else:
+            self._store.move_to_end(patient_id)
+        if key not in entries:
+            self._size += 1
+            if entries and key < next(reversed(entries)):
+                entries[key] = summary
+                self._store[patient_id] = OrderedDict(sorted(entries.items()))
+                self._enforce_limit()
+                return
+        entries[key] = summary
+        self._enforce_limit()
+
+    def evict_before(self, patient_id: str, service_date: str) -> None:
+        """Drop a patient's entries dated before ``service_date`` (ISO format)."""
+
+        entries = self._store.get(patient_id)
+        if entries is None:
+            return
+        while entries and next(iter(entries)) < service_date:
+            entries.popitem(last=False)
+            self._size -= 1
+            self.evictions += 1
+        if not entries:
+            del self._store[patient_id]
 
     def prune(self, patient_id: str, keep_dates: set[str]) -> None:
         """Remove cached entries for a patient that are no longer needed."""
 
-        to_remove = [key for key in self._store if key[0] == patient_id and key[1] not in keep_dates]
-        for key in to_remove:
-            del self._store[key]
+        entries = self._store.get(patient_id)
+        if entries is None:
+            return
+        for key in [key for key in entries if key not in keep_dates]:
+            del entries[key]
+            self._size -= 1
+            self.evictions += 1
+        if not entries:
+            del self._store[patient_id]
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, evictions=self.evictions, entries=self._size)
+
+    def _enforce_limit(self) -> None:
+        if self.max_entries is None:
+            return
+        while self._size > self.max_entries and self._store:
+            patient_id, entries = next(iter(self._store.items()))
+            entries.popitem(last=False)
+            self._size -= 1
+            self.evictions += 1
+            if not entries:
+                del self._store[patient_id]
+
+
+class StripedSummaryCache:
+    """Thread-safe in-memory cache with patients spread over locked stripes.
+
+    Each stripe is a ``DailySummaryCache`` guarded by its own lock, so
+    engines running on different threads only contend when their patients
+    hash to the same stripe.
+    """
+
+    def __init__(self, stripes: int = 16, *, max_entries: int | None = None) -> None:
+        if stripes < 1:
+            raise ValueError("stripes must be >= 1")
+        per_stripe = None if max_entries is None else max(1, max_entries // stripes)
+        self._stripes = [DailySummaryCache(max_entries=per_stripe) for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+    def _index(self, patient_id: str) -> int:
+        return hash(patient_id) % len(self._stripes)
+
+    def get(self, patient_id: str, service_date: str) -> DailyCGMSummary | None:
+        index = self._index(patient_id)
+        with self._locks[index]:
+            return self._stripes[index].get(patient_id, service_date)
+
+    def set(self, summary: DailyCGMSummary) -> None:
+        index = self._index(summary.patient_id)
+        with self._locks[index]:
+            self._stripes[index].set(summary)
+
+    def evict_before(self, patient_id: str, service_date: str) -> None:
+        index = self._index(patient_id)
+        with self._locks[index]:
+            self._stripes[index].evict_before(patient_id, service_date)
+
+    def prune(self, patient_id: str, keep_dates: set[str]) -> None:
+        index = self._index(patient_id)
+        with self._locks[index]:
+            self._stripes[index].prune(patient_id, keep_dates)
+
+    def stats(self) -> CacheStats:
+        snapshots = []
+        for lock, stripe in zip(self._locks, self._stripes):
+            with lock:
+                snapshots.append(stripe.stats())
+        return CacheStats(
+            hits=sum(item.hits for item in snapshots),
+            misses=sum(item.misses for item in snapshots),
+            evictions=sum(item.evictions for item in snapshots),
+            entries=sum(item.entries for item in snapshots),
+        )
+
+
+class _SqliteBackend:
+    """Per-thread SQLite connections to a shared database file.
+
+    Each thread opens its own connection and WAL mode lets readers proceed
+    while another process writes. Pickling keeps only the path so backends
+    can be handed to worker processes.
+    """
+
+    _schema: str = ""
+
+    def __init__(self, path: str | Path, *, timeout: float = 30.0) -> None:
+        self._path = str(path)
+        self._timeout = timeout
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript(self._schema)
+        connection.commit()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"path": self._path, "timeout": self._timeout}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["path"], timeout=state["timeout"])
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path, timeout=self._timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+
+class PersistentSummaryStore(_SqliteBackend):
+    """Durable daily-summary store validated against the day's content.
+
+    Each row records the ``summary_key`` (a digest of the raw readings and
+    summary thresholds) it was computed from. ``load`` only returns a summary
+    when the key still matches, so unchanged days are never recomputed across
+    runs while edited or backfilled days are.
+    """
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS stored_summaries ("
+        " patient_id TEXT NOT NULL,"
+        " service_date TEXT NOT NULL,"
+        " summary_key TEXT NOT NULL,"
+        " payload TEXT NOT NULL,"
+        " PRIMARY KEY (patient_id, service_date))"
+    )
+
+    def load(self, patient_id: str, service_date: date, key: str) -> DailyCGMSummary | None:
+        row = self._connection().execute(
+            "SELECT payload FROM stored_summaries WHERE patient_id = ? AND service_date = ? AND summary_key = ?",
+            (patient_id, service_date.isoformat(), key),
+        ).fetchone()
+        return None if row is None else decode_summary(row[0])
+
+    def save(self, summary: DailyCGMSummary, key: str) -> None:
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO stored_summaries (patient_id, service_date, summary_key, payload)"
+            " VALUES (?, ?, ?, ?)",
+            (summary.patient_id, summary.service_date.isoformat(), key, encode_summary(summary)),
+        )
+        connection.commit()
+
+    def day_count(self, patient_id: str) -> int:
+        """Return how many days are stored for a patient (a proxy for history length)."""
+
+        (count,) = self._connection().execute(
+            "SELECT COUNT(*) FROM stored_summaries WHERE patient_id = ?",
+            (patient_id,),
+        ).fetchone()
+        return int(count)
+
+
+class DigestLedger(_SqliteBackend):
+    """Per-day reading digests recorded at the end of each incremental run.
+
+    Comparing a fresh fetch against the ledger tells the engine which days
+    were added, edited (late uploads, backfills) or removed since the last run.
+    """
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS day_digests ("
+        " patient_id TEXT NOT NULL,"
+        " service_date TEXT NOT NULL,"
+        " digest TEXT NOT NULL,"
+        " PRIMARY KEY (patient_id, service_date))"
+    )
+
+    def load(self, patient_id: str) -> dict[date, str]:
+        rows = self._connection().execute(
+            "SELECT service_date, digest FROM day_digests WHERE patient_id = ?",
+            (patient_id,),
+        ).fetchall()
+        return {date.fromisoformat(service_date): digest for service_date, digest in rows}
+
+    def save(self, patient_id: str, digests: Mapping[date, str]) -> None:
+        """Replace the patient's recorded digests in one transaction."""
+
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM day_digests WHERE patient_id = ?", (patient_id,))
+            connection.executemany(
+                "INSERT INTO day_digests (patient_id, service_date, digest) VALUES (?, ?, ?)",
+                [(patient_id, service_date.isoformat(), digest) for service_date, digest in digests.items()],
+            )
+
+
+class DetectionCache(Protocol):
+    """Interface for stores of rule detections keyed by ``digests.detection_key``."""
+
+    def get(self, key: str) -> PatternDetection | None:
+        ...
+
+    def set_many(self, items: Iterable[tuple[str, PatternDetection]]) -> None:
+        ...
+
+
+@dataclass
+class MemoryDetectionCache:
+    """In-memory detection cache with optional LRU bound."""
+
+    max_entries: int | None = None
+    _store: OrderedDict[str, PatternDetection] = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: str) -> PatternDetection | None:
+        detection = self._store.get(key)
+        if detection is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._store.move_to_end(key)
+        return detection
+
+    def set_many(self, items: Iterable[tuple[str, PatternDetection]]) -> None:
+        for key, detection in items:
+            self._store[key] = detection
+            self._store.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, evictions=self.evictions, entries=len(self._store))
+
+
+class SqliteDetectionCache(_SqliteBackend):
+    """Durable detection cache shared across runs and worker processes.
+
+    Keys embed the rule version, so releasing a new version of one rule
+    leaves every other rule's entries valid. Detections round-trip through
+    JSON (see ``encode_detection``).
+    """
+
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS detection_cache ("
+        " cache_key TEXT PRIMARY KEY,"
+        " payload TEXT NOT NULL)"
+    )
+
+    def __init__(self, path: str | Path, *, timeout: float = 30.0) -> None:
+        self._counter_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        super().__init__(path, timeout=timeout)
+
+    def get(self, key: str) -> PatternDetection | None:
+        row = self._connection().execute(
+            "SELECT payload FROM detection_cache WHERE cache_key = ?",
+            (key,),
+        ).fetchone()
+        with self._counter_lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return None if row is None else decode_detection(row[0])
+
+    def set_many(self, items: Iterable[tuple[str, PatternDetection]]) -> None:
+        rows = [(key, encode_detection(detection)) for key, detection in items]
+        if not rows:
+            return
+        connection = self._connection()
+        connection.executemany("INSERT OR REPLACE INTO detection_cache (cache_key, payload) VALUES (?, ?)", rows)
+        connection.commit()
+
+    def stats(self) -> CacheStats:
+        (entries,) = self._connection().execute("SELECT COUNT(*) FROM detection_cache").fetchone()
+        with self._counter_lock:
+            return CacheStats(hits=self._hits, misses=self._misses, evictions=0, entries=int(entries))
+
+
+def fetch_key_per_patient(patient_id: str, analysis_date: date) -> Hashable:
+    """Share one fetch per patient; suits snapshot endpoints."""
+
+    return patient_id
+
+
+def fetch_key_per_week(patient_id: str, analysis_date: date) -> Hashable:
+    """Share one fetch per patient and ISO week."""
+
+    year, week, _ = analysis_date.isocalendar()
+    return (patient_id, year, week)
+
+
+def fetch_key_per_date(patient_id: str, analysis_date: date) -> Hashable:
+    """Fetch once per patient and analysis date."""
+
+    return (patient_id, analysis_date)
+
+
+class CachedFetcher(Generic[T]):
+    """Memoize a ``(patient_id, analysis_date)`` fetcher under a pluggable key.
+
+    Concurrent callers with the same key share a single in-flight call. A call
+    that raises is dropped once it completes, so a transient API error is
+    retried by the next caller instead of sticking for the process lifetime.
+    At most ``max_entries`` keys are kept, least recently used first out. With
+    an ``executor``, ``prefetch`` starts the call in the background so it
+    overlaps with other work before the value is needed.
+    """
+
+    def __init__(
+        self,
+        fetcher: Callable[[str, date], T],
+        *,
+        key: Callable[[str, date], Hashable] = fetch_key_per_patient,
+        executor: Executor | None = None,
+        max_entries: int = 1024,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self._fetcher = fetcher
+        self._key = key
+        self._executor = executor
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._results: OrderedDict[Hashable, Future[T]] = OrderedDict()
+        self.calls = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"fetcher": self._fetcher, "key": self._key, "max_entries": self._max_entries}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["fetcher"], key=state["key"], max_entries=state["max_entries"])
+
+    def __call__(self, patient_id: str, analysis_date: date) -> T:
+        return self._resolve(patient_id, analysis_date, background=False).result()
+
+    def prefetch(self, patient_id: str, analysis_date: date) -> None:
+        """Start fetching in the background if an executor is configured."""
+
+        if self._executor is not None:
+            self._resolve(patient_id, analysis_date, background=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def _resolve(self, patient_id: str, analysis_date: date, *, background: bool) -> Future[T]:
+        cache_key = self._key(patient_id, analysis_date)
+        with self._lock:
+            future = self._results.get(cache_key)
+            if future is not None:
+                self._results.move_to_end(cache_key)
+                return future
+            self.calls += 1
+            if background:
+                future = self._executor.submit(self._fetcher, patient_id, analysis_date)
+            else:
+                future = Future()
+            self._results[cache_key] = future
+            while len(self._results) > self._max_entries:
+                self._results.popitem(last=False)
+        # Attached outside the lock: the callback runs at once if the call already finished.
+        future.add_done_callback(lambda done: self._forget_failure(cache_key, done))
+        if not background:
+            try:
+                future.set_result(self._fetcher(patient_id, analysis_date))
+            except Exception as exc:
+                future.set_exception(exc)
+        return future
+
+    def _forget_failure(self, cache_key: Hashable, future: Future[T]) -> None:
+        if future.cancelled() or future.exception() is not None:
+            with self._lock:
+                if self._results.get(cache_key) is future:
+                    del self._results[cache_key]
+
+
+def encode_summary(summary: DailyCGMSummary) -> str:
+    """Serialize a summary to JSON, preserving NaN metrics as null."""
+
+    payload: dict[str, Any] = {}
+    for key, value in asdict(summary).items():
+        if isinstance(value, date):
+            value = value.isoformat()
+        elif isinstance(value, float) and math.isnan(value):
+            value = None
+        payload[key] = value
+    return json.dumps(payload)
+
+
+def decode_summary(text: str) -> DailyCGMSummary:
+    """Inverse of ``encode_summary``."""
+
+    payload = json.loads(text)
+    payload["service_date"] = date.fromisoformat(payload["service_date"])
+    for key in ("mean_glucose", "std_glucose", "max_glucose", "min_glucose"):
+        if payload.get(key) is None:
+            payload[key] = float("nan")
+    return DailyCGMSummary(**payload)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "item"):  # NumPy scalars
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_detection(detection: PatternDetection) -> str:
+    """Serialize a detection to JSON; dates and NumPy scalars become plain values."""
+
+    payload = {
+        "pattern_id": detection.pattern_id,
+        "effective_date": detection.effective_date.isoformat(),
+        "status": detection.status.value,
+        "evidence": dict(detection.evidence),
+        "metrics": dict(detection.metrics),
+        "confidence": detection.confidence,
+        "version": detection.version,
+    }
+    return json.dumps(payload, default=_json_default)
+
+
+def decode_detection(text: str) -> PatternDetection:
+    """Inverse of ``encode_detection``."""
+
+    payload = json.loads(text)
+    payload["effective_date"] = date.fromisoformat(payload["effective_date"])
+    payload["status"] = PatternStatus(payload["status"])
+    return PatternDetection(**payload)
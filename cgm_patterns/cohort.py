@@ -0,0 +1,493 @@
+"""Vectorized evaluation of summary-only rules across a patient cohort.
+
+``SlidingWindowEngine`` walks one patient and one date at a time, which for
+rules that only read :class:`DailyCGMSummary` rows is mostly Python overhead.
+:class:`CohortEngine` stacks the summaries of many patients into column arrays
+and evaluates every ``(patient, date)`` window of a supported rule with a few
+NumPy expressions, producing the same :class:`PatternDetection` objects.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from .features import compute_daily_summary
+from .models import DailyCGMSummary, PatternContext, PatternDetection, PatternInputBundle, PatternStatus
+from .registry import RuleRegistry
+from .rule_base import PatternRule, RuleConfig
+
+if TYPE_CHECKING:
+    from .engine import DailyCGMSource
+
+
+@dataclass(frozen=True)
+class SummaryTable:
+    """Daily summaries of many patients as parallel column arrays.
+
+    Rows are grouped by patient in date order; row ``i`` belongs to
+    ``patient_ids[patient_index[i]]``, whose first row is ``patient_start[i]``.
+    """
+
+    summaries: tuple[DailyCGMSummary, ...]
+    date_keys: tuple[str, ...]
+    patient_ids: tuple[str, ...]
+    patient_index: np.ndarray
+    patient_start: np.ndarray
+    coverage: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    percent_high: np.ndarray
+    percent_low: np.ndarray
+    percent_in_range: np.ndarray
+    min_glucose: np.ndarray
+
+    @classmethod
+    def from_patients(cls, by_patient: Mapping[str, Iterable[DailyCGMSummary]]) -> "SummaryTable":
+        rows: list[DailyCGMSummary] = []
+        owners: list[int] = []
+        starts: list[int] = []
+        for index, (patient_id, summaries) in enumerate(by_patient.items()):
+            first = len(rows)
+            previous: date | None = None
+            for summary in summaries:
+                if previous is not None and summary.service_date <= previous:
+                    raise ValueError(f"Summaries for patient '{patient_id}' must have increasing service dates")
+                previous = summary.service_date
+                rows.append(summary)
+            owners.extend([index] * (len(rows) - first))
+            starts.extend([first] * (len(rows) - first))
+
+        def column(name: str) -> np.ndarray:
+            values = (getattr(summary, name) for summary in rows)
+            return np.fromiter((np.nan if value is None else value for value in values), dtype=np.float64, count=len(rows))
+
+        return cls(
+            summaries=tuple(rows),
+            date_keys=tuple(summary.service_date.isoformat() for summary in rows),
+            patient_ids=tuple(by_patient),
+            patient_index=np.asarray(owners, dtype=np.int64),
+            patient_start=np.asarray(starts, dtype=np.int64),
+            coverage=column("coverage_ratio"),
+            mean=column("mean_glucose"),
+            std=column("std_glucose"),
+            percent_high=column("percent_high"),
+            percent_low=column("percent_low"),
+            percent_in_range=column("percent_in_range"),
+            min_glucose=column("min_glucose"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    def window_start(self, days: int) -> np.ndarray:
+        """First row of the trailing ``days``-row window ending at each row."""
+
+        return np.maximum(self.patient_start, np.arange(len(self)) - days + 1)
+
+    def cv(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.std / self.mean
+
+
+def _window_counts(mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Number of masked rows in ``[starts[i], i]`` for every row ``i``."""
+
+    prefix = np.concatenate(([0], np.cumsum(mask)))
+    return prefix[1:] - prefix[starts]
+
+
+def _recent_rows(mask: np.ndarray, starts: np.ndarray, limit: int) -> tuple[np.ndarray, np.ndarray]:
+    """Row indices of the last ``limit`` masked rows of each window.
+
+    Returns a ``(rows x limit)`` index matrix in date order, padded with -1,
+    and the number of valid entries per row.
+    """
+
+    prefix = np.concatenate(([0], np.cumsum(mask)))
+    ends = prefix[1:]
+    counts = np.minimum(ends - prefix[starts], limit)
+    positions = np.flatnonzero(mask)
+    offsets = np.arange(limit)
+    valid = offsets < counts[:, None]
+    index = np.full((len(mask), limit), -1, dtype=np.int64)
+    index[valid] = positions[((ends - counts)[:, None] + offsets)[valid]]
+    return index, counts
+
+
+def _gather(values: np.ndarray, rows: np.ndarray, fill) -> np.ndarray:
+    return np.where(rows >= 0, values[rows], fill)
+
+
+def _matches(rows: np.ndarray, hits: np.ndarray) -> list[list[int]]:
+    """Per row, the window rows (in date order) whose flag is set."""
+
+    return [[j for j, hit in zip(row, flags) if hit] for row, flags in zip(rows.tolist(), hits.tolist())]
+
+
+def _insufficient(rule: PatternRule, day: date, evidence: dict, metrics: dict | None = None) -> PatternDetection:
+    return PatternDetection(
+        pattern_id=rule.id,
+        effective_date=day,
+        status=PatternStatus.INSUFFICIENT_DATA,
+        evidence=evidence,
+        metrics=metrics if metrics is not None else {},
+        version=rule.version,
+    )
+
+
+def _screen(
+    rule: PatternRule,
+    config: RuleConfig,
+    table: SummaryTable,
+    validation_starts: np.ndarray,
+    eligible_counts: np.ndarray,
+) -> list[PatternDetection | None]:
+    """Insufficient-data detections per row, in the order the rules check them."""
+
+    required_validation = config.validation_window_days
+    required_days = config.analysis_days_required
+    validation = np.minimum(
+        _window_counts(table.coverage >= config.minimum_day_coverage, validation_starts),
+        max(required_validation, 0),
+    )
+    short_validation = (validation < required_validation) if required_validation > 0 else np.zeros(len(table), bool)
+    short_analysis = eligible_counts < required_days
+
+    screened: list[PatternDetection | None] = [None] * len(table)
+    for i in np.flatnonzero(short_validation | short_analysis).tolist():
+        day = table.summaries[i].service_date
+        if short_validation[i]:
+            evidence = {"eligible_validation_days": int(validation[i]), "required_validation_days": required_validation}
+        else:
+            evidence = {"eligible_days": int(eligible_counts[i]), "required_analysis_days": required_days}
+        screened[i] = _insufficient(rule, day, evidence)
+    return screened
+
+
+_Kernel = Callable[[PatternRule, RuleConfig, SummaryTable, np.ndarray, np.ndarray], list[PatternDetection]]
+
+
+def _predominant_hyperglycemia(rule, config, table, analysis_starts, validation_starts):
+    tar_threshold = config.tar_threshold
+    fraction_required = config.tar_days_fraction_threshold
+    rows, counts = _recent_rows(table.coverage >= config.minimum_day_coverage, analysis_starts, config.analysis_window_days)
+    detections = _screen(rule, config, table, validation_starts, counts)
+    matches = _matches(rows, _gather(table.percent_high > tar_threshold, rows, False))
+
+    summaries, date_keys = table.summaries, table.date_keys
+    for i, considered in enumerate(counts.tolist()):
+        if detections[i] is not None:
+            continue
+        tar_days = [
+            {
+                "service_date": date_keys[j],
+                "percent_high": summaries[j].percent_high,
+                "time_high_minutes": summaries[j].time_high_minutes,
+            }
+            for j in matches[i]
+        ]
+        required = max(1, math.ceil(considered * fraction_required))
+        detections[i] = PatternDetection(
+            pattern_id=rule.id,
+            effective_date=summaries[i].service_date,
+            status=PatternStatus.DETECTED if len(tar_days) >= required else PatternStatus.NOT_DETECTED,
+            evidence={"tar_examples": tar_days[:5], "required_days": required},
+            metrics={
+                "analysis_days_considered": considered,
+                "tar_days": len(tar_days),
+                "tar_threshold": tar_threshold,
+                "fraction_required": fraction_required,
+            },
+            confidence=min(1.0, len(tar_days) / max(1, required)),
+            version=rule.version,
+        )
+    return detections
+
+
+def _predominant_hypoglycemia(rule, config, table, analysis_starts, validation_starts):
+    percent_low_threshold = config.percent_low_threshold
+    fraction_required = config.hypo_days_fraction_threshold
+    rows, counts = _recent_rows(table.coverage >= config.minimum_day_coverage, analysis_starts, config.analysis_window_days)
+    detections = _screen(rule, config, table, validation_starts, counts)
+    condition = (table.percent_low >= percent_low_threshold) | (table.min_glucose < config.severe_low_threshold)
+    matches = _matches(rows, _gather(condition, rows, False))
+
+    summaries, date_keys = table.summaries, table.date_keys
+    for i, considered in enumerate(counts.tolist()):
+        if detections[i] is not None:
+            continue
+        qualifying = [
+            {
+                "service_date": date_keys[j],
+                "percent_low": summaries[j].percent_low,
+                "min_glucose": summaries[j].min_glucose,
+            }
+            for j in matches[i]
+        ]
+        required = max(1, math.ceil(considered * fraction_required))
+        detections[i] = PatternDetection(
+            pattern_id=rule.id,
+            effective_date=summaries[i].service_date,
+            status=PatternStatus.DETECTED if len(qualifying) >= required else PatternStatus.NOT_DETECTED,
+            evidence={"hypo_examples": qualifying[:5], "required_days": required},
+            metrics={
+                "analysis_days_considered": considered,
+                "hypoglycemia_days": len(qualifying),
+                "percent_low_threshold": percent_low_threshold,
+            },
+            confidence=min(1.0, len(qualifying) / max(1, required)),
+            version=rule.version,
+        )
+    return detections
+
+
+def _high_glycemic_variability(rule, config, table, analysis_starts, validation_starts):
+    cv_threshold = config.cv_threshold
+    days_needed = config.cv_days_required
+    eligible = (table.coverage >= config.minimum_day_coverage) & (table.mean > 0)
+    rows, counts = _recent_rows(eligible, analysis_starts, config.analysis_window_days)
+    detections = _screen(rule, config, table, validation_starts, counts)
+    cv = table.cv()
+    window_cv = _gather(np.where(np.isfinite(cv), cv, np.nan), rows, np.nan)
+    valid = (~np.isnan(window_cv)).sum(axis=1).tolist()
+    ordered = np.sort(window_cv, axis=1).tolist()
+    with np.errstate(invalid="ignore"):
+        elevated = (window_cv >= cv_threshold).sum(axis=1).tolist()
+
+    summaries, date_keys = table.summaries, table.date_keys
+    row_lists = rows.tolist()
+    for i, considered in enumerate(counts.tolist()):
+        if detections[i] is not None:
+            continue
+        day = summaries[i].service_date
+        if not valid[i]:
+            detections[i] = _insufficient(
+                rule,
+                day,
+                {"eligible_days": considered, "required_analysis_days": config.analysis_days_required},
+                {"cv_values": []},
+            )
+            continue
+        mid = valid[i] // 2
+        if valid[i] % 2:
+            median_cv = ordered[i][mid]
+        else:
+            median_cv = (ordered[i][mid - 1] + ordered[i][mid]) / 2
+        elevated_days = elevated[i]
+        detected = elevated_days >= days_needed and median_cv >= cv_threshold
+        detections[i] = PatternDetection(
+            pattern_id=rule.id,
+            effective_date=day,
+            status=PatternStatus.DETECTED if detected else PatternStatus.NOT_DETECTED,
+            evidence={
+                "cv_values": [
+                    {"service_date": date_keys[j], "cv": summaries[j].std_glucose / summaries[j].mean_glucose}
+                    for j in row_lists[i][:considered]
+                ][:7],
+                "required_days": days_needed,
+            },
+            metrics={
+                "analysis_days_considered": considered,
+                "median_cv": median_cv,
+                "elevated_cv_days": elevated_days,
+                "cv_threshold": cv_threshold,
+            },
+            confidence=min(1.0, elevated_days / max(1, days_needed)),
+            version=rule.version,
+        )
+    return detections
+
+
+def _stable_near_target_control(rule, config, table, analysis_starts, validation_starts):
+    tir_threshold = config.tir_threshold
+    cv_threshold = config.cv_threshold
+    fraction_required = config.stable_days_fraction_threshold
+    eligible = (table.coverage >= config.minimum_day_coverage) & (table.mean > 0)
+    rows, counts = _recent_rows(eligible, analysis_starts, config.analysis_window_days)
+    detections = _screen(rule, config, table, validation_starts, counts)
+    with np.errstate(invalid="ignore"):
+        stable = (table.percent_in_range >= tir_threshold) & (table.cv() < cv_threshold)
+    matches = _matches(rows, _gather(stable, rows, False))
+
+    summaries, date_keys = table.summaries, table.date_keys
+    for i, considered in enumerate(counts.tolist()):
+        if detections[i] is not None:
+            continue
+        qualifying = [
+            {
+                "service_date": date_keys[j],
+                "percent_in_range": summaries[j].percent_in_range,
+                "cv": summaries[j].std_glucose / summaries[j].mean_glucose,
+            }
+            for j in matches[i]
+        ]
+        required = max(1, math.ceil(considered * fraction_required))
+        detections[i] = PatternDetection(
+            pattern_id=rule.id,
+            effective_date=summaries[i].service_date,
+            status=PatternStatus.DETECTED if len(qualifying) >= required else PatternStatus.NOT_DETECTED,
+            evidence={"stable_examples": qualifying[:5], "required_days": required},
+            metrics={
+                "analysis_days_considered": considered,
+                "stable_days": len(qualifying),
+                "tir_threshold": tir_threshold,
+                "cv_threshold": cv_threshold,
+            },
+            confidence=min(1.0, len(qualifying) / max(1, required)),
+            version=rule.version,
+        )
+    return detections
+
+
+# Keyed by the implementing class, so same-id rules from other packages are not
+# matched, and by the rule version the kernel reproduces.
+_KERNELS: dict[tuple[str, str], _Kernel] = {
+    ("cgm_patterns.rules_v1.predominant_hyperglycemia.PredominantHyperglycemiaRule", "1.0.0"): _predominant_hyperglycemia,
+    ("cgm_patterns.rules_v1.predominant_hypoglycemia.PredominantHypoglycemiaRule", "1.0.0"): _predominant_hypoglycemia,
+    ("cgm_patterns.rules_v1.high_glycemic_variability.HighGlycemicVariabilityRule", "1.0.0"): _high_glycemic_variability,
+    ("cgm_patterns.rules_v1.stable_near_target_control.StableNearTargetControlRule", "1.0.0"): _stable_near_target_control,
+}
+_SUMMARY_ONLY_RULES = frozenset(path for path, _ in _KERNELS)
+
+
+def _rule_path(rule: PatternRule) -> str:
+    rule_cls = type(rule)
+    return f"{rule_cls.__module__}.{rule_cls.__qualname__}"
+
+
+def _kernel_for(rule: PatternRule) -> _Kernel | None:
+    return _KERNELS.get((_rule_path(rule), rule.version))
+
+
+def _detect_rows(
+    registry: RuleRegistry,
+    rule: PatternRule,
+    table: SummaryTable,
+    analysis_starts: np.ndarray,
+    validation_starts: np.ndarray,
+    contexts: Mapping[str, PatternContext],
+) -> list[PatternDetection]:
+    """Run ``rule.detect`` on every row's summary-only window (no vectorized kernel)."""
+
+    detections: list[PatternDetection] = []
+    for i, summary in enumerate(table.summaries):
+        window = PatternInputBundle(
+            analysis_days=(),
+            validation_days=(),
+            analysis_summaries=table.summaries[analysis_starts[i] : i + 1],
+            validation_summaries=table.summaries[validation_starts[i] : i + 1],
+        )
+        context = replace(contexts[table.patient_ids[table.patient_index[i]]], analysis_date=summary.service_date)
+        detections.extend(registry.run_rules((rule,), window, context))
+    return detections
+
+
+class CohortEngine:
+    """Evaluates summary-only rules for many patients in one vectorized pass.
+
+    Only rules with a cohort kernel are evaluated (see :meth:`supports`); a
+    rule whose version differs from its kernel's falls back to running its own
+    ``detect`` on each window's summaries. Run
+    the rest through :class:`SlidingWindowEngine` with
+    ``rule_filter=cohort.unsupported``. Window sizes and
+    thresholds mirror the sliding engine's static-context mode.
+    """
+
+    def __init__(
+        self,
+        registry: RuleRegistry,
+        *,
+        analysis_days: int = 7,
+        validation_days: int = 14,
+        default_thresholds: dict[str, float] | None = None,
+        default_pattern_settings: dict[str, dict[str, float]] | None = None,
+    ) -> None:
+        if validation_days < analysis_days:
+            raise ValueError("validation_days must be >= analysis_days")
+        self._registry = registry
+        self._analysis_days = analysis_days
+        self._validation_days = validation_days
+        self._thresholds = default_thresholds or {}
+        self._pattern_settings = default_pattern_settings or {}
+
+    @staticmethod
+    def supports(rule: PatternRule) -> bool:
+        """Return True when ``rule`` is a summary-only rule with a cohort kernel (of any version)."""
+
+        return _rule_path(rule) in _SUMMARY_ONLY_RULES
+
+    def unsupported(self, rule: PatternRule) -> bool:
+        """Rule filter selecting the rules this engine leaves to the sliding engine."""
+
+        return not self.supports(rule)
+
+    def run(
+        self,
+        summaries: Mapping[str, Iterable[DailyCGMSummary]],
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+    ) -> dict[str, dict[date, list[PatternDetection]]]:
+        """Evaluate every window of every patient, returning detections by patient and date."""
+
+        table = SummaryTable.from_patients(summaries)
+        configs = self._registry.compile_configs(self._thresholds, self._pattern_settings)
+
+        plans: dict[str, Sequence[PatternRule]] = {}
+        contexts: dict[str, PatternContext] = {}
+        for patient_id in table.patient_ids:
+            context = PatternContext(
+                patient_id=patient_id,
+                analysis_date=date.min,
+                thresholds=self._thresholds,
+                pattern_settings=self._pattern_settings,
+                rule_configs=configs,
+            )
+            contexts[patient_id] = context
+            # Plan with the caller's filter alone so the registry memo is keyed by a stable callable.
+            plans[patient_id] = tuple(rule for rule in self._registry.plan(context, rule_filter) if self.supports(rule))
+
+        analysis_starts = table.window_start(self._analysis_days)
+        validation_starts = table.window_start(self._validation_days)
+        results: dict[str, list[PatternDetection]] = {}
+        for plan in plans.values():
+            for rule in plan:
+                if rule.id in results:
+                    continue
+                config = configs[rule.id]
+                if config.analysis_window_days <= 0:
+                    raise ValueError(f"Rule '{rule.id}' needs a positive analysis_window_days for cohort evaluation")
+                kernel = _kernel_for(rule)
+                if kernel is None:
+                    results[rule.id] = _detect_rows(
+                        self._registry, rule, table, analysis_starts, validation_starts, contexts
+                    )
+                else:
+                    results[rule.id] = kernel(rule, config, table, analysis_starts, validation_starts)
+
+        outputs: dict[str, dict[date, list[PatternDetection]]] = {patient_id: {} for patient_id in table.patient_ids}
+        for i, summary in enumerate(table.summaries):
+            patient_id = table.patient_ids[table.patient_index[i]]
+            outputs[patient_id][summary.service_date] = [results[rule.id][i] for rule in plans[patient_id]]
+        return outputs
+
+    def run_source(
+        self,
+        source: "DailyCGMSource",
+        patient_ids: Iterable[str],
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+    ) -> dict[str, dict[date, list[PatternDetection]]]:
+        """Summarize each patient's days from ``source`` and evaluate the cohort."""
+
+        summaries = {
+            patient_id: [compute_daily_summary(day) for day in source.iter_days(patient_id)]
+            for patient_id in patient_ids
+        }
+        return self.run(summaries, rule_filter=rule_filter)
+
+
+__all__ = ["CohortEngine", "SummaryTable"]
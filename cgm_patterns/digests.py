@@ -0,0 +1,56 @@
+"""Content digests for CGM inputs used to key persisted results."""
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .models import CGMDay
+
+# Bump when compute_daily_summary changes so stored summaries are recomputed.
+SUMMARY_VERSION = "1"
+
+
+def day_digest(day: CGMDay) -> str:
+    """Return a stable digest of a day's identity and raw readings."""
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{day.patient_id}|{day.service_date.isoformat()}|{day.local_timezone or ''}".encode())
+    readings = day.readings
+    if not readings.empty:
+        timestamps = pd.to_datetime(readings["timestamp"], utc=True, errors="coerce")
+        hasher.update(timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64).tobytes())
+        values = pd.to_numeric(readings["glucose_mg_dL"], errors="coerce").to_numpy(dtype=np.float64)
+        hasher.update(values.tobytes())
+    return hasher.hexdigest()
+
+
+def window_digest(day_digests: Iterable[str], *extras: object) -> str:
+    """Fold the digests of a window's days, plus any extra inputs, into one digest.
+
+    ``extras`` (fetched rolling stats, context extras, ...) are folded in via
+    ``repr`` so they must have a deterministic representation.
+    """
+
+    hasher = hashlib.blake2b(digest_size=16)
+    for digest in day_digests:
+        hasher.update(digest.encode())
+    for extra in extras:
+        hasher.update(b"|")
+        hasher.update(repr(extra).encode())
+    return hasher.hexdigest()
+
+
+def detection_key(rule_id: str, version: str, config_fingerprint: str, window: str) -> str:
+    """Key a rule's detection by rule version, resolved config and window content."""
+
+    return f"{rule_id}|{version}|{config_fingerprint}|{window}"
+
+
+def summary_key(digest: str, *, high_threshold: float = 180.0, low_threshold: float = 70.0) -> str:
+    """Combine a day digest with the summary thresholds and version."""
+
+    payload = f"{SUMMARY_VERSION}|{digest}|{float(high_threshold)!r}|{float(low_threshold)!r}"
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
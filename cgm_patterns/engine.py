@@ -1,11 +1,27 @@
 """Sliding-window engine for incremental CGM pattern detection."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import copy
+from bisect import bisect_left
 from collections import deque
+from dataclasses import dataclass, field, replace
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import date
-from typing import Callable, Iterable, Protocol, Sequence
+from typing import Any, AsyncIterator, Callable, Collection, Hashable, Iterable, Iterator, Mapping, Protocol, Sequence
 
-from .cache import DailySummaryCache
+from .cache import (
+    CachedFetcher,
+    DailySummaryCache,
+    DetectionCache,
+    DigestLedger,
+    PersistentSummaryStore,
+    StripedSummaryCache,
+    SummaryCache,
+    fetch_key_per_patient,
+)
+from .digests import day_digest, detection_key, summary_key, window_digest
 from .features import compute_daily_summary
 from .models import (
     CGMDay,
@@ -14,6 +30,7 @@ from .models import (
     PatternContext,
     PatternDetection,
     PatternInputBundle,
+    PatternStatus,
     RollingStatsSnapshot,
     RollingWindowSummary,
 )
@@ -28,7 +45,70 @@ class DailyCGMSource(Protocol):
         ...
 
 
-_GLOBAL_SUMMARY_CACHE = DailySummaryCache()
+class AsyncDailyCGMSource(Protocol):
+    """Protocol for sources that stream chronologically ordered days asynchronously."""
+
+    def aiter_days(self, patient_id: str) -> AsyncIterator[CGMDay]:
+        ...
+
+
+_END = object()
+
+
+class ThreadedDaySource:
+    """Expose a synchronous ``DailyCGMSource`` as an ``AsyncDailyCGMSource``.
+
+    Each day is pulled from the wrapped iterator in a worker thread, so a
+    blocking source does not stall the event loop.
+    """
+
+    def __init__(self, source: DailyCGMSource) -> None:
+        self._source = source
+
+    async def aiter_days(self, patient_id: str) -> AsyncIterator[CGMDay]:
+        iterator = iter(await asyncio.to_thread(self._source.iter_days, patient_id))
+        while True:
+            day = await asyncio.to_thread(next, iterator, _END)
+            if day is _END:
+                return
+            yield day
+
+
+@dataclass
+class PatientWindow:
+    """Per-patient sliding state advanced one day at a time.
+
+    Created by :meth:`SlidingWindowEngine.open_window` and advanced with
+    :meth:`SlidingWindowEngine.push_day`; the deques hold at most
+    ``validation_days`` closed days.
+    """
+
+    patient_id: str
+    raw_days: deque[CGMDay]
+    summaries: deque[DailyCGMSummary]
+    base_context: PatternContext | None = field(default=None, repr=False)
+    digests: deque[str] = field(default_factory=deque, repr=False)
+
+
+@dataclass(frozen=True)
+class PatientRefresh:
+    """Outcome of :meth:`SlidingWindowEngine.refresh_patient`."""
+
+    recomputed: dict[date, list[PatternDetection]]
+    removed: tuple[date, ...] = ()
+
+    def apply(self, previous: Mapping[date, Any]) -> dict[date, Any]:
+        """Patch a previous ``run_patient``-style result with the recomputed dates."""
+
+        dropped = set(self.removed) | set(self.recomputed)
+        patched: dict[date, Any] = {
+            analysis_date: value for analysis_date, value in previous.items() if analysis_date not in dropped
+        }
+        patched.update(self.recomputed)
+        return dict(sorted(patched.items()))
+
+
+_GLOBAL_SUMMARY_CACHE = StripedSummaryCache()
 
 
 class SlidingWindowEngine:
@@ -39,7 +119,8 @@ class SlidingWindowEngine:
         data_source: DailyCGMSource,
         registry: RuleRegistry,
         *,
-        summary_cache: DailySummaryCache | None = None,
+        summary_cache: SummaryCache | None = None,
+        summary_store: PersistentSummaryStore | None = None,
         analysis_days: int = 7,
         validation_days: int = 14,
         default_thresholds: dict[str, float] | None = None,
@@ -47,19 +128,67 @@ class SlidingWindowEngine:
         context_builder: Callable[[str, date], PatternContext] | None = None,
         rolling_fetcher: Callable[[str, date], RollingStatsSnapshot | Sequence[RollingWindowSummary] | None] | None = None,
         excursion_fetcher: Callable[[str, date], ExcursionTrendSummary | None] | None = None,
+        rule_executor: Executor | None = None,
+        fetcher_cache_key: Callable[[str, date], Hashable] | None = None,
+        prefetch_executor: Executor | None = None,
+        detection_cache: DetectionCache | None = None,
     ) -> None:
         if validation_days < analysis_days:
             raise ValueError("validation_days must be >= analysis_days")
         self._source = data_source
         self._registry = registry
-        self._summary_cache = summary_cache or _GLOBAL_SUMMARY_CACHE
+        self._summary_cache = summary_cache if summary_cache is not None else _GLOBAL_SUMMARY_CACHE
+        self._summary_store = summary_store
         self._analysis_days = analysis_days
         self._validation_days = validation_days
         self._default_thresholds = default_thresholds or {}
         self._default_pattern_settings = default_pattern_settings or {}
         self._context_builder = context_builder
+        if fetcher_cache_key is not None or prefetch_executor is not None:
+            key = fetcher_cache_key or fetch_key_per_patient
+            rolling_fetcher = _cached_fetcher(rolling_fetcher, key, prefetch_executor)
+            excursion_fetcher = _cached_fetcher(excursion_fetcher, key, prefetch_executor)
         self._rolling_fetcher = rolling_fetcher
         self._excursion_fetcher = excursion_fetcher
+        self._rule_executor = rule_executor
+        self._detection_cache = detection_cache
+
+    def detached(self) -> "SlidingWindowEngine":
+        """Return a copy suitable for shipping to worker processes.
+
+        The copy gets a private summary cache and no rule executor, and the
+        registry is fully loaded first so unpickled copies do not re-import
+        rule modules. Fetchers and the data source must be picklable.
+        """
+
+        self._registry.ensure_loaded()
+        worker = self.with_summary_cache(DailySummaryCache())
+        worker._rule_executor = None
+        return worker
+
+    def with_summary_cache(self, summary_cache: SummaryCache) -> "SlidingWindowEngine":
+        """Return a copy that keeps daily summaries in ``summary_cache``."""
+
+        engine = copy.copy(self)
+        engine._summary_cache = summary_cache
+        return engine
+
+    @property
+    def analysis_days(self) -> int:
+        return self._analysis_days
+
+    @property
+    def validation_days(self) -> int:
+        return self._validation_days
+
+    def applicable_rules(
+        self,
+        context: PatternContext,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+    ) -> tuple[PatternRule, ...]:
+        """Return the rules a run would evaluate for ``context`` (see :meth:`RuleRegistry.plan`)."""
+
+        return self._registry.plan(context, rule_filter)
 
     def run_patient(
         self,
@@ -69,41 +198,431 @@ class SlidingWindowEngine:
     ) -> dict[date, list[PatternDetection]]:
         """Process a single patient, returning detections by date."""
 
-        raw_window: deque[CGMDay] = deque(maxlen=self._validation_days)
-        summary_window: deque[DailyCGMSummary] = deque(maxlen=self._validation_days)
-        results: dict[date, list[PatternDetection]] = {}
+        return dict(self.iter_patient(patient_id, rule_filter=rule_filter))
 
-        for day in self._source.iter_days(patient_id):
-            raw_window.append(day)
-            summary = self._ensure_summary(day)
-            summary_window.append(summary)
+    def iter_patient(
+        self,
+        patient_id: str,
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+        statuses: Collection[PatternStatus] | None = None,
+    ) -> Iterator[tuple[date, list[PatternDetection]]]:
+        """Yield ``(date, detections)`` for a patient as each window is evaluated.
+
+        Only the current window is held in memory, so callers can stream results
+        out as they arrive. When ``statuses`` is given, other detections are
+        dropped and dates left without detections are skipped.
+        """
 
-            keep_dates = {d.service_date.isoformat() for d in raw_window}
-            self._summary_cache.prune(patient_id, keep_dates)
+        yield from self.evaluate_days(
+            patient_id,
+            self._source.iter_days(patient_id),
+            rule_filter=rule_filter,
+            statuses=statuses,
+        )
 
-            window = self._build_input_bundle(patient_id, day.service_date, raw_window, summary_window)
-            context = self._build_context(patient_id, day.service_date)
+    def evaluate_days(
+        self,
+        patient_id: str,
+        days: Iterable[CGMDay],
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+        statuses: Collection[PatternStatus] | None = None,
+    ) -> Iterator[tuple[date, list[PatternDetection]]]:
+        """Like :meth:`iter_patient`, but over ``days`` the caller already fetched."""
 
-            detections = self._registry.detect_all(window, context, predicate=rule_filter)
-            results[day.service_date] = detections
+        outputs = self._evaluate(patient_id, days, rule_filter)
+        if statuses is None:
+            yield from outputs
+            return
+        wanted = frozenset(statuses)
+        for analysis_date, detections in outputs:
+            kept = [detection for detection in detections if detection.status in wanted]
+            if kept:
+                yield analysis_date, kept
 
+    def run_patient_parallel(
+        self,
+        patient_id: str,
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+        chunk_days: int = 90,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+    ) -> dict[date, list[PatternDetection]]:
+        """Process a single patient by evaluating date shards in parallel.
+
+        The history is split into runs of ``chunk_days`` days, each prefixed
+        with the ``validation_days - 1`` days before it so every window matches
+        the sequential engine. Shards run on ``executor`` (a process pool with
+        ``max_workers`` by default) and are stitched back in date order. The
+        engine, its fetchers and ``rule_filter`` must be picklable when a
+        process pool is used.
+        """
+
+        if chunk_days < 1:
+            raise ValueError("chunk_days must be >= 1")
+        days = list(self._source.iter_days(patient_id))
+        if not days:
+            return {}
+
+        overlap = self._validation_days - 1
+        shards: list[tuple[list[CGMDay], int]] = []
+        for start in range(0, len(days), chunk_days):
+            lead = max(0, start - overlap)
+            shards.append((days[lead : start + chunk_days], start - lead))
+
+        worker = self.detached()
+        worker._source = None
+
+        owns_executor = executor is None
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                executor.submit(_run_shard, worker, patient_id, shard_days, skip, rule_filter)
+                for shard_days, skip in shards
+            ]
+            results: dict[date, list[PatternDetection]] = {}
+            for future in futures:
+                for analysis_date, detections in future.result():
+                    results[analysis_date] = detections
+        finally:
+            if owns_executor:
+                executor.shutdown()
         return results
 
-    def _ensure_summary(self, day: CGMDay) -> DailyCGMSummary:
-        cached = self._summary_cache.get(day.patient_id, day.service_date.isoformat())
-        if cached is not None:
-            return cached
-        summary = compute_daily_summary(day)
+    def refresh_patient(
+        self,
+        patient_id: str,
+        ledger: DigestLedger,
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+        statuses: Collection[PatternStatus] | None = None,
+    ) -> PatientRefresh:
+        """Re-evaluate only the analysis dates whose window saw changed days.
+
+        Every day is digested and compared with ``ledger``. A new or edited day
+        at position ``p`` dirties the windows at ``p .. p + validation_days - 1``;
+        a removed day dirties the windows that used to contain it. Only the
+        days those windows need are summarized, and the ledger is updated
+        before returning. ``statuses`` filters the recomputed detections as in
+        :meth:`iter_patient` (emptied dates are then reported as removed).
+        """
+
+        days = list(self._source.iter_days(patient_id))
+        dates = [day.service_date for day in days]
+        digests = [day_digest(day) for day in days]
+        recorded = ledger.load(patient_id)
+        span = self._validation_days
+
+        dirty = [False] * len(days)
+        changed = [recorded.get(service_date) != digest for service_date, digest in zip(dates, digests)]
+
+        def _mark(first: int, stop: int) -> None:
+            for index in range(max(first, 0), min(stop, len(days))):
+                dirty[index] = True
+
+        for index, flag in enumerate(changed):
+            if flag:
+                _mark(index, index + span)
+        current = set(dates)
+        removed = sorted(set(recorded) - current)
+        for service_date in removed:
+            position = bisect_left(dates, service_date)
+            _mark(position, position + span - 1)
+
+        needed = [False] * len(days)
+        for index, flag in enumerate(dirty):
+            if flag:
+                for lookback in range(max(index - span + 1, 0), index + 1):
+                    needed[lookback] = True
+
+        wanted = frozenset(statuses) if statuses is not None else None
+        recomputed: dict[date, list[PatternDetection]] = {}
+        emptied: list[date] = []
+        state = self.open_window(patient_id)
+        for index, day in enumerate(days):
+            if not needed[index]:
+                # The next needed run refills the window from scratch.
+                state.raw_days.clear()
+                state.summaries.clear()
+                state.digests.clear()
+                continue
+            # The in-memory cache is keyed by date, so an edited day must replace its entry.
+            self.push_day(state, day, digests[index], refresh=changed[index])
+            if not dirty[index]:
+                continue
+            window, context = self._current(state, day)
+            detections = self._detect(state, window, context, rule_filter)
+            if wanted is not None:
+                detections = [detection for detection in detections if detection.status in wanted]
+                if not detections:
+                    emptied.append(day.service_date)
+                    continue
+            recomputed[day.service_date] = detections
+
+        ledger.save(patient_id, dict(zip(dates, digests)))
+        return PatientRefresh(recomputed, tuple(sorted([*removed, *emptied])))
+
+    async def aiter_patient(
+        self,
+        patient_id: str,
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+        statuses: Collection[PatternStatus] | None = None,
+        max_buffered_days: int = 32,
+    ) -> AsyncIterator[tuple[date, list[PatternDetection]]]:
+        """Asynchronously yield ``(date, detections)`` while days are still arriving.
+
+        Days are pulled from the source by a background task into a queue of at
+        most ``max_buffered_days`` entries while windows are evaluated in a
+        worker thread, so fetching and detection overlap. Sources without
+        ``aiter_days`` are adapted with :class:`ThreadedDaySource`.
+        """
+
+        source = self._source if hasattr(self._source, "aiter_days") else ThreadedDaySource(self._source)
+        queue: asyncio.Queue[CGMDay | object] = asyncio.Queue(maxsize=max(1, max_buffered_days))
+
+        async def _produce() -> None:
+            try:
+                async for day in source.aiter_days(patient_id):
+                    await queue.put(day)
+            finally:
+                # Wake the consumer; if the queue is full it notices completion after draining.
+                with contextlib.suppress(asyncio.QueueFull):
+                    queue.put_nowait(_END)
+
+        producer = asyncio.create_task(_produce())
+        wanted = frozenset(statuses) if statuses is not None else None
+        state = self.open_window(patient_id)
+        try:
+            while not (queue.empty() and producer.done()):
+                day = await queue.get()
+                if day is _END:
+                    break
+                analysis_date, detections = await asyncio.to_thread(self._step, state, day, rule_filter)
+                if wanted is not None:
+                    detections = [detection for detection in detections if detection.status in wanted]
+                    if not detections:
+                        continue
+                yield analysis_date, detections
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await producer
+
+    async def arun_patient(
+        self,
+        patient_id: str,
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+    ) -> dict[date, list[PatternDetection]]:
+        """Async counterpart of :meth:`run_patient`."""
+
+        return {
+            analysis_date: detections
+            async for analysis_date, detections in self.aiter_patient(patient_id, rule_filter=rule_filter)
+        }
+
+    def _evaluate(
+        self,
+        patient_id: str,
+        days: Iterable[CGMDay],
+        rule_filter: Callable[[PatternRule], bool] | None,
+    ) -> Iterator[tuple[date, list[PatternDetection]]]:
+        state = self.open_window(patient_id)
+        for day in days:
+            yield self._step(state, day, rule_filter)
+
+    def open_window(self, patient_id: str) -> PatientWindow:
+        """Return an empty sliding window for ``patient_id``."""
+
+        base_context: PatternContext | None = None
+        if self._context_builder is None:
+            base_context = PatternContext(
+                patient_id=patient_id,
+                analysis_date=date.min,
+                thresholds=self._default_thresholds,
+                pattern_settings=self._default_pattern_settings,
+                rule_configs=self._registry.compile_configs(self._default_thresholds, self._default_pattern_settings),
+            )
+        return PatientWindow(
+            patient_id=patient_id,
+            raw_days=deque(maxlen=self._validation_days),
+            summaries=deque(maxlen=self._validation_days),
+            base_context=base_context,
+            digests=deque(maxlen=self._validation_days),
+        )
+
+    def iter_windows(self, patient_id: str) -> Iterator[tuple[PatternInputBundle, PatternContext]]:
+        """Yield each analysis window with its context, without running rules.
+
+        Useful for callers that evaluate rules themselves, e.g. threshold sweeps
+        that reuse one window's cached features across many configurations.
+        """
+
+        state = self.open_window(patient_id)
+        for day in self._source.iter_days(patient_id):
+            yield self._advance(state, day)
+
+    def _advance(self, state: PatientWindow, day: CGMDay) -> tuple[PatternInputBundle, PatternContext]:
+        self.push_day(state, day)
+        return self._current(state, day)
+
+    def push_day(self, state: PatientWindow, day: CGMDay, digest: str | None = None, *, refresh: bool = False) -> None:
+        """Append ``day`` and its summary to ``state``, dropping the oldest day when full.
+
+        ``refresh`` recomputes the summary instead of trusting the date-keyed
+        in-memory cache (for days whose readings changed).
+        """
+
+        patient_id = state.patient_id
+        self._prefetch(patient_id, day.service_date)
+        if digest is None and (self._detection_cache is not None or self._summary_store is not None):
+            digest = day_digest(day)
+        state.raw_days.append(day)
+        state.summaries.append(self._ensure_summary(day, digest, refresh=refresh))
+        if digest is not None:
+            state.digests.append(digest)
+
+        self._summary_cache.evict_before(patient_id, state.raw_days[0].service_date.isoformat())
+
+    def _current(self, state: PatientWindow, day: CGMDay) -> tuple[PatternInputBundle, PatternContext]:
+        patient_id = state.patient_id
+        window = self.build_window(patient_id, day.service_date, state.raw_days, state.summaries)
+        return window, self._context(state, day.service_date)
+
+    def _context(self, state: PatientWindow, analysis_date: date) -> PatternContext:
+        if state.base_context is not None:
+            return replace(state.base_context, analysis_date=analysis_date)
+        return self._context_builder(state.patient_id, analysis_date)
+
+    def window_context(self, state: PatientWindow, analysis_date: date) -> PatternContext:
+        """Return the context rules see for ``analysis_date``, with rule configs compiled."""
+
+        context = self._context(state, analysis_date)
+        if not context.rule_configs:
+            context = replace(
+                context,
+                rule_configs=self._registry.compile_configs(context.thresholds, context.pattern_settings),
+            )
+        return context
+
+    def run_rules(
+        self,
+        rules: Iterable[PatternRule],
+        window: PatternInputBundle,
+        context: PatternContext,
+    ) -> list[PatternDetection]:
+        """Evaluate ``rules`` (e.g. from :meth:`applicable_rules`) on the engine's rule executor."""
+
+        return self._registry.run_rules(rules, window, context, executor=self._rule_executor)
+
+    def _step(
+        self,
+        state: PatientWindow,
+        day: CGMDay,
+        rule_filter: Callable[[PatternRule], bool] | None,
+    ) -> tuple[date, list[PatternDetection]]:
+        window, context = self._advance(state, day)
+        return day.service_date, self._detect(state, window, context, rule_filter)
+
+    def _detect(
+        self,
+        state: PatientWindow,
+        window: PatternInputBundle,
+        context: PatternContext,
+        rule_filter: Callable[[PatternRule], bool] | None,
+    ) -> list[PatternDetection]:
+        if self._detection_cache is not None:
+            return self._detect_cached(state, window, context, rule_filter)
+        return self._registry.detect_all(
+            window,
+            context,
+            predicate=rule_filter,
+            executor=self._rule_executor,
+        )
+
+    def _detect_cached(
+        self,
+        state: PatientWindow,
+        window: PatternInputBundle,
+        context: PatternContext,
+        rule_filter: Callable[[PatternRule], bool] | None,
+    ) -> list[PatternDetection]:
+        """Run only the rules whose (version, config, window) key is not cached."""
+
+        if not context.rule_configs:
+            context = replace(
+                context,
+                rule_configs=self._registry.compile_configs(context.thresholds, context.pattern_settings),
+            )
+        selected = self.applicable_rules(context, rule_filter)
+        # Day digests already carry each day's timezone; the split sizes decide
+        # which of those days a rule sees as analysis vs. validation.
+        window_key = window_digest(
+            state.digests,
+            (self._analysis_days, self._validation_days),
+            window.rolling_windows,
+            window.rolling_snapshot,
+            window.excursion_summary,
+            sorted(context.extras.items(), key=lambda item: str(item[0])),
+        )
+        keys = [
+            detection_key(rule.id, rule.version, rule.config(context).fingerprint(), window_key)
+            for rule in selected
+        ]
+        cached = [self._detection_cache.get(key) for key in keys]
+        missing = [rule for rule, hit in zip(selected, cached) if hit is None]
+        fresh = iter(self._registry.run_rules(missing, window, context, executor=self._rule_executor))
+
+        detections: list[PatternDetection] = []
+        new_entries: list[tuple[str, PatternDetection]] = []
+        for key, hit in zip(keys, cached):
+            if hit is None:
+                hit = next(fresh)
+                if hit.status is not PatternStatus.ERROR:
+                    new_entries.append((key, hit))
+            detections.append(hit)
+        if new_entries:
+            self._detection_cache.set_many(new_entries)
+        return detections
+
+    def _prefetch(self, patient_id: str, analysis_date: date) -> None:
+        for fetcher in (self._rolling_fetcher, self._excursion_fetcher):
+            if isinstance(fetcher, CachedFetcher):
+                fetcher.prefetch(patient_id, analysis_date)
+
+    def _ensure_summary(self, day: CGMDay, digest: str | None = None, *, refresh: bool = False) -> DailyCGMSummary:
+        """Return the day's summary; ``refresh`` skips the date-keyed cache for edited days."""
+
+        if not refresh:
+            cached = self._summary_cache.get(day.patient_id, day.service_date.isoformat())
+            if cached is not None:
+                return cached
+        if self._summary_store is None:
+            summary = compute_daily_summary(day)
+        else:
+            key = summary_key(digest or day_digest(day))
+            summary = self._summary_store.load(day.patient_id, day.service_date, key)
+            if summary is None:
+                summary = compute_daily_summary(day)
+                self._summary_store.save(summary, key)
         self._summary_cache.set(summary)
         return summary
 
-    def _build_input_bundle(
+    def build_window(
         self,
         patient_id: str,
         analysis_date: date,
-        raw_window: deque[CGMDay],
-        summary_window: deque[DailyCGMSummary],
+        raw_window: Sequence[CGMDay],
+        summary_window: Sequence[DailyCGMSummary],
     ) -> PatternInputBundle:
+        """Assemble the input bundle for the window ending on the last of ``raw_window``."""
+
         analysis_raw: Sequence[CGMDay] = list(raw_window)[-self._analysis_days :]
         analysis_summary: Sequence[DailyCGMSummary] = list(summary_window)[-self._analysis_days :]
         validation_raw: Sequence[CGMDay] = list(raw_window)
@@ -132,12 +651,26 @@ class SlidingWindowEngine:
             excursion_summary=excursion_summary,
         )
 
-    def _build_context(self, patient_id: str, analysis_date: date) -> PatternContext:
-        if self._context_builder is not None:
-            return self._context_builder(patient_id, analysis_date)
-        return PatternContext(
-            patient_id=patient_id,
-            analysis_date=analysis_date,
-            thresholds=self._default_thresholds,
-            pattern_settings=self._default_pattern_settings,
-        )
+
+
+def _cached_fetcher(
+    fetcher: Callable[[str, date], object] | None,
+    key: Callable[[str, date], Hashable],
+    executor: Executor | None,
+) -> Callable[[str, date], object] | None:
+    if fetcher is None or isinstance(fetcher, CachedFetcher):
+        return fetcher
+    return CachedFetcher(fetcher, key=key, executor=executor)
+
+
+def _run_shard(
+    engine: SlidingWindowEngine,
+    patient_id: str,
+    days: Sequence[CGMDay],
+    skip: int,
+    rule_filter: Callable[[PatternRule], bool] | None,
+) -> list[tuple[date, list[PatternDetection]]]:
+    """Evaluate one shard, dropping the leading overlap days."""
+
+    outputs = engine._evaluate(patient_id, days, rule_filter)
+    return [item for index, item in enumerate(outputs) if index >= skip]
@@ -9,7 +9,7 @@ import pandas as pd
 
 from .models import CGMDay, DailyCGMSummary
 
-_TIME_STEP_MINUTES: Final[float] = 5.0
+TIME_STEP_MINUTES: Final[float] = 5.0
 
 
 def compute_daily_summary(day: CGMDay, high_threshold: float = 180.0, low_threshold: float = 70.0) -> DailyCGMSummary:
@@ -35,13 +35,13 @@ def compute_daily_summary(day: CGMDay, high_threshold: float = 180.0, low_thresh
         )
 
     values = readings["glucose_mg_dL"].astype(float).to_numpy()
-    total_minutes = len(values) * _TIME_STEP_MINUTES
+    total_minutes = len(values) * TIME_STEP_MINUTES
 
     high_mask = values > high_threshold
     low_mask = values < low_threshold
 
-    minutes_high = float(high_mask.sum()) * _TIME_STEP_MINUTES
-    minutes_low = float(low_mask.sum()) * _TIME_STEP_MINUTES
+    minutes_high = float(high_mask.sum()) * TIME_STEP_MINUTES
+    minutes_low = float(low_mask.sum()) * TIME_STEP_MINUTES
     minutes_in_range = total_minutes - (minutes_high + minutes_low)
 
     return DailyCGMSummary(
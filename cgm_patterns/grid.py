@@ -0,0 +1,198 @@
+"""Fixed-cadence ``(days x slots)`` glucose matrices for cross-day reductions."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+from .timezones import MINUTES_PER_DAY
+
+if TYPE_CHECKING:
+    from .rules.utils import PreparedDay
+
+DEFAULT_SLOT_MINUTES = 5
+# A reading stands in for at most this long; longer gaps stay NaN.
+DEFAULT_MAX_GAP_MINUTES = 15.0
+
+
+@dataclass(frozen=True)
+class DayGrid:
+    """Glucose resampled onto a regular local-clock grid, one row per day.
+
+    ``values[d, s]`` holds the reading covering slot ``s`` of ``dates[d]`` or NaN
+    where no reading covers it. Each reading is carried forward for its own
+    duration (the ``minutes`` column of the prepared day), capped at
+    ``max_gap_minutes``.
+
+    On a 25-hour day the clock passes the repeated hour twice. The second
+    pass is kept in ``repeated`` (same shape, NaN elsewhere) rather than
+    overwriting the first, and the minute and mean reductions count both, as
+    the per-day frames do. ``repeated`` is None when no day falls back.
+    """
+
+    dates: tuple[date, ...]
+    values: np.ndarray
+    slot_minutes: int = DEFAULT_SLOT_MINUTES
+    repeated: np.ndarray | None = None
+
+    @property
+    def slots_per_day(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def mask(self) -> np.ndarray:
+        """Boolean matrix, True where a slot holds a reading."""
+
+        return ~np.isnan(self.values)
+
+    @property
+    def coverage(self) -> np.ndarray:
+        """Fraction of covered slots for each day."""
+
+        if not self.slots_per_day:
+            return np.zeros(len(self.dates))
+        return self.mask.mean(axis=1)
+
+    def slot_window(self, start_hour: float, end_hour: float) -> np.ndarray:
+        """Boolean slot mask for a local-time window, with the same bounds as
+        ``filter_time_window`` (start inclusive, end exclusive, wrapping past
+        midnight when ``start_hour > end_hour``)."""
+
+        starts = np.arange(self.slots_per_day) * self.slot_minutes
+        start_minute = start_hour * 60.0
+        end_minute = end_hour * 60.0
+        if start_hour <= end_hour:
+            return (starts >= start_minute) & (starts < end_minute)
+        return (starts >= start_minute) | (starts < end_minute)
+
+    def last(self, count: int) -> "DayGrid":
+        """Return the grid restricted to the trailing ``count`` days."""
+
+        count = max(int(count), 0)
+        start = max(len(self.dates) - count, 0)
+        repeated = None if self.repeated is None else self.repeated[start:]
+        return DayGrid(self.dates[start:], self.values[start:], self.slot_minutes, repeated)
+
+    def window(self, start_hour: float, end_hour: float) -> np.ndarray:
+        """Return the ``(days x window slots)`` sub-matrix for an hour window.
+
+        Only the first pass of a repeated hour is included; the reductions
+        below also count ``repeated``.
+        """
+
+        return self.values[:, self.slot_window(start_hour, end_hour)]
+
+    def _windows(self, start_hour: float, end_hour: float) -> np.ndarray:
+        """Window slots of both clock passes side by side, ``(days x 2 * window slots)``."""
+
+        slots = self.slot_window(start_hour, end_hour)
+        if self.repeated is None:
+            return self.values[:, slots]
+        return np.concatenate((self.values[:, slots], self.repeated[:, slots]), axis=1)
+
+    def minutes_below(self, threshold: float, start_hour: float = 0.0, end_hour: float = 24.0) -> np.ndarray:
+        """Minutes per day spent strictly below ``threshold`` inside the window."""
+
+        with np.errstate(invalid="ignore"):
+            hits = self._windows(start_hour, end_hour) < threshold
+        return hits.sum(axis=1) * float(self.slot_minutes)
+
+    def minutes_above(self, threshold: float, start_hour: float = 0.0, end_hour: float = 24.0) -> np.ndarray:
+        """Minutes per day spent strictly above ``threshold`` inside the window."""
+
+        with np.errstate(invalid="ignore"):
+            hits = self._windows(start_hour, end_hour) > threshold
+        return hits.sum(axis=1) * float(self.slot_minutes)
+
+    def covered_minutes(self, start_hour: float = 0.0, end_hour: float = 24.0) -> np.ndarray:
+        """Minutes per day with data inside the window."""
+
+        return (~np.isnan(self._windows(start_hour, end_hour))).sum(axis=1) * float(self.slot_minutes)
+
+    def mean(self, start_hour: float = 0.0, end_hour: float = 24.0) -> np.ndarray:
+        """Time-weighted mean glucose per day inside the window (NaN when empty)."""
+
+        window = self._windows(start_hour, end_hour)
+        counts = (~np.isnan(window)).sum(axis=1)
+        totals = np.nansum(window, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+
+def _second_pass(frame) -> np.ndarray:
+    """Mask of readings whose local wall clock falls behind an earlier reading's.
+
+    Readings are time ordered, so this only happens in the hour repeated when
+    the clock falls back (fixed offsets never set it).
+    """
+
+    local = frame["local_time"]
+    if getattr(local.dt, "tz", None) is not None:
+        local = local.dt.tz_localize(None)
+    wall = local.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return wall < np.maximum.accumulate(wall)
+
+
+def _fill_row(
+    row: np.ndarray,
+    repeated: np.ndarray,
+    prepared: "PreparedDay",
+    slot_minutes: int,
+    max_gap_minutes: float,
+) -> bool:
+    """Fill one day's slots; return True when readings went to ``repeated``."""
+
+    frame = prepared.frame
+    if frame.empty:
+        return False
+    local_minute = frame["local_minute"].to_numpy(dtype=np.int64)
+    glucose = frame["glucose_mg_dL"].to_numpy(dtype=np.float64)
+    durations = np.minimum(frame["minutes"].to_numpy(dtype=np.float64), max_gap_minutes)
+
+    first_slot = local_minute // slot_minutes
+    spans = np.maximum(np.rint(durations / slot_minutes).astype(np.int64), 1)
+    starts = np.repeat(first_slot, spans)
+    offsets = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+    slots = starts + offsets
+    values = np.repeat(glucose, spans)
+    second = np.repeat(_second_pass(frame), spans)
+    keep = slots < row.shape[0]
+    # Readings are time ordered, so later readings overwrite earlier carry-forward
+    # within each pass of the clock.
+    first = keep & ~second
+    row[slots[first]] = values[first]
+    second &= keep
+    repeated[slots[second]] = values[second]
+    return bool(second.any())
+
+
+def build_day_grid(
+    prepared_days: Sequence["PreparedDay"],
+    dates: Sequence[date],
+    *,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES,
+    max_gap_minutes: float = DEFAULT_MAX_GAP_MINUTES,
+) -> DayGrid:
+    """Resample prepared days onto a ``(len(dates) x 1440 / slot_minutes)`` grid."""
+
+    if len(prepared_days) != len(dates):
+        raise ValueError("prepared_days and dates must have the same length")
+    if slot_minutes <= 0 or MINUTES_PER_DAY % slot_minutes:
+        raise ValueError("slot_minutes must evenly divide a day")
+
+    values = np.full((len(dates), MINUTES_PER_DAY // slot_minutes), np.nan)
+    repeated = np.full_like(values, np.nan)
+    falls_back = False
+    for row, repeated_row, prepared in zip(values, repeated, prepared_days):
+        falls_back |= _fill_row(row, repeated_row, prepared, slot_minutes, max_gap_minutes)
+    return DayGrid(tuple(dates), values, slot_minutes, repeated if falls_back else None)
+
+
+__all__ = [
+    "DEFAULT_MAX_GAP_MINUTES",
+    "DEFAULT_SLOT_MINUTES",
+    "DayGrid",
+    "build_day_grid",
+]
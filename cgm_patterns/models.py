@@ -6,10 +6,13 @@ from datetime import date
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence
 
-import pandas as pd
 from zoneinfo import ZoneInfo
 
 if TYPE_CHECKING:
+    import pandas as pd
+
+    from .grid import DayGrid
+    from .rule_base import RuleConfig
     from .rules.utils import PreparedDay
 
 
@@ -32,6 +35,7 @@ class PatternStatus(str, Enum):
     DETECTED = "detected"
     NOT_DETECTED = "not_detected"
     INSUFFICIENT_DATA = "insufficient_data"
+    ERROR = "error"
 
 
 @dataclass(frozen=True)
@@ -62,6 +66,8 @@ class CGMDay:
         expected_points = 288
         timestamps = self.readings.get("timestamp")
         if timestamps is not None:
+            import pandas as pd
+
             try:
                 ordered = pd.to_datetime(timestamps, utc=True, errors="coerce").sort_values()
                 diffs = ordered.diff().dropna().dt.total_seconds()
@@ -78,10 +84,15 @@ class CGMDay:
 
         if self.local_timezone is None:
             return self.readings
-        df = self.readings.copy()
-        tz = ZoneInfo(self.local_timezone)
-        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True).dt.tz_convert(tz)
-        return df
+        import pandas as pd
+
+        from .timezones import resolve_timezone
+
+        tz = resolve_timezone(self.local_timezone) or ZoneInfo(self.local_timezone)
+        timestamps = self.readings["timestamp"]
+        if not isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+            timestamps = pd.to_datetime(timestamps, utc=True)
+        return self.readings.assign(timestamp=timestamps.dt.tz_convert(tz))
 
 
 @dataclass(frozen=True)
@@ -149,6 +160,7 @@ class PatternInputBundle:
         default_factory=dict,
         repr=False,
     )
+    day_grid_cache: dict[tuple[str, int, float], "DayGrid"] = field(default_factory=dict, repr=False)
 
     def sufficient_analysis_days(self, minimum: int = 5) -> bool:
         return sum(day.coverage_ratio() >= 0.7 for day in self.analysis_days) >= minimum
@@ -181,6 +193,32 @@ class PatternInputBundle:
         self.time_window_cache[key] = window_df
         return window_df
 
+    def day_grid(
+        self,
+        *,
+        validation: bool = False,
+        slot_minutes: int = 5,
+        max_gap_minutes: float = 15.0,
+    ) -> "DayGrid":
+        """Return a cached fixed-cadence grid over the analysis (or validation) days."""
+
+        key = ("validation" if validation else "analysis", int(slot_minutes), float(max_gap_minutes))
+        cached = self.day_grid_cache.get(key)
+        if cached is not None:
+            return cached
+
+        from .grid import build_day_grid  # Local import keeps numpy off the models import path
+
+        days = self.validation_days if validation else self.analysis_days
+        grid = build_day_grid(
+            [self.prepared_day(day) for day in days],
+            [day.service_date for day in days],
+            slot_minutes=slot_minutes,
+            max_gap_minutes=max_gap_minutes,
+        )
+        self.day_grid_cache[key] = grid
+        return grid
+
 
 @dataclass(frozen=True)
 class PatternContext:
@@ -191,6 +229,7 @@ class PatternContext:
     thresholds: Mapping[str, Any] = field(default_factory=dict)
     pattern_settings: Mapping[str, Mapping[str, Any]] = field(default_factory=dict)
     extras: Mapping[str, Any] = field(default_factory=dict)
+    rule_configs: Mapping[str, "RuleConfig"] = field(default_factory=dict, repr=False)
 
     def pattern_threshold(self, pattern_id: str, key: str, default: Any) -> Any:
         """Return pattern-specific override, falling back to global thresholds"""
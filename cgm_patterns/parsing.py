@@ -0,0 +1,90 @@
+"""Fast decoding of raw CGM payloads into columnar arrays."""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:  # Optional speedup; the stdlib decoder is used when orjson is missing.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Naive ISO-8601 timestamps as emitted by the readings API, e.g. 2025-04-16T07:13:37.000.
+_NAIVE_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,9})?)?)?$")
+
+
+def loads(payload: bytes | str) -> Any:
+    """Decode a JSON document, using orjson when it is installed."""
+
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def load_json(path: Path) -> Any:
+    """Read and decode a JSON file."""
+
+    return loads(Path(path).read_bytes())
+
+
+def entries_to_columns(entries: Sequence[Mapping[str, Any]]) -> dict[str, list[Any]]:
+    """Transpose a list of reading dicts into per-key value lists.
+
+    Keys keep first-seen order, matching ``pd.DataFrame(entries)``; keys missing
+    from an entry become ``None``.
+    """
+
+    if not entries:
+        return {}
+    first = entries[0]
+    keys = first.keys()
+    if all(entry.keys() == keys for entry in entries):
+        return {key: [entry[key] for entry in entries] for key in keys}
+    ordered: dict[str, None] = {}
+    for entry in entries:
+        ordered.update(dict.fromkeys(entry))
+    return {key: [entry.get(key) for entry in entries] for key in ordered}
+
+
+def _parse_iso(values: Sequence[Any], *, utc: bool, errors: str) -> np.ndarray:
+    sample = next((value for value in values if value is not None), None)
+    if isinstance(sample, str) and _NAIVE_ISO.match(sample):
+        try:
+            return np.array(values, dtype="datetime64[ns]")
+        except (TypeError, ValueError):
+            pass
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), utc=utc, errors=errors)
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.to_numpy(dtype="datetime64[ns]")
+
+
+def parse_local_times(values: Sequence[Any], *, errors: str = "coerce") -> np.ndarray:
+    """Parse ISO-8601 strings into ``datetime64[ns]`` wall-clock values.
+
+    Values in the API's fixed naive format are parsed directly by NumPy;
+    anything else goes through pandas. Offsets are dropped, keeping the local
+    wall-clock time. Missing values become ``NaT``.
+    """
+
+    return _parse_iso(values, utc=False, errors=errors)
+
+
+def parse_utc_timestamps(values: Sequence[Any], *, errors: str = "coerce") -> pd.DatetimeIndex:
+    """Parse timestamps into a UTC-aware ``DatetimeIndex``; naive values are taken as UTC."""
+
+    return pd.DatetimeIndex(_parse_iso(values, utc=True, errors=errors)).tz_localize("UTC")
+
+
+__all__ = [
+    "entries_to_columns",
+    "load_json",
+    "loads",
+    "parse_local_times",
+    "parse_utc_timestamps",
+]
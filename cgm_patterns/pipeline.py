@@ -0,0 +1,204 @@
+"""Staged producer/consumer pipeline with bounded queues and per-stage metrics.
+
+Items flow through a chain of :class:`Stage` objects, each served by its own
+worker threads and fed by a bounded queue, so a slow stage applies
+backpressure upstream instead of letting work pile up in memory. A stage with
+an ``executor`` (e.g. a process pool) submits each call there and uses its
+threads only to bound the tasks in flight, which lets CPU-bound stages run
+outside the GIL while I/O-bound stages stay on threads.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step: ``func`` maps the previous stage's output to this stage's."""
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    executor: Executor | None = None
+
+
+@dataclass
+class StageMetrics:
+    """Counters for one stage over a pipeline run.
+
+    ``starved_seconds`` is time workers waited for input; ``blocked_seconds`` is
+    time they waited on a full downstream queue (backpressure). Queue depths
+    are those of the stage's input queue, sampled on every take.
+    """
+
+    name: str
+    workers: int
+    items: int = 0
+    busy_seconds: float = 0.0
+    starved_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    max_queue_depth: int = 0
+    _depth_total: int = field(default=0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self._depth_total / self.items if self.items else 0.0
+
+    def as_dict(self, elapsed: float) -> dict[str, Any]:
+        capacity = self.workers * elapsed
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "items": self.items,
+            "items_per_second": self.items / elapsed if elapsed else 0.0,
+            "utilization": self.busy_seconds / capacity if capacity else 0.0,
+            "busy_seconds": self.busy_seconds,
+            "starved_seconds": self.starved_seconds,
+            "blocked_seconds": self.blocked_seconds,
+            "mean_queue_depth": self.mean_queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    def _record(self, depth: int, busy: float, starved: float, blocked: float) -> None:
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += busy
+            self.starved_seconds += starved
+            self.blocked_seconds += blocked
+            self._depth_total += depth
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+
+class StagedPipeline:
+    """Run items through ``stages`` concurrently, keeping at most ``queue_size`` per queue.
+
+    :meth:`run` yields ``(item, result)`` pairs in completion order. The first
+    exception raised by any stage stops the pipeline and is re-raised.
+    """
+
+    def __init__(self, stages: Sequence[Stage], *, queue_size: int = 8) -> None:
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+        self._stages = tuple(stages)
+        self._queue_size = queue_size
+        self.metrics = [StageMetrics(stage.name, max(1, stage.workers)) for stage in self._stages]
+        self.elapsed = 0.0
+
+    def report(self) -> list[dict[str, Any]]:
+        """Return per-stage throughput, utilization and queue-depth figures."""
+
+        return [metrics.as_dict(self.elapsed) for metrics in self.metrics]
+
+    def run(self, items: Iterable[Any]) -> Iterator[tuple[Any, Any]]:
+        queues: list[queue.Queue] = [queue.Queue(maxsize=self._queue_size) for _ in range(len(self._stages) + 1)]
+        stop = threading.Event()
+        errors: list[BaseException] = []
+        threads: list[threading.Thread] = []
+        started = time.perf_counter()
+
+        def _put(target: queue.Queue, value: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    target.put(value, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _feed() -> None:
+            try:
+                for item in items:
+                    if not _put(queues[0], (item, item)):
+                        return
+            except BaseException as exc:  # pragma: no cover - defensive: a failing item iterator
+                errors.append(exc)
+                stop.set()
+            finally:
+                _put(queues[0], _DONE)
+
+        def _work(index: int, remaining: list[int], remaining_lock: threading.Lock) -> None:
+            stage, metrics = self._stages[index], self.metrics[index]
+            source, target = queues[index], queues[index + 1]
+            try:
+                waited = time.perf_counter()
+                while not stop.is_set():
+                    try:
+                        entry = source.get(timeout=_POLL_SECONDS)
+                    except queue.Empty:
+                        continue
+                    if entry is _DONE:
+                        _put(source, _DONE)  # Let sibling workers see the end marker too.
+                        return
+                    depth = source.qsize()
+                    began = time.perf_counter()
+                    item, value = entry
+                    try:
+                        if stage.executor is not None:
+                            result = stage.executor.submit(stage.func, value).result()
+                        else:
+                            result = stage.func(value)
+                    except BaseException as exc:
+                        errors.append(exc)
+                        stop.set()
+                        return
+                    finished = time.perf_counter()
+                    _put(target, (item, result))
+                    released = time.perf_counter()
+                    metrics._record(depth, finished - began, began - waited, released - finished)
+                    waited = released
+            finally:
+                with remaining_lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    _put(target, _DONE)
+
+        for index, stage in enumerate(self._stages):
+            remaining = [max(1, stage.workers)]
+            remaining_lock = threading.Lock()
+            for _ in range(remaining[0]):
+                threads.append(
+                    threading.Thread(
+                        target=_work,
+                        args=(index, remaining, remaining_lock),
+                        name=f"pipeline-{stage.name}",
+                        daemon=True,
+                    )
+                )
+        threads.append(threading.Thread(target=_feed, name="pipeline-feed", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        output = queues[-1]
+        try:
+            while True:
+                try:
+                    entry = output.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    if stop.is_set():
+                        break
+                    continue
+                if entry is _DONE:
+                    break
+                yield entry
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self.elapsed = time.perf_counter() - started
+        if errors:
+            raise errors[0]
+
+
+__all__ = ["Stage", "StageMetrics", "StagedPipeline"]
@@ -1,59 +1,261 @@
 """Registry for discovering and executing pattern rules."""
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
-from typing import Dict, Type
+import logging
+import threading
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from concurrent.futures import Executor
+from dataclasses import replace
+from importlib import import_module
+from typing import Any, Dict, Type
 
-from .models import PatternContext, PatternDetection, PatternInputBundle
-from .rule_base import PatternRule
-from .pattern_metadata import should_evaluate_rule
+from .models import PatternContext, PatternDetection, PatternInputBundle, PatternStatus
+from .rule_base import PatternRule, RuleConfig
+from .pattern_metadata import context_diagnosis_tokens, diagnosis_requirement_tokens, is_applicable
+
+logger = logging.getLogger(__name__)
+
+_MAX_COMPILED_CONFIGS = 64
+_MAX_PLANS = 64
+
+# Guards lazy imports so concurrent engines do not race on registry state.
+_LOAD_LOCK = threading.RLock()
 
 
 class RuleRegistry:
-    """Keeps track of available rules by id."""
+    """Keeps track of available rules by id.
+
+    Rules may be announced with :meth:`register_lazy`, in which case their
+    module is only imported when the rule is first looked up or evaluated.
+    """
 
     def __init__(self) -> None:
         self._rules: Dict[str, PatternRule] = {}
+        self._pending: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+        self._compiled_configs: Dict[Hashable, Mapping[str, RuleConfig]] = {}
+        self._required_tokens: Dict[str, frozenset[str]] = {}
+        self._plans: Dict[Hashable, tuple[PatternRule, ...]] = {}
 
     def register(self, rule_cls: Type[PatternRule]) -> Type[PatternRule]:
         if rule_cls.id in self._rules:
             raise ValueError(f"Rule '{rule_cls.id}' already registered")
-        self._rules[rule_cls.id] = rule_cls()
+        self._pending.pop(rule_cls.id, None)
+        self._add(rule_cls())
         return rule_cls
 
+    def register_lazy(self, rule_id: str, module: str) -> None:
+        """Announce ``rule_id`` as defined in ``module`` without importing it."""
+
+        if rule_id in self._rules or rule_id in self._pending:
+            raise ValueError(f"Rule '{rule_id}' already registered")
+        self._pending[rule_id] = module
+        self._order.setdefault(rule_id, len(self._order))
+
+    def _add(self, rule: PatternRule) -> None:
+        self._rules[rule.id] = rule
+        self._order.setdefault(rule.id, len(self._order))
+        self._required_tokens[rule.id] = diagnosis_requirement_tokens(rule)
+        self._compiled_configs.clear()
+        self._plans.clear()
+
     def clear(self) -> None:
         """Remove all registered rules."""
 
         self._rules.clear()
+        self._pending.clear()
+        self._order.clear()
+        self._compiled_configs.clear()
+        self._required_tokens.clear()
+        self._plans.clear()
+
+    def ensure_loaded(self, rule_ids: Iterable[str] | None = None) -> None:
+        """Import the modules of pending rules (all of them when ``rule_ids`` is None)."""
+
+        if not self._pending:
+            return
+        with _LOAD_LOCK:
+            if rule_ids is None:
+                modules = list(dict.fromkeys(self._pending.values()))
+            else:
+                modules = list(dict.fromkeys(self._pending[rid] for rid in rule_ids if rid in self._pending))
+            if not modules:
+                return
+            for module in modules:
+                import_module(module)
+                stale = [rid for rid, name in self._pending.items() if name == module]
+                for rule_id in stale:
+                    logger.warning("Module %s did not register rule %s", module, rule_id)
+                    del self._pending[rule_id]
+            # Keep announcement order regardless of which modules loaded first.
+            self._rules = dict(sorted(self._rules.items(), key=lambda item: self._order[item[0]]))
+
+    def select(self, rule_ids: Iterable[str]) -> "RuleRegistry":
+        """Return a registry holding only ``rule_ids`` (case-insensitive).
+
+        Only the modules of the selected rules are imported; unknown ids are
+        ignored.
+        """
+
+        wanted = {rule_id.lower() for rule_id in rule_ids}
+        known = [rid for rid in (*self._rules, *self._pending) if rid.lower() in wanted]
+        self.ensure_loaded(known)
+        subset = RuleRegistry()
+        for rule_id, rule in self._rules.items():
+            if rule_id.lower() in wanted:
+                subset._add(rule)
+        return subset
 
     def get(self, rule_id: str) -> PatternRule:
+        if rule_id not in self._rules:
+            self.ensure_loaded((rule_id,))
         return self._rules[rule_id]
 
     def items(self) -> Iterable[tuple[str, PatternRule]]:
+        self.ensure_loaded()
         return self._rules.items()
 
     def values(self) -> Iterable[PatternRule]:
+        self.ensure_loaded()
         return self._rules.values()
 
+    def compile_configs(
+        self,
+        thresholds: Mapping[str, Any],
+        pattern_settings: Mapping[str, Mapping[str, Any]],
+    ) -> Mapping[str, RuleConfig]:
+        """Return every rule's resolved parameters, memoized per threshold set."""
+
+        self.ensure_loaded()
+        key = (_freeze(thresholds), _freeze(pattern_settings))
+        compiled = self._compiled_configs.get(key)
+        if compiled is None:
+            compiled = {
+                rule_id: rule.compile_config(thresholds, pattern_settings)
+                for rule_id, rule in self._rules.items()
+            }
+            if len(self._compiled_configs) >= _MAX_COMPILED_CONFIGS:
+                self._compiled_configs.clear()
+            self._compiled_configs[key] = compiled
+        return compiled
+
+    def plan(
+        self,
+        context: PatternContext,
+        predicate: Callable[[PatternRule], bool] | None = None,
+    ) -> tuple[PatternRule, ...]:
+        """Return the rules applicable to ``context``, in registration order.
+
+        Plans are memoized per predicate and diagnosis-token set, so a
+        patient's plan is built once and reused for every analysis date.
+        Predicates are assumed to be pure; pass a stable callable (a
+        module-level function or bound method) rather than a fresh closure
+        per call, or the memo churns. It is bounded like
+        :meth:`compile_configs`.
+        """
+
+        self.ensure_loaded()
+        available = context_diagnosis_tokens(context)
+        key = (predicate, available)
+        selected = self._plans.get(key)
+        if selected is None:
+            selected = tuple(
+                rule
+                for rule_id, rule in self._rules.items()
+                if (predicate is None or predicate(rule)) and is_applicable(self._required_tokens[rule_id], available)
+            )
+            if len(self._plans) >= _MAX_PLANS:
+                self._plans.clear()
+            self._plans[key] = selected
+        return selected
+
     def detect_all(
         self,
         window: PatternInputBundle,
         context: PatternContext,
         predicate: Callable[[PatternRule], bool] | None = None,
+        *,
+        executor: Executor | None = None,
+    ) -> list[PatternDetection]:
+        """Run every registered rule, optionally filtering.
+
+        When ``executor`` is provided the selected rules are evaluated
+        concurrently. Outputs keep registration order and, with or without an
+        executor, a rule that raises yields an ``ERROR`` detection instead of
+        aborting the remaining rules.
+        """
+
+        if not context.rule_configs:
+            context = replace(context, rule_configs=self.compile_configs(context.thresholds, context.pattern_settings))
+        return self.run_rules(self.plan(context, predicate), window, context, executor=executor)
+
+    def run_rules(
+        self,
+        selected: Iterable[PatternRule],
+        window: PatternInputBundle,
+        context: PatternContext,
+        *,
+        executor: Executor | None = None,
     ) -> list[PatternDetection]:
-        """Run every registered rule, optionally filtering."""
-
-        outputs: list[PatternDetection] = []
-        for rule in self._rules.values():
-            if predicate is not None and not predicate(rule):
-                continue
-            if not should_evaluate_rule(rule, context):
-                continue
-            detection = rule.detect(window, context)
-            outputs.append(detection)
+        """Evaluate ``selected`` rules in order, as :meth:`detect_all` does after planning.
+
+        A rule that raises yields an ``ERROR`` detection on both the sequential
+        and the executor path.
+        """
+
+        selected = tuple(selected)
+        if not selected:
+            return []
+        if executor is None:
+            outputs: list[PatternDetection] = []
+            for rule in selected:
+                try:
+                    outputs.append(rule.detect(window, context))
+                except Exception as exc:
+                    outputs.append(_error_detection(rule, context, exc))
+            return outputs
+
+        # Prepare raw days up front so concurrent rules share the cached frames
+        # instead of racing to build the same PreparedDay.
+        for day in window.validation_days:
+            window.prepared_day(day)
+
+        futures = [executor.submit(rule.detect, window, context) for rule in selected]
+        outputs = []
+        for rule, future in zip(selected, futures):
+            try:
+                outputs.append(future.result())
+            except Exception as exc:
+                outputs.append(_error_detection(rule, context, exc))
         return outputs
 
 
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _error_detection(rule: PatternRule, context: PatternContext, exc: Exception) -> PatternDetection:
+    logger.error(
+        "Rule %s failed for patient %s on %s",
+        rule.id,
+        context.patient_id,
+        context.analysis_date,
+        exc_info=exc,
+    )
+    return PatternDetection(
+        pattern_id=rule.id,
+        effective_date=context.analysis_date,
+        status=PatternStatus.ERROR,
+        evidence={"error": f"{type(exc).__name__}: {exc}"},
+        metrics={},
+        version=rule.version,
+    )
+
+
 registry = RuleRegistry()
 
 
@@ -1,8 +1,10 @@
 """Base class and utilities for pattern rules."""
 from __future__ import annotations
 
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Any, Mapping
+from dataclasses import dataclass
+from typing import Any, Iterator, Mapping
 
 from .models import (
     PatternContext,
@@ -13,6 +15,63 @@ from .models import (
 )
 
 
+@dataclass(frozen=True)
+class RuleParameter:
+    """Typed threshold a rule reads from the pattern context."""
+
+    name: str
+    type: type
+    default: Any
+
+    def coerce(self, rule_id: str, value: Any) -> Any:
+        try:
+            return self.type(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid value {value!r} for parameter '{self.name}' of rule '{rule_id}'") from exc
+
+
+class RuleConfig(Mapping[str, Any]):
+    """Frozen, resolved parameter values for one rule, readable as attributes."""
+
+    __slots__ = ("_values", "_fingerprint")
+
+    def __init__(self, values: Mapping[str, Any]) -> None:
+        object.__setattr__(self, "_values", dict(values))
+        object.__setattr__(self, "_fingerprint", None)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("RuleConfig is immutable")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (RuleConfig, (self._values,))
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"RuleConfig({self._values!r})"
+
+    def fingerprint(self) -> str:
+        """Stable digest of the resolved values, used to key cached detections."""
+
+        if self._fingerprint is None:
+            payload = repr(sorted(self._values.items())).encode()
+            object.__setattr__(self, "_fingerprint", hashlib.blake2b(payload, digest_size=16).hexdigest())
+        return self._fingerprint
+
+
 class PatternRule(ABC):
     """Abstract pattern rule with metadata."""
 
@@ -20,6 +79,7 @@ class PatternRule(ABC):
     description: str = ""
     version: str = "1.0.0"
     inputs: tuple[str, ...] = ("cgm_data",)
+    parameters: tuple[RuleParameter, ...] = ()
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         super().__init_subclass__(**kwargs)
@@ -36,6 +96,7 @@ class PatternRule(ABC):
             description=self.description or self.id,
             version=self.version,
             inputs=self.inputs,
+            config_defaults={parameter.name: parameter.default for parameter in self.parameters},
         )
 
     @abstractmethod
@@ -47,6 +108,31 @@ class PatternRule(ABC):
 
         return context.pattern_threshold(self.id, key, default)
 
+    def compile_config(
+        self,
+        thresholds: Mapping[str, Any],
+        pattern_settings: Mapping[str, Mapping[str, Any]],
+    ) -> RuleConfig:
+        """Resolve and validate the declared parameters once."""
+
+        overrides = pattern_settings.get(self.id, {})
+        values: dict[str, Any] = {}
+        for parameter in self.parameters:
+            if parameter.name in overrides:
+                raw = overrides[parameter.name]
+            else:
+                raw = thresholds.get(parameter.name, parameter.default)
+            values[parameter.name] = parameter.coerce(self.id, raw)
+        return RuleConfig(values)
+
+    def config(self, context: PatternContext) -> RuleConfig:
+        """Return resolved parameters, preferring those compiled into the context."""
+
+        compiled = context.rule_configs.get(self.id)
+        if compiled is None:
+            compiled = self.compile_config(context.thresholds, context.pattern_settings)
+        return compiled
+
     def ensure_validation_window(
         self,
         window: PatternInputBundle,
@@ -1,13 +1,44 @@
-"""Rule package that ensures registration on import."""
+"""Rule package that announces its rules to the registry on import.
+
+Rule modules are imported lazily, the first time a rule is looked up or
+evaluated, so importing the package stays cheap for short-lived processes.
+"""
 from __future__ import annotations
 
 import pkgutil
 from importlib import import_module, reload
+from types import ModuleType
 
-from ..registry import clear_registry
+from ..registry import clear_registry, registry
 
 _EXCLUDED_MODULES = {"utils"}
 
+# Rule id -> defining module. Keep in sync when adding a rule module.
+RULE_MANIFEST: dict[str, str] = {
+    "afternoon_hypoglycemia": "afternoon_hypoglycemia",
+    "afternoon_spike": "afternoon_spike",
+    "dawn_phenomenon": "dawn_phenomenon",
+    "day_to_day_variability": "day_to_day_variability",
+    "dual_peak": "dual_peak",
+    "early_morning_hypoglycemia": "early_morning_hypoglycemia",
+    "evening_hypoglycemia": "evening_hypoglycemia",
+    "evening_spike": "evening_spike",
+    "frequent_hypoglycemia": "frequent_hypoglycemia",
+    "frequent_spike": "frequent_spike",
+    "high_glycemic_variability": "high_glycemic_variability",
+    "mid_morning_hypoglycemia": "mid_morning_hypoglycemia",
+    "morning_hyperglycemia": "morning_hyperglycemia",
+    "morning_spike": "morning_spike",
+    "nocturnal_hypoglycemia_moderate": "nocturnal_hypoglycemia_moderate",
+    "nocturnal_hypoglycemia_severe": "nocturnal_hypoglycemia_severe",
+    "overnight_compression_low": "overnight_compression_low",
+    "overnight_hyperglycemia": "overnight_hyperglycemia",
+    "persistent_hyperglycemia": "persistent_hyperglycemia",
+    "prebed_hypoglycemia": "prebed_hypoglycemia",
+    "prolonged_plateau_spike": "prolonged_plateau_spike",
+    "somogyi_effect": "somogyi",
+}
+
 
 def _discover_rule_modules() -> list[str]:
     """Return sorted module names containing rule definitions."""
@@ -27,6 +58,13 @@ def _discover_rule_modules() -> list[str]:
 _RULE_MODULES = _discover_rule_modules()
 
 
+def announce_rules() -> None:
+    """Register every manifest entry lazily with the global registry."""
+
+    for rule_id, module_name in RULE_MANIFEST.items():
+        registry.register_lazy(rule_id, f"{__name__}.{module_name}")
+
+
 def register_all_rules() -> None:
     """Import each rule module; classes self-register via decorator."""
 
@@ -44,6 +82,12 @@ def reload_rules(*, clear: bool = True) -> None:
         reload(module)
 
 
-register_all_rules()
+def __getattr__(name: str) -> ModuleType:
+    if name in _RULE_MODULES:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+announce_rules()
 
 __all__ = list(_RULE_MODULES)
@@ -7,7 +7,7 @@ import pandas as pd
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -20,24 +20,41 @@ class AfternoonSpikeRule(PatternRule):
     )
     version = "1.0.0"
     metadata = PATTERN_METADATA[37]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("afternoon_spike_days_required", int, 3),
+        RuleParameter("afternoon_spike_baseline_minutes", float, 30.0),
+        RuleParameter("afternoon_spike_derivative_threshold", float, 1.0),
+        RuleParameter("afternoon_spike_amplitude_threshold", float, 50.0),
+        RuleParameter("afternoon_spike_peak_threshold", float, 180.0),
+        RuleParameter("afternoon_spike_window_start", float, 12.0),
+        RuleParameter("afternoon_spike_window_end", float, 17.0),
+        RuleParameter("afternoon_spike_smoothing_window", int, 11),
+        RuleParameter("afternoon_spike_recovery_fraction", float, 0.5),
+        RuleParameter("afternoon_spike_max_time_to_peak", float, 120.0),
+        RuleParameter("afternoon_spike_max_recovery_minutes", float, 120.0),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        events_required = int(self.resolved_threshold(context, "afternoon_spike_days_required", 3))
-
-        baseline_duration_min = float(self.resolved_threshold(context, "afternoon_spike_baseline_minutes", 30.0))
-        derivative_threshold = float(self.resolved_threshold(context, "afternoon_spike_derivative_threshold", 1.0))
-        amplitude_threshold = float(self.resolved_threshold(context, "afternoon_spike_amplitude_threshold", 50.0))
-        peak_threshold = float(self.resolved_threshold(context, "afternoon_spike_peak_threshold", 180.0))
-        window_start = float(self.resolved_threshold(context, "afternoon_spike_window_start", 12.0))
-        window_end = float(self.resolved_threshold(context, "afternoon_spike_window_end", 17.0))
-        smoothing_window = int(self.resolved_threshold(context, "afternoon_spike_smoothing_window", 11))
-        recovery_threshold_fraction = float(self.resolved_threshold(context, "afternoon_spike_recovery_fraction", 0.5))
-        max_time_to_peak = float(self.resolved_threshold(context, "afternoon_spike_max_time_to_peak", 120.0))
-        max_recovery_minutes = float(self.resolved_threshold(context, "afternoon_spike_max_recovery_minutes", 120.0))
-
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        events_required = config.afternoon_spike_days_required
+
+        baseline_duration_min = config.afternoon_spike_baseline_minutes
+        derivative_threshold = config.afternoon_spike_derivative_threshold
+        amplitude_threshold = config.afternoon_spike_amplitude_threshold
+        peak_threshold = config.afternoon_spike_peak_threshold
+        window_start = config.afternoon_spike_window_start
+        window_end = config.afternoon_spike_window_end
+        smoothing_window = config.afternoon_spike_smoothing_window
+        recovery_threshold_fraction = config.afternoon_spike_recovery_fraction
+        max_time_to_peak = config.afternoon_spike_max_time_to_peak
+        max_recovery_minutes = config.afternoon_spike_max_recovery_minutes
+
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
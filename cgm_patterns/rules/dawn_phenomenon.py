@@ -6,7 +6,7 @@ from typing import Any
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -18,25 +18,35 @@ class DawnPhenomenonRule(PatternRule):
     )
     version = "1.0.0"
     metadata = PATTERN_METADATA[14]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("analysis_days_required", int, 3),
+        RuleParameter("dawn_days_required", int, 3),
+        RuleParameter("dawn_rise_threshold", float, 20.0),
+        RuleParameter("dawn_overnight_low_threshold", float, 70.0),
+        RuleParameter("dawn_baseline_range_threshold", float, 20.0),
+        RuleParameter("dawn_baseline_start_hour", float, 0.0),
+        RuleParameter("dawn_baseline_end_hour", float, 3.0),
+        RuleParameter("dawn_rise_window_start_hour", float, 3.0),
+        RuleParameter("dawn_rise_window_end_hour", float, 8.0),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 3))
-
-        detection_days_required = int(self.resolved_threshold(context, "dawn_days_required", 3))
-        rise_threshold = float(self.resolved_threshold(context, "dawn_rise_threshold", 20.0))
-        overnight_low_threshold = float(
-            self.resolved_threshold(context, "dawn_overnight_low_threshold", 70.0)
-        )
-        baseline_range_threshold = float(
-            self.resolved_threshold(context, "dawn_baseline_range_threshold", 20.0)
-        )
-
-        baseline_start = float(self.resolved_threshold(context, "dawn_baseline_start_hour", 0.0))
-        baseline_end = float(self.resolved_threshold(context, "dawn_baseline_end_hour", 3.0))
-        rise_window_start = float(self.resolved_threshold(context, "dawn_rise_window_start_hour", 3.0))
-        rise_window_end = float(self.resolved_threshold(context, "dawn_rise_window_end_hour", 8.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        analysis_window_days = config.analysis_window_days
+        required_days = config.analysis_days_required
+
+        detection_days_required = config.dawn_days_required
+        rise_threshold = config.dawn_rise_threshold
+        overnight_low_threshold = config.dawn_overnight_low_threshold
+        baseline_range_threshold = config.dawn_baseline_range_threshold
+
+        baseline_start = config.dawn_baseline_start_hour
+        baseline_end = config.dawn_baseline_end_hour
+        rise_window_start = config.dawn_rise_window_start_hour
+        rise_window_end = config.dawn_rise_window_end_hour
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
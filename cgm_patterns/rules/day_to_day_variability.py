@@ -10,7 +10,7 @@ import pandas as pd
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import coefficient_of_variation, day_of_week
 
 
@@ -41,19 +41,31 @@ class DayToDayVariabilityRule(PatternRule):
     )
     version = "1.0.0"
     metadata = PATTERN_METADATA[24]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 10),
+        RuleParameter("weekend_variability_required", int, 2),
+        RuleParameter("weekend_cv_ratio_threshold", float, 1.15),
+        RuleParameter("weekend_range_ratio_threshold", float, 1.25),
+        RuleParameter("weekend_absolute_cv_threshold", float, 0.30),
+        RuleParameter("weekend_absolute_range_threshold", float, 60.0),
+        RuleParameter("analysis_window_days", int, 30),
+        RuleParameter("baseline_weekdays_required", int, 5),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 10))
-        weekends_required = int(self.resolved_threshold(context, "weekend_variability_required", 2))
-
-        cv_ratio_threshold = float(self.resolved_threshold(context, "weekend_cv_ratio_threshold", 1.15))
-        range_ratio_threshold = float(self.resolved_threshold(context, "weekend_range_ratio_threshold", 1.25))
-        absolute_cv_threshold = float(self.resolved_threshold(context, "weekend_absolute_cv_threshold", 0.30))
-        absolute_range_threshold = float(self.resolved_threshold(context, "weekend_absolute_range_threshold", 60.0))
-
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 30))
-        baseline_weekdays_required = int(self.resolved_threshold(context, "baseline_weekdays_required", 5))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        weekends_required = config.weekend_variability_required
+
+        cv_ratio_threshold = config.weekend_cv_ratio_threshold
+        range_ratio_threshold = config.weekend_range_ratio_threshold
+        absolute_cv_threshold = config.weekend_absolute_cv_threshold
+        absolute_range_threshold = config.weekend_absolute_range_threshold
+
+        analysis_window_days = config.analysis_window_days
+        baseline_weekdays_required = config.baseline_weekdays_required
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
@@ -7,7 +7,7 @@ import pandas as pd
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 def _find_extrema(smoothed: np.ndarray) -> tuple[list[int], list[int]]:
     """Return indices of local maxima and minima in the smoothed series."""
@@ -38,19 +38,31 @@ class DualPeakRule(PatternRule):
     )
     version = "1.0.0"
     metadata = PATTERN_METADATA[25]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("dual_peak_days_required", int, 2),
+        RuleParameter("dual_peak_first_peak_threshold", float, 180.0),
+        RuleParameter("dual_peak_secondary_rise", float, 30.0),
+        RuleParameter("dual_peak_drop_threshold", float, 20.0),
+        RuleParameter("dual_peak_hours_between", float, 4.0),
+        RuleParameter("dual_peak_smoothing_window", int, 11),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        events_required = int(self.resolved_threshold(context, "dual_peak_days_required", 2))
-
-        first_peak_threshold = float(self.resolved_threshold(context, "dual_peak_first_peak_threshold", 180.0))
-        secondary_rise_threshold = float(self.resolved_threshold(context, "dual_peak_secondary_rise", 30.0))
-        drop_threshold = float(self.resolved_threshold(context, "dual_peak_drop_threshold", 20.0))
-        max_hours_between_peaks = float(self.resolved_threshold(context, "dual_peak_hours_between", 4.0))
-        smoothing_window = int(self.resolved_threshold(context, "dual_peak_smoothing_window", 11))
-
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        events_required = config.dual_peak_days_required
+
+        first_peak_threshold = config.dual_peak_first_peak_threshold
+        secondary_rise_threshold = config.dual_peak_secondary_rise
+        drop_threshold = config.dual_peak_drop_threshold
+        max_hours_between_peaks = config.dual_peak_hours_between
+        smoothing_window = config.dual_peak_smoothing_window
+
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
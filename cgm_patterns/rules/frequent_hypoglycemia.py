@@ -9,7 +9,7 @@ import pandas as pd
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import consecutive_durations
 
 
@@ -23,15 +23,25 @@ class FrequentHypoglycemiaRule(PatternRule):
     )
     version = "1.0.0"
     metadata = PATTERN_METADATA[36]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 10),
+        RuleParameter("frequent_low_threshold", float, 70.0),
+        RuleParameter("frequent_low_duration", float, 15.0),
+        RuleParameter("frequent_low_days_required", int, 7),
+        RuleParameter("frequent_low_day_ratio", float, 0.4),
+        RuleParameter("analysis_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 10))
-        low_threshold = float(self.resolved_threshold(context, "frequent_low_threshold", 70.0))
-        minimum_minutes = float(self.resolved_threshold(context, "frequent_low_duration", 15.0))
-        minimum_event_days = int(self.resolved_threshold(context, "frequent_low_days_required", 7))
-        ratio_threshold = float(self.resolved_threshold(context, "frequent_low_day_ratio", 0.4))
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 14))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        low_threshold = config.frequent_low_threshold
+        minimum_minutes = config.frequent_low_duration
+        minimum_event_days = config.frequent_low_days_required
+        ratio_threshold = config.frequent_low_day_ratio
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
@@ -7,7 +7,7 @@ import pandas as pd
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -20,18 +20,29 @@ class FrequentSpikeRule(PatternRule):
     )
     version = "1.0.0"
     metadata = PATTERN_METADATA[1]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("frequent_spike_days_required", int, 3),
+        RuleParameter("frequent_spike_rise_threshold", float, 50.0),
+        RuleParameter("frequent_spike_rise_window", float, 60.0),
+        RuleParameter("frequent_spike_recovery_minutes", float, 90.0),
+        RuleParameter("frequent_spike_per_day", int, 3),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        days_required = int(self.resolved_threshold(context, "frequent_spike_days_required", 3))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        days_required = config.frequent_spike_days_required
 
-        rise_threshold = float(self.resolved_threshold(context, "frequent_spike_rise_threshold", 50.0))
-        rise_window_minutes = float(self.resolved_threshold(context, "frequent_spike_rise_window", 60.0))
-        recovery_minutes = float(self.resolved_threshold(context, "frequent_spike_recovery_minutes", 90.0))
-        spikes_per_day_required = int(self.resolved_threshold(context, "frequent_spike_per_day", 3))
+        rise_threshold = config.frequent_spike_rise_threshold
+        rise_window_minutes = config.frequent_spike_rise_window
+        recovery_minutes = config.frequent_spike_recovery_minutes
+        spikes_per_day_required = config.frequent_spike_per_day
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
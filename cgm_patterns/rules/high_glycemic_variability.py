@@ -6,7 +6,7 @@ from typing import Any
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import coefficient_of_variation
 
 
@@ -17,13 +17,21 @@ class HighGlycemicVariabilityRule(PatternRule):
     description = "CV >=30% in any one day within the last 7 days"
     version = "1.0.0"
     metadata = PATTERN_METADATA[3]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("high_variability_cv_threshold", float, 0.36),
+        RuleParameter("high_variability_days_required", int, 1),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        cv_threshold = float(self.resolved_threshold(context, "high_variability_cv_threshold", 0.36))
-        detection_days_required = int(self.resolved_threshold(context, "high_variability_days_required", 1))
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        cv_threshold = config.high_variability_cv_threshold
+        detection_days_required = config.high_variability_days_required
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
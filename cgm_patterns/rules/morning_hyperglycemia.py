@@ -4,7 +4,7 @@ from __future__ import annotations
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import total_minutes
 
 
@@ -15,16 +15,26 @@ class MorningHyperglycemiaRule(PatternRule):
     description = "BG >130 mg/dL between 04:00–08:00 on ≥3 mornings within a 7-day period"
     version = "1.1.0"
     metadata = PATTERN_METADATA[37]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("morning_low_threshold", float, 130.0),
+        RuleParameter("morning_low_days_required", int, 3),
+        RuleParameter("morning_low_window_start", float, 4.0),
+        RuleParameter("morning_low_window_end", float, 8.0),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        high_threshold = float(self.resolved_threshold(context, "morning_low_threshold", 130.0))
-        mornings_required = int(self.resolved_threshold(context, "morning_low_days_required", 3))
-        window_start = float(self.resolved_threshold(context, "morning_low_window_start", 4.0))
-        window_end = float(self.resolved_threshold(context, "morning_low_window_end", 8.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        high_threshold = config.morning_low_threshold
+        mornings_required = config.morning_low_days_required
+        window_start = config.morning_low_window_start
+        window_end = config.morning_low_window_end
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
@@ -4,7 +4,7 @@ from __future__ import annotations
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import total_minutes
 
 
@@ -15,17 +15,28 @@ class NocturnalHypoglycemiaModerateRule(PatternRule):
     description = "BG <70 mg/dL between 00:00–06:00 ≥15 minutes on ≥2 separate nights within a 7-day period"
     version = "1.3.0"
     metadata = PATTERN_METADATA[5]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("overnight_low_threshold", float, 70.0),
+        RuleParameter("overnight_low_minutes", float, 15.0),
+        RuleParameter("overnight_nights_required", int, 2),
+        RuleParameter("overnight_sleep_window_start", float, 0.0),
+        RuleParameter("overnight_sleep_window_end", float, 6.0),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        low_threshold = float(self.resolved_threshold(context, "overnight_low_threshold", 70.0))
-        minimum_minutes = float(self.resolved_threshold(context, "overnight_low_minutes", 15.0))
-        nights_required = int(self.resolved_threshold(context, "overnight_nights_required", 2))
-        sleep_window_start = float(self.resolved_threshold(context, "overnight_sleep_window_start", 0.0))
-        sleep_window_end = float(self.resolved_threshold(context, "overnight_sleep_window_end", 6.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        low_threshold = config.overnight_low_threshold
+        minimum_minutes = config.overnight_low_minutes
+        nights_required = config.overnight_nights_required
+        sleep_window_start = config.overnight_sleep_window_start
+        sleep_window_end = config.overnight_sleep_window_end
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
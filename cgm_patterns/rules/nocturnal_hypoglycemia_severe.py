@@ -4,7 +4,7 @@ from __future__ import annotations
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import total_minutes
 
 
@@ -15,16 +15,26 @@ class NocturnalHypoglycemiaSevereRule(PatternRule):
     description = "BG <54 mg/dL between 00:00–06:00 at least once within a 7-day period"
     version = "1.3.0"
     metadata = PATTERN_METADATA[5]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("overnight_critical_threshold", float, 54.0),
+        RuleParameter("overnight_nights_required", int, 1),
+        RuleParameter("overnight_sleep_window_start", float, 0.0),
+        RuleParameter("overnight_sleep_window_end", float, 6.0),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        critical_threshold = float(self.resolved_threshold(context, "overnight_critical_threshold", 54.0))
-        nights_required = int(self.resolved_threshold(context, "overnight_nights_required", 1))
-        sleep_window_start = float(self.resolved_threshold(context, "overnight_sleep_window_start", 0.0))
-        sleep_window_end = float(self.resolved_threshold(context, "overnight_sleep_window_end", 6.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        critical_threshold = config.overnight_critical_threshold
+        nights_required = config.overnight_nights_required
+        sleep_window_start = config.overnight_sleep_window_start
+        sleep_window_end = config.overnight_sleep_window_end
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
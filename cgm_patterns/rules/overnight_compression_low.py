@@ -4,7 +4,7 @@ from __future__ import annotations
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -14,19 +14,32 @@ class OvernightCompressionLowRule(PatternRule):
     description = "Overnight glucose <70 mg/dL <15 min with flanking ≥80 mg/dL and >10 mg/dL/5 min drop & recovery"
     version = "1.0.0"
     metadata = PATTERN_METADATA[5]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("compression_low_threshold", float, 70.0),
+        RuleParameter("compression_surrounding_threshold", float, 80.0),
+        RuleParameter("compression_drop_rate_threshold", float, 10.0),
+        RuleParameter("compression_recovery_rate_threshold", float, 10.0),
+        RuleParameter("compression_window_start", float, 0.0),
+        RuleParameter("compression_window_end", float, 6.0),
+        RuleParameter("compression_max_minutes", float, 15.0),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        low_threshold = float(self.resolved_threshold(context, "compression_low_threshold", 70.0))
-        surrounding_threshold = float(self.resolved_threshold(context, "compression_surrounding_threshold", 80.0))
-        drop_rate_threshold = float(self.resolved_threshold(context, "compression_drop_rate_threshold", 10.0))
-        recovery_rate_threshold = float(self.resolved_threshold(context, "compression_recovery_rate_threshold", 10.0))
-        window_start = float(self.resolved_threshold(context, "compression_window_start", 0.0))
-        window_end = float(self.resolved_threshold(context, "compression_window_end", 6.0))
-        max_duration_minutes = float(self.resolved_threshold(context, "compression_max_minutes", 15.0))
-
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        low_threshold = config.compression_low_threshold
+        surrounding_threshold = config.compression_surrounding_threshold
+        drop_rate_threshold = config.compression_drop_rate_threshold
+        recovery_rate_threshold = config.compression_recovery_rate_threshold
+        window_start = config.compression_window_start
+        window_end = config.compression_window_end
+        max_duration_minutes = config.compression_max_minutes
+
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
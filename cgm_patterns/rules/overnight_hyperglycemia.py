@@ -4,7 +4,7 @@ from __future__ import annotations
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import total_minutes
 
 
@@ -15,17 +15,28 @@ class OvernightHyperglycemiaRule(PatternRule):
     description = "BG >180 mg/dL for >50% of 22:00–06:00 on ≥3 nights within a 7-day window"
     version = "1.2.0"
     metadata = PATTERN_METADATA[5]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("overnight_high_threshold", float, 180.0),
+        RuleParameter("overnight_high_percentage", float, 0.5),
+        RuleParameter("overnight_high_nights_required", int, 3),
+        RuleParameter("overnight_high_window_start", float, 22.0),
+        RuleParameter("overnight_high_window_end", float, 6.0),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        high_threshold = float(self.resolved_threshold(context, "overnight_high_threshold", 180.0))
-        percentage_threshold = float(self.resolved_threshold(context, "overnight_high_percentage", 0.5))
-        nights_required = int(self.resolved_threshold(context, "overnight_high_nights_required", 3))
-        window_start = float(self.resolved_threshold(context, "overnight_high_window_start", 22.0))
-        window_end = float(self.resolved_threshold(context, "overnight_high_window_end", 6.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        high_threshold = config.overnight_high_threshold
+        percentage_threshold = config.overnight_high_percentage
+        nights_required = config.overnight_high_nights_required
+        window_start = config.overnight_high_window_start
+        window_end = config.overnight_high_window_end
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
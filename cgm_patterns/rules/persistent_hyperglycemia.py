@@ -6,7 +6,7 @@ import math
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -33,14 +33,22 @@ class PersistentHyperglycemiaRule(PatternRule):
         "condition": ">30%",
         "repeat": "GEQ40PCT",
     }
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 7),
+        RuleParameter("tar_threshold", float, 0.25),
+        RuleParameter("tar_days_fraction_threshold", float, 0.40),
+        RuleParameter("analysis_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 7))
-        tar_threshold = float(self.resolved_threshold(context, "tar_threshold", 0.25))
-        fraction_required = float(self.resolved_threshold(context, "tar_days_fraction_threshold", 0.40))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        tar_threshold = config.tar_threshold
+        fraction_required = config.tar_days_fraction_threshold
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 14))
+        analysis_window_days = config.analysis_window_days
 
         eligible = [s for s in window.analysis_summaries if s.coverage_ratio >= coverage_threshold]
         eligible = eligible[-analysis_window_days:]
@@ -7,7 +7,7 @@ import pandas as pd
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -20,28 +20,47 @@ class ProlongedPlateauSpikeRule(PatternRule):
     )
     version = "1.0.0"
     metadata = PATTERN_METADATA[1]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("plateau_spike_days_required", int, 2),
+        RuleParameter("plateau_baseline_minutes", float, 30.0),
+        RuleParameter("plateau_derivative_threshold", float, 1.0),
+        RuleParameter("plateau_amplitude_threshold", float, 50.0),
+        RuleParameter("plateau_peak_threshold", float, 180.0),
+        RuleParameter("plateau_recovery_derivative_threshold", float, 0.5),
+        RuleParameter("plateau_threshold", float, 180.0),
+        RuleParameter("plateau_minutes_required", float, 180.0),
+        RuleParameter("high_plateau_threshold", float, 250.0),
+        RuleParameter("high_plateau_minutes_required", float, 120.0),
+        RuleParameter("plateau_window_start", float, 0.0),
+        RuleParameter("plateau_window_end", float, 24.0),
+        RuleParameter("plateau_smoothing_window", int, 11),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        events_required = int(self.resolved_threshold(context, "plateau_spike_days_required", 2))
-
-        baseline_duration_min = float(self.resolved_threshold(context, "plateau_baseline_minutes", 30.0))
-        derivative_threshold = float(self.resolved_threshold(context, "plateau_derivative_threshold", 1.0))
-        amplitude_threshold = float(self.resolved_threshold(context, "plateau_amplitude_threshold", 50.0))
-        peak_threshold = float(self.resolved_threshold(context, "plateau_peak_threshold", 180.0))
-        recovery_derivative_threshold = float(self.resolved_threshold(context, "plateau_recovery_derivative_threshold", 0.5))
-
-        plateau_threshold = float(self.resolved_threshold(context, "plateau_threshold", 180.0))
-        plateau_minutes_required = float(self.resolved_threshold(context, "plateau_minutes_required", 180.0))
-        high_plateau_threshold = float(self.resolved_threshold(context, "high_plateau_threshold", 250.0))
-        high_plateau_minutes_required = float(self.resolved_threshold(context, "high_plateau_minutes_required", 120.0))
-
-        window_start = float(self.resolved_threshold(context, "plateau_window_start", 0.0))
-        window_end = float(self.resolved_threshold(context, "plateau_window_end", 24.0))
-        smoothing_window = int(self.resolved_threshold(context, "plateau_smoothing_window", 11))
-
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        events_required = config.plateau_spike_days_required
+
+        baseline_duration_min = config.plateau_baseline_minutes
+        derivative_threshold = config.plateau_derivative_threshold
+        amplitude_threshold = config.plateau_amplitude_threshold
+        peak_threshold = config.plateau_peak_threshold
+        recovery_derivative_threshold = config.plateau_recovery_derivative_threshold
+
+        plateau_threshold = config.plateau_threshold
+        plateau_minutes_required = config.plateau_minutes_required
+        high_plateau_threshold = config.high_plateau_threshold
+        high_plateau_minutes_required = config.high_plateau_minutes_required
+
+        window_start = config.plateau_window_start
+        window_end = config.plateau_window_end
+        smoothing_window = config.plateau_smoothing_window
+
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
@@ -4,7 +4,7 @@ from __future__ import annotations
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import total_minutes
 
 
@@ -15,20 +15,35 @@ class SomogyiEffectRule(PatternRule):
     description = "Overnight BG <70 mg/dL ≥15 min with 03:00–08:00 rise and fasting >180 mg/dL on ≥2 of last 14 days"
     version = "1.2.0"
     metadata = PATTERN_METADATA[12]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("analysis_window_days", int, 14),
+        RuleParameter("somogyi_low_window_start", float, 0.0),
+        RuleParameter("somogyi_low_window_end", float, 3.0),
+        RuleParameter("somogyi_low_threshold", float, 70.0),
+        RuleParameter("somogyi_low_minutes", float, 15.0),
+        RuleParameter("somogyi_morning_window_start", float, 3.0),
+        RuleParameter("somogyi_morning_window_end", float, 8.0),
+        RuleParameter("somogyi_rise_threshold", float, 30.0),
+        RuleParameter("somogyi_fpg_threshold", float, 180.0),
+        RuleParameter("somogyi_days_required", int, 2),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 14))   # Work window: last 14 eligible days (each with ≥70 % CGM coverage; need at least 5 days to decide).
-        low_window_start = float(self.resolved_threshold(context, "somogyi_low_window_start", 0.0))
-        low_window_end = float(self.resolved_threshold(context, "somogyi_low_window_end", 3.0))
-        low_threshold = float(self.resolved_threshold(context, "somogyi_low_threshold", 70.0))
-        minimum_low_minutes = float(self.resolved_threshold(context, "somogyi_low_minutes", 15.0))
-        morning_window_start = float(self.resolved_threshold(context, "somogyi_morning_window_start", 3.0))
-        morning_window_end = float(self.resolved_threshold(context, "somogyi_morning_window_end", 8.0))
-        rise_threshold = float(self.resolved_threshold(context, "somogyi_rise_threshold", 30.0))
-        fpg_threshold = float(self.resolved_threshold(context, "somogyi_fpg_threshold", 180.0))
-        qualifying_days_required = int(self.resolved_threshold(context, "somogyi_days_required", 2))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        analysis_window_days = config.analysis_window_days   # Work window: last 14 eligible days (each with ≥70 % CGM coverage; need at least 5 days to decide).
+        low_window_start = config.somogyi_low_window_start
+        low_window_end = config.somogyi_low_window_end
+        low_threshold = config.somogyi_low_threshold
+        minimum_low_minutes = config.somogyi_low_minutes
+        morning_window_start = config.somogyi_morning_window_start
+        morning_window_end = config.somogyi_morning_window_end
+        rise_threshold = config.somogyi_rise_threshold
+        fpg_threshold = config.somogyi_fpg_threshold
+        qualifying_days_required = config.somogyi_days_required
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
@@ -2,15 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import timedelta, timezone
 from typing import Iterable
 
 import math
 import numpy as np
 import pandas as pd
-from zoneinfo import ZoneInfo
 
 from ..models import CGMDay
+from ..timezones import local_minute_of_day, resolve_timezone
 
 
 @dataclass(frozen=True)
@@ -34,45 +33,21 @@ def prepare_day(day: CGMDay) -> PreparedDay:
 
     df = day.readings.copy()
     if df.empty:
-        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "glucose_mg_dL", "minutes"]), day.local_timezone)
+        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "local_minute", "glucose_mg_dL", "minutes"]), day.local_timezone)
 
     df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
     df["glucose_mg_dL"] = pd.to_numeric(df.get("glucose_mg_dL"), errors="coerce")
     df = df.dropna(subset=["timestamp", "glucose_mg_dL"])
     df = df.sort_values("timestamp")
     if df.empty:
-        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "glucose_mg_dL", "minutes"]), day.local_timezone)
-
-    if day.local_timezone:
-        tz_info = None
-        try:
-            tz_info = ZoneInfo(day.local_timezone)
-        except Exception:
-            label = day.local_timezone.upper()
-            if label == "UTC":
-                tz_info = timezone.utc
-            elif label.startswith("UTC"):
-                try:
-                    sign = 1
-                    offset_str = label[3:]
-                    if offset_str.startswith("+"):
-                        offset_str = offset_str[1:]
-                    elif offset_str.startswith("-"):
-                        sign = -1
-                        offset_str = offset_str[1:]
-                    parts = offset_str.split(":")
-                    hours = int(parts[0]) if parts and parts[0] else 0
-                    minutes = int(parts[1]) if len(parts) > 1 and parts[1] else 0
-                    delta = timedelta(hours=hours, minutes=minutes)
-                    tz_info = timezone(sign * delta)
-                except Exception:
-                    tz_info = None
-        if tz_info is not None:
-            df["local_time"] = df["timestamp"].dt.tz_convert(tz_info)
-        else:
-            df["local_time"] = df["timestamp"]
+        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "local_minute", "glucose_mg_dL", "minutes"]), day.local_timezone)
+
+    tz_info = resolve_timezone(day.local_timezone) if day.local_timezone else None
+    if tz_info is not None:
+        df["local_time"] = df["timestamp"].dt.tz_convert(tz_info)
     else:
         df["local_time"] = df["timestamp"]
+    df["local_minute"] = local_minute_of_day(df["timestamp"], tz_info)
 
     deltas = df["timestamp"].shift(-1) - df["timestamp"]
     minutes = deltas.dt.total_seconds() / 60.0
@@ -104,11 +79,13 @@ def filter_time_window(day: PreparedDay, start_hour: float, end_hour: float) ->
     if frame.empty:
         return frame
 
-    local = frame["local_time"].dt.hour + frame["local_time"].dt.minute / 60.0
+    local = frame["local_minute"].to_numpy()
+    start_minute = start_hour * 60.0
+    end_minute = end_hour * 60.0
     if start_hour <= end_hour:
-        mask = (local >= start_hour) & (local < end_hour)
+        mask = (local >= start_minute) & (local < end_minute)
     else:
-        mask = (local >= start_hour) | (local < end_hour)
+        mask = (local >= start_minute) | (local < end_minute)
     return frame.loc[mask]
 
 
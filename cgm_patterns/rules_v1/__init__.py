@@ -1,7 +1,10 @@
-"""Rule package that ensures registration on import."""
+"""Rule package that announces its rules to the registry on import."""
 from __future__ import annotations
 
 from importlib import import_module
+from types import ModuleType
+
+from ..registry import registry
 
 _MODULES = [
     "predominant_hyperglycemia",
@@ -24,8 +27,16 @@ _MODULES = [
     "recurrent_post_meal_spike",
 ]
 
-# Import selected rules to trigger registration side-effects.
+# Each module defines the rule whose id matches the module name; rules are
+# imported on first lookup or evaluation.
 for _module in _MODULES:
-    import_module(f"{__name__}.{_module}")
+    registry.register_lazy(_module, f"{__name__}.{_module}")
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in _MODULES:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = list(_MODULES)
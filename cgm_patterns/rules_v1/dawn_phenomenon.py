@@ -6,7 +6,7 @@ import math
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import filter_time_window, prepare_day
 
 
@@ -17,17 +17,28 @@ class DawnPhenomenonRule(PatternRule):
     description = "BG rise ≥30 mg/dL from 00:00–06:00 nadir to 03:00–08:00 peak without intervening hypoglycemia"
     version = "1.2.0"
     metadata = PATTERN_METADATA[14]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("dawn_rise_threshold", float, 30.0),
+        RuleParameter("dawn_overnight_start", float, 0.0),
+        RuleParameter("dawn_overnight_end", float, 6.0),
+        RuleParameter("dawn_morning_start", float, 3.0),
+        RuleParameter("dawn_morning_end", float, 8.0),
+        RuleParameter("analysis_window_days", int, 7),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        rise_threshold = float(self.resolved_threshold(context, "dawn_rise_threshold", 30.0))
-        overnight_start = float(self.resolved_threshold(context, "dawn_overnight_start", 0.0))
-        overnight_end = float(self.resolved_threshold(context, "dawn_overnight_end", 6.0))
-        morning_start = float(self.resolved_threshold(context, "dawn_morning_start", 3.0))
-        morning_end = float(self.resolved_threshold(context, "dawn_morning_end", 8.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        rise_threshold = config.dawn_rise_threshold
+        overnight_start = config.dawn_overnight_start
+        overnight_end = config.dawn_overnight_end
+        morning_start = config.dawn_morning_start
+        morning_end = config.dawn_morning_end
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
+        analysis_window_days = config.analysis_window_days
 
         eligible_days = [day for day in window.analysis_days if day.coverage_ratio() >= coverage_threshold]
         eligible_days = eligible_days[-analysis_window_days:]
@@ -6,7 +6,7 @@ import math
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import coefficient_of_variation, filter_time_window, interquartile_range, prepare_day
 
 
@@ -17,16 +17,26 @@ class EveningVariabilitySpikeRule(PatternRule):
     description = "Evening IQR>40 mg/dL or CV>36% on ≥40% of last 7 days"
     version = "1.0.0"
     metadata = PATTERN_METADATA[25]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("evening_days_fraction", float, 0.40),
+        RuleParameter("evening_iqr_threshold", float, 40.0),
+        RuleParameter("evening_cv_threshold", float, 0.36),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        fraction_required = float(self.resolved_threshold(context, "evening_days_fraction", 0.40))
-        iqr_threshold = float(self.resolved_threshold(context, "evening_iqr_threshold", 40.0))
-        cv_threshold = float(self.resolved_threshold(context, "evening_cv_threshold", 0.36))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        fraction_required = config.evening_days_fraction
+        iqr_threshold = config.evening_iqr_threshold
+        cv_threshold = config.evening_cv_threshold
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
@@ -6,7 +6,7 @@ import math
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -16,15 +16,24 @@ class HighGlycemicVariabilityRule(PatternRule):
     description = "Median coefficient of variation ≥36% across last 7 days"
     version = "1.0.0"
     metadata = PATTERN_METADATA[3]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("cv_threshold", float, 0.36),
+        RuleParameter("cv_days_required", int, 3),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        cv_threshold = float(self.resolved_threshold(context, "cv_threshold", 0.36))
-        days_needed = int(self.resolved_threshold(context, "cv_days_required", 3))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        cv_threshold = config.cv_threshold
+        days_needed = config.cv_days_required
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import consecutive_durations, prepare_day, rate_of_change
 
 
@@ -24,12 +24,19 @@ class ImplausibleRateOfChangeRule(PatternRule):
     description = "|Δ| >5 mg/dL/min sustained for ≥10 minutes"
     version = "1.0.0"
     metadata = PATTERN_METADATA[33]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("validation_window_days", int, 14),
+        RuleParameter("roc_threshold", float, 5.0),
+        RuleParameter("roc_duration_required", float, 10.0),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
-        rate_threshold = float(self.resolved_threshold(context, "roc_threshold", 5.0))
-        duration_required = float(self.resolved_threshold(context, "roc_duration_required", 10.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        validation_window_days = config.validation_window_days
+        rate_threshold = config.roc_threshold
+        duration_required = config.roc_duration_required
 
         validation_days, insufficient_validation = self.ensure_validation_window(
             window,
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import prepare_day
 
 
@@ -23,11 +23,17 @@ class NoisySensorDayRule(PatternRule):
     description = "Detects days where intra-day noise exceeds threshold"
     version = "1.0.0"
     metadata = PATTERN_METADATA[35]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("validation_window_days", int, 14),
+        RuleParameter("noise_index_threshold", float, 30.0),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
-        noise_threshold = float(self.resolved_threshold(context, "noise_index_threshold", 30.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        validation_window_days = config.validation_window_days
+        noise_threshold = config.noise_index_threshold
 
         validation_days, insufficient_validation = self.ensure_validation_window(
             window,
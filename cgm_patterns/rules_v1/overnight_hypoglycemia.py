@@ -1,13 +1,18 @@
-"""Detect overnight hypoglycemia burden."""
+"""Detect overnight hypoglycemia burden.
+
+Low minutes are read off a day grid, where a reading covers at most 15
+minutes, so a sensor gap after a low reading is not counted as low time.
+"""
 from __future__ import annotations
 
 import math
 
+from ..grid import build_day_grid
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
-from .utils import filter_time_window, prepare_day, total_minutes
+from ..rule_base import PatternRule, RuleParameter
+from .utils import prepare_day
 
 
 @register_rule
@@ -15,18 +20,28 @@ class OvernightHypoglycemiaRule(PatternRule):
     id = "overnight_hypoglycemia"
     pattern_id = 5
     description = ">=15 minutes <70 mg/dL between 00:00-06:00 on ≥40% of last 7 days"
-    version = "1.0.0"
+    version = "1.1.0"
     metadata = PATTERN_METADATA[5]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("overnight_low_threshold", float, 70.0),
+        RuleParameter("overnight_low_minutes", float, 15.0),
+        RuleParameter("overnight_days_fraction", float, 0.40),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        low_threshold = float(self.resolved_threshold(context, "overnight_low_threshold", 70.0))
-        minimum_minutes = float(self.resolved_threshold(context, "overnight_low_minutes", 15.0))
-        fraction_required = float(self.resolved_threshold(context, "overnight_days_fraction", 0.40))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        low_threshold = config.overnight_low_threshold
+        minimum_minutes = config.overnight_low_minutes
+        fraction_required = config.overnight_days_fraction
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
@@ -53,21 +68,20 @@ class OvernightHypoglycemiaRule(PatternRule):
                 version=self.version,
             )
 
-        qualifying = []
-        for day in eligible_days:
-            prepared = prepare_day(day)
-            overnight = filter_time_window(prepared, 0.0, 6.0)
-            if overnight.empty:
-                continue
-            mask = overnight["glucose_mg_dL"] < low_threshold
-            minutes = total_minutes(overnight.loc[mask])
-            if minutes >= minimum_minutes:
-                qualifying.append(
-                    {
-                        "service_date": day.service_date.isoformat(),
-                        "minutes_low": minutes,
-                    }
-                )
+        grid = build_day_grid(
+            [prepare_day(day) for day in eligible_days],
+            [day.service_date for day in eligible_days],
+        )
+        covered = grid.covered_minutes(0.0, 6.0)
+        low_minutes = grid.minutes_below(low_threshold, 0.0, 6.0)
+        qualifying = [
+            {
+                "service_date": service_date.isoformat(),
+                "minutes_low": float(minutes),
+            }
+            for service_date, has_data, minutes in zip(grid.dates, covered > 0, low_minutes)
+            if has_data and minutes >= minimum_minutes
+        ]
 
         required_occurrences = max(1, math.ceil(len(eligible_days) * fraction_required))
         status = PatternStatus.DETECTED if len(qualifying) >= required_occurrences else PatternStatus.NOT_DETECTED
@@ -4,7 +4,7 @@ from __future__ import annotations
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import prepare_day, rolling_delta
 
 
@@ -15,15 +15,24 @@ class RapidFallRule(PatternRule):
     description = "≥3 days with >60 mg/dL drop within 15 minutes"
     version = "1.0.0"
     metadata = PATTERN_METADATA[30]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("rapid_fall_threshold", float, -60.0),
+        RuleParameter("rapid_fall_days_required", int, 3),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        fall_threshold = float(self.resolved_threshold(context, "rapid_fall_threshold", -60.0))
-        days_required = int(self.resolved_threshold(context, "rapid_fall_days_required", 3))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        fall_threshold = config.rapid_fall_threshold
+        days_required = config.rapid_fall_days_required
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
@@ -7,7 +7,7 @@ import pandas as pd
 
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -15,16 +15,26 @@ class RecurrentPostMealSpikeRule(PatternRule):
     id = "recurrent_post_meal_spike"
     description = "Glucose rises >180 mg/dL within 2 hours on ≥3 of last 7 days"
     version = "1.0.0"
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("spike_glucose_threshold", float, 180.0),
+        RuleParameter("spike_climb_threshold", float, 50.0),
+        RuleParameter("spike_days_required", int, 3),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        spike_threshold = float(self.resolved_threshold(context, "spike_glucose_threshold", 180.0))
-        climb_threshold = float(self.resolved_threshold(context, "spike_climb_threshold", 50.0))
-        occurrences_needed = int(self.resolved_threshold(context, "spike_days_required", 3))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        spike_threshold = config.spike_glucose_threshold
+        climb_threshold = config.spike_climb_threshold
+        occurrences_needed = config.spike_days_required
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
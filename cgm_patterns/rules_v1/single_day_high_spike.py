@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import prepare_day, total_minutes
 
 
@@ -24,15 +24,24 @@ class SingleDayHighSpikeRule(PatternRule):
     description = "Any day with max glucose >300 mg/dL and <2h above 250 mg/dL"
     version = "1.0.0"
     metadata = PATTERN_METADATA[26]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 7),
+        RuleParameter("spike_max_threshold", float, 300.0),
+        RuleParameter("spike_duration_threshold", float, 120.0),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 7))
-        spike_threshold = float(self.resolved_threshold(context, "spike_max_threshold", 300.0))
-        duration_threshold = float(self.resolved_threshold(context, "spike_duration_threshold", 120.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        spike_threshold = config.spike_max_threshold
+        duration_threshold = config.spike_duration_threshold
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import prepare_day, total_minutes
 
 
@@ -23,13 +23,21 @@ class SingleDayLowRule(PatternRule):
     description = "Any day with ≥15 minutes below 54 mg/dL within 14-day window"
     version = "1.0.0"
     metadata = PATTERN_METADATA[27]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("low_minimum_days", int, 14),
+        RuleParameter("validation_window_days", int, 14),
+        RuleParameter("low_duration_threshold", float, 15.0),
+        RuleParameter("low_glucose_threshold", float, 54.0),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        minimum_days = int(self.resolved_threshold(context, "low_minimum_days", 14))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
-        duration_threshold = float(self.resolved_threshold(context, "low_duration_threshold", 15.0))
-        glucose_threshold = float(self.resolved_threshold(context, "low_glucose_threshold", 54.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        minimum_days = config.low_minimum_days
+        validation_window_days = config.validation_window_days
+        duration_threshold = config.low_duration_threshold
+        glucose_threshold = config.low_glucose_threshold
 
         required_validation_days = max(validation_window_days, minimum_days)
         validation_days, insufficient_validation = self.ensure_validation_window(
@@ -9,7 +9,7 @@ import pandas as pd
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import consecutive_durations, filter_time_window, prepare_day, total_minutes
 
 
@@ -20,19 +20,32 @@ class SomogyiEffectRule(PatternRule):
     description = "Overnight low followed by ≥100 mg/dL rebound within 2-4h"
     version = "1.0.0"
     metadata = PATTERN_METADATA[12]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("somogyi_days_fraction", float, 2 / 7),
+        RuleParameter("somogyi_low_threshold", float, 70.0),
+        RuleParameter("somogyi_low_minutes", float, 15.0),
+        RuleParameter("somogyi_rebound_delta", float, 100.0),
+        RuleParameter("somogyi_rebound_window_hours", float, 4.0),
+        RuleParameter("somogyi_rebound_min_delay_hours", float, 2.0),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        fraction_required = float(self.resolved_threshold(context, "somogyi_days_fraction", 2 / 7))
-        low_threshold = float(self.resolved_threshold(context, "somogyi_low_threshold", 70.0))
-        low_minutes_required = float(self.resolved_threshold(context, "somogyi_low_minutes", 15.0))
-        rebound_delta = float(self.resolved_threshold(context, "somogyi_rebound_delta", 100.0))
-        rebound_window_hours = float(self.resolved_threshold(context, "somogyi_rebound_window_hours", 4.0))
-        rebound_min_delay_hours = float(self.resolved_threshold(context, "somogyi_rebound_min_delay_hours", 2.0))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        fraction_required = config.somogyi_days_fraction
+        low_threshold = config.somogyi_low_threshold
+        low_minutes_required = config.somogyi_low_minutes
+        rebound_delta = config.somogyi_rebound_delta
+        rebound_window_hours = config.somogyi_rebound_window_hours
+        rebound_min_delay_hours = config.somogyi_rebound_min_delay_hours
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
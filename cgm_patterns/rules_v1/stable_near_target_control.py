@@ -6,7 +6,7 @@ import math
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -16,16 +16,26 @@ class StableNearTargetControlRule(PatternRule):
     description = "TIR ≥70% and CV <36% on ≥40% of last 7 days"
     version = "1.0.0"
     metadata = PATTERN_METADATA[4]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+        RuleParameter("tir_threshold", float, 0.70),
+        RuleParameter("cv_threshold", float, 0.36),
+        RuleParameter("stable_days_fraction_threshold", float, 0.40),
+        RuleParameter("analysis_window_days", int, 7),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        required_days = int(self.resolved_threshold(context, "analysis_days_required", 5))
-        tir_threshold = float(self.resolved_threshold(context, "tir_threshold", 0.70))
-        cv_threshold = float(self.resolved_threshold(context, "cv_threshold", 0.36))
-        fraction_required = float(self.resolved_threshold(context, "stable_days_fraction_threshold", 0.40))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        required_days = config.analysis_days_required
+        tir_threshold = config.tir_threshold
+        cv_threshold = config.cv_threshold
+        fraction_required = config.stable_days_fraction_threshold
 
-        analysis_window_days = int(self.resolved_threshold(context, "analysis_window_days", 7))
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        analysis_window_days = config.analysis_window_days
+        validation_window_days = config.validation_window_days
 
         _, insufficient_validation = self.ensure_validation_window(
             window,
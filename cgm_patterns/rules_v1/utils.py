@@ -8,9 +8,9 @@ from typing import Iterable
 import math
 import numpy as np
 import pandas as pd
-from zoneinfo import ZoneInfo
 
 from ..models import CGMDay
+from ..timezones import local_minute_of_day, resolve_zoneinfo
 
 
 @dataclass(frozen=True)
@@ -34,23 +34,22 @@ def prepare_day(day: CGMDay) -> PreparedDay:
 
     df = day.readings.copy()
     if df.empty:
-        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "glucose_mg_dL", "minutes"]), day.local_timezone)
+        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "local_minute", "glucose_mg_dL", "minutes"]), day.local_timezone)
 
     df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
     df["glucose_mg_dL"] = pd.to_numeric(df.get("glucose_mg_dL"), errors="coerce")
     df = df.dropna(subset=["timestamp", "glucose_mg_dL"])
     df = df.sort_values("timestamp")
     if df.empty:
-        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "glucose_mg_dL", "minutes"]), day.local_timezone)
-
-    if day.local_timezone:
-        try:
-            tz = ZoneInfo(day.local_timezone)
-            df["local_time"] = df["timestamp"].dt.tz_convert(tz)
-        except Exception:
-            df["local_time"] = df["timestamp"]
+        return PreparedDay(pd.DataFrame(columns=["timestamp", "local_time", "local_minute", "glucose_mg_dL", "minutes"]), day.local_timezone)
+
+    # v1 rules only honour IANA names; offset labels keep UTC clock times.
+    tz_info = resolve_zoneinfo(day.local_timezone) if day.local_timezone else None
+    if tz_info is not None:
+        df["local_time"] = df["timestamp"].dt.tz_convert(tz_info)
     else:
         df["local_time"] = df["timestamp"]
+    df["local_minute"] = local_minute_of_day(df["timestamp"], tz_info)
 
     deltas = df["timestamp"].shift(-1) - df["timestamp"]
     minutes = deltas.dt.total_seconds() / 60.0
@@ -82,11 +81,13 @@ def filter_time_window(day: PreparedDay, start_hour: float, end_hour: float) ->
     if frame.empty:
         return frame
 
-    local = frame["local_time"].dt.hour + frame["local_time"].dt.minute / 60.0
+    local = frame["local_minute"].to_numpy()
+    start_minute = start_hour * 60.0
+    end_minute = end_hour * 60.0
     if start_hour <= end_hour:
-        mask = (local >= start_hour) & (local < end_hour)
+        mask = (local >= start_minute) & (local < end_minute)
     else:
-        mask = (local >= start_hour) | (local < end_hour)
+        mask = (local >= start_minute) | (local < end_minute)
     return frame.loc[mask]
 
 
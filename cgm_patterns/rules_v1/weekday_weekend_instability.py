@@ -7,7 +7,7 @@ from statistics import mean
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from .utils import coefficient_of_variation, day_of_week, prepare_day
 
 
@@ -18,15 +18,24 @@ class WeekdayWeekendInstabilityRule(PatternRule):
     description = "Weekend TAR or CV exceeds weekday baseline by configured delta"
     version = "1.0.0"
     metadata = PATTERN_METADATA[24]
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("instability_minimum_days", int, 14),
+        RuleParameter("instability_weekends_required", int, 2),
+        RuleParameter("instability_tar_delta", float, 0.10),
+        RuleParameter("instability_cv_delta", float, 0.10),
+        RuleParameter("validation_window_days", int, 14),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "minimum_day_coverage", 0.7))
-        minimum_days = int(self.resolved_threshold(context, "instability_minimum_days", 14))
-        weekends_required = int(self.resolved_threshold(context, "instability_weekends_required", 2))
-        tar_delta = float(self.resolved_threshold(context, "instability_tar_delta", 0.10))
-        cv_delta = float(self.resolved_threshold(context, "instability_cv_delta", 0.10))
+        config = self.config(context)
+        coverage_threshold = config.minimum_day_coverage
+        minimum_days = config.instability_minimum_days
+        weekends_required = config.instability_weekends_required
+        tar_delta = config.instability_tar_delta
+        cv_delta = config.instability_cv_delta
 
-        validation_window_days = int(self.resolved_threshold(context, "validation_window_days", 14))
+        validation_window_days = config.validation_window_days
 
         required_validation_days = max(validation_window_days, minimum_days)
         validation_days, insufficient_validation = self.ensure_validation_window(
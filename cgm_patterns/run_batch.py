@@ -24,6 +24,7 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+from datetime import date
 from importlib import import_module
 from pathlib import Path
 from typing import Any, Callable, Iterable, Mapping, Sequence
@@ -31,8 +32,10 @@ from typing import Any, Callable, Iterable, Mapping, Sequence
 import pandas as pd
 
 import cgm_patterns.rules_v1  # noqa: F401 - ensure rule registration side-effects
+from cgm_patterns.cache import DigestLedger
 from cgm_patterns.engine import SlidingWindowEngine
 from cgm_patterns.models import CGMDay, PatternDetection
+from cgm_patterns.parsing import entries_to_columns, load_json, parse_utc_timestamps
 from cgm_patterns.registry import registry
 
 
@@ -79,8 +82,7 @@ class JsonDirectorySource:
         if not file_path.exists():
             raise FileNotFoundError(f"Missing CGM data file for patient {patient_id}: {file_path}")
 
-        with file_path.open() as handle:
-            day_records = json.load(handle)
+        day_records = load_json(file_path)
 
         for record in day_records:
             yield _record_to_day(patient_id, record)
@@ -97,6 +99,15 @@ class CallableSource:
             yield _record_to_day(patient_id, record)
 
 
+def _parse_service_date(value: Any) -> date:
+    if isinstance(value, str) and len(value) == 10:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return pd.to_datetime(value).date()
+
+
 def _record_to_day(patient_id: str, record: Any) -> CGMDay:
     """Convert a record returned by a source into a ``CGMDay``."""
 
@@ -118,17 +129,19 @@ def _record_to_day(patient_id: str, record: Any) -> CGMDay:
 
     if service_date is None:
         raise ValueError("CGM record missing service_date")
-    service_date = pd.to_datetime(service_date).date()
+    service_date = _parse_service_date(service_date)
 
     if readings is None:
         raise ValueError("CGM record missing readings")
     if isinstance(readings, pd.DataFrame):
         frame = readings.copy()
+    elif isinstance(readings, list) and all(isinstance(entry, Mapping) for entry in readings):
+        frame = pd.DataFrame(entries_to_columns(readings))
     else:
         frame = pd.DataFrame(readings)
     if "timestamp" not in frame or "glucose_mg_dL" not in frame:
         raise ValueError("CGM readings must include 'timestamp' and 'glucose_mg_dL' columns")
-    frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True)
+    frame["timestamp"] = parse_utc_timestamps(frame["timestamp"].tolist(), errors="raise")
 
     return CGMDay(patient_id=patient_id, service_date=service_date, readings=frame)
 
@@ -161,18 +174,52 @@ def run(  # pragma: no cover - exercised via CLI
 
     results: dict[str, list[dict]] = {}
     for patient_id in patient_ids:
-        detections_by_date = engine.run_patient(patient_id)
         serialized = [
             {
                 "date": analysis_date.isoformat(),
                 "detections": [_detection_to_dict(det) for det in detections],
             }
-            for analysis_date, detections in sorted(detections_by_date.items())
+            for analysis_date, detections in engine.iter_patient(patient_id)
         ]
         results[patient_id] = serialized
     return results
 
 
+def run_incremental(  # pragma: no cover - exercised via CLI
+    patient_ids: list[str],
+    source,  # DailyCGMSource-like object
+    *,
+    ledger: DigestLedger,
+    previous: Mapping[str, list[dict]],
+    analysis_days: int,
+    validation_days: int,
+) -> dict[str, list[dict]]:
+    """Patch ``previous`` results, recomputing only windows touched by changed days."""
+
+    engine = SlidingWindowEngine(
+        source,
+        registry,
+        analysis_days=analysis_days,
+        validation_days=validation_days,
+    )
+
+    results: dict[str, list[dict]] = dict(previous)
+    for patient_id in patient_ids:
+        refresh = engine.refresh_patient(patient_id, ledger)
+        prior = {date.fromisoformat(entry["date"]): entry for entry in previous.get(patient_id, [])}
+        patched = refresh.apply(prior)
+        results[patient_id] = [
+            value
+            if isinstance(value, dict)
+            else {
+                "date": analysis_date.isoformat(),
+                "detections": [_detection_to_dict(det) for det in value],
+            }
+            for analysis_date, value in patched.items()
+        ]
+    return results
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run CGM pattern detection in batch")
     parser.add_argument("--data-dir", type=Path, help="Directory containing <patient_id>.json files")
@@ -190,6 +237,14 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument("--validation-days", type=int, default=14, help="Number of validation days in the window")
     parser.add_argument("--output", type=Path, help="Optional output JSON file")
     parser.add_argument("--indent", type=int, default=None, help="Pretty-print JSON with the given indent")
+    parser.add_argument(
+        "--digest-ledger",
+        type=Path,
+        help=(
+            "SQLite file of per-day reading digests. With --output, only dates whose window saw new or "
+            "changed readings are recomputed and the existing output file is patched in place."
+        ),
+    )
     return parser.parse_args(argv)
 
 
@@ -218,7 +273,20 @@ def main(argv: list[str] | None = None) -> int:  # pragma: no cover - CLI entry
     args = parse_args(argv)
     patient_ids = _load_patient_ids(args)
     source = _build_source(args)
-    results = run(patient_ids, source, analysis_days=args.analysis_days, validation_days=args.validation_days)
+    if args.digest_ledger:
+        if not args.output:
+            raise SystemExit("--digest-ledger requires --output")
+        previous = load_json(args.output) if args.output.exists() else {}
+        results = run_incremental(
+            patient_ids,
+            source,
+            ledger=DigestLedger(args.digest_ledger),
+            previous=previous,
+            analysis_days=args.analysis_days,
+            validation_days=args.validation_days,
+        )
+    else:
+        results = run(patient_ids, source, analysis_days=args.analysis_days, validation_days=args.validation_days)
 
     output_text = json.dumps(results, indent=args.indent)
     if args.output:
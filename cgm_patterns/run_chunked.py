@@ -0,0 +1,127 @@
+"""Run pattern detection over one patient list in resumable chunks.
+
+Replaces hand-split patient CSVs and per-chunk output files: the list is
+chunked automatically, each patient's completion is committed to a SQLite
+manifest, failures are retried with backoff, and rerunning the same command
+after a crash resumes where it stopped. Rerunning against a manifest started
+with other dates, patterns or rule versions is refused unless ``--reset`` is
+given. Example::
+
+    python -m cgm_patterns.run_chunked patient_ids/all.csv --manifest runs/cohort.sqlite \
+        --chunk-size 50 --workers 4 --output detections.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import cgm_patterns.rules  # Ensure rules are announced to the registry
+from cgm_patterns.batch import BatchManifest, run_chunked
+from cgm_patterns.cache import DailySummaryCache, PersistentSummaryStore, SqliteDetectionCache
+from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.registry import registry
+from cgm_patterns.run_patterns import _DETECTED, CGMSource, _summarize_detections, build_rule_filter, read_patient_ids
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run CGM patterns for a patient list in resumable chunks")
+    parser.add_argument("csv_file", type=Path, help="CSV file containing patient IDs")
+    parser.add_argument("--manifest", type=Path, required=True, help="SQLite manifest recording per-patient progress")
+    parser.add_argument("--output", type=Path, help="Path for the merged JSON dataset (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Patients per chunk (default: 50)")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent worker threads (default: 1)")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per patient before giving up")
+    parser.add_argument("--backoff", type=float, default=2.0, help="Seconds before the first retry round; doubles each round")
+    parser.add_argument("--start", type=str, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, help="End date (YYYY-MM-DD)")
+    parser.add_argument("--patterns", nargs="*", help="Pattern IDs to run (optional)")
+    parser.add_argument("--summary-store", type=Path, help="Optional SQLite file persisting daily summaries.")
+    parser.add_argument("--detection-cache", type=Path, help="Optional SQLite file caching detections.")
+    parser.add_argument("--no-progress", action="store_true", help="Suppress per-patient progress reporting.")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Start the manifest over when it was created with different run parameters.",
+    )
+    args = parser.parse_args(argv)
+
+    start = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc) if args.start else None
+    end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc) if args.end else None
+    allowed = set(args.patterns) if args.patterns else None
+    active_registry = registry.select(allowed) if allowed else registry
+    rule_filter = build_rule_filter(allowed)
+    summary_store = PersistentSummaryStore(args.summary_store) if args.summary_store else None
+    detection_cache = SqliteDetectionCache(args.detection_cache) if args.detection_cache else None
+
+    def _detect(patient_id: str) -> dict[str, object]:
+        engine = SlidingWindowEngine(
+            CGMSource(start=start, end=end),
+            active_registry,
+            analysis_days=14,
+            validation_days=30,
+            summary_cache=DailySummaryCache(),
+            summary_store=summary_store,
+            detection_cache=detection_cache,
+        )
+        filtered, summary = _summarize_detections(
+            engine.iter_patient(patient_id, rule_filter=rule_filter, statuses=_DETECTED)
+        )
+        return {"detections": filtered, "summary": summary}
+
+    def _progress(patient_id: str, done: int, total: int) -> None:
+        print(f"[{done}/{total}] Processed patient {patient_id}", file=sys.stderr, flush=True)
+
+    def _chunk_progress(chunk: int, failed: int) -> None:
+        suffix = f", {failed} failed" if failed else ""
+        print(f"Chunk {chunk + 1} finished{suffix}", file=sys.stderr, flush=True)
+
+    parameters = {
+        "start": args.start,
+        "end": args.end,
+        "patterns": sorted(allowed) if allowed else None,
+        "analysis_days": 14,
+        "validation_days": 30,
+        "rules": {rule_id: rule.version for rule_id, rule in active_registry.items()},
+    }
+    patient_ids = read_patient_ids(args.csv_file)
+    manifest = BatchManifest(args.manifest)
+    try:
+        manifest.bind(parameters, reset=args.reset)
+    except ValueError as exc:
+        print(f"{args.manifest}: {exc} with --reset", file=sys.stderr)
+        return 2
+    report = run_chunked(
+        patient_ids,
+        _detect,
+        manifest,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_attempts=args.max_attempts,
+        backoff=args.backoff,
+        on_complete=None if args.no_progress else _progress,
+        on_chunk=None if args.no_progress else _chunk_progress,
+        parameters=parameters,
+    )
+
+    if not args.no_progress:
+        print(
+            f"{report.completed} processed, {report.already_done} already done, "
+            f"{report.retries} retried, {len(report.failed)} failed",
+            file=sys.stderr,
+        )
+        for patient_id, error in report.failed.items():
+            print(f"  {patient_id}: {error.strip().splitlines()[-1]}", file=sys.stderr)
+
+    merged = json.dumps(manifest.results(patient_ids), indent=2)
+    if args.output:
+        args.output.write_text(merged)
+    else:
+        print(merged)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
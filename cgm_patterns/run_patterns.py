@@ -4,18 +4,36 @@ import argparse
 import csv
 import json
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from threading import Lock
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 
-from cgm_patterns.CGM_fetcher import iter_cgm_days
+from cgm_patterns.CGM_fetcher import (
+    aiter_cgm_days,
+    count_available_dates,
+    fetch_reading_payloads,
+    iter_cgm_days,
+    parse_reading_payloads,
+)
 from cgm_patterns.engine import SlidingWindowEngine
 from cgm_patterns.models import CGMDay, PatternStatus
-import cgm_patterns.rules  # Ensure rules are imported and registered
+import cgm_patterns.rules  # Ensure rules are announced to the registry
+from cgm_patterns.pipeline import Stage, StagedPipeline
 from cgm_patterns.registry import registry
-from cgm_patterns.cache import DailySummaryCache
+from cgm_patterns.scheduling import (
+    ScheduleReport,
+    WorkStealingScheduler,
+    estimate_costs,
+    load_timings,
+    plan_longest_first,
+    save_timings,
+)
+from cgm_patterns.cache import DailySummaryCache, PersistentSummaryStore, SqliteDetectionCache
+
+_DETECTED = frozenset({PatternStatus.DETECTED})
 
 
 class CGMSource:
@@ -28,6 +46,9 @@ class CGMSource:
     def iter_days(self, patient_id: str) -> Iterable[CGMDay]:
         return iter_cgm_days(patient_id, start=self._start, end=self._end)
 
+    def aiter_days(self, patient_id: str) -> AsyncIterator[CGMDay]:
+        return aiter_cgm_days(patient_id, start=self._start, end=self._end)
+
 
 def read_patient_ids(csv_file: Path) -> list[str]:
     ids: list[str] = []
@@ -57,9 +78,12 @@ def build_rule_filter(allowed_patterns: set[str] | None):
 
 
 def _summarize_detections(detections_by_date):
+    """Serialize DETECTED results from a date mapping or a stream of ``(date, detections)``."""
+
+    items = sorted(detections_by_date.items()) if isinstance(detections_by_date, dict) else detections_by_date
     filtered: dict[str, list[dict]] = {}
     pattern_summary: dict[str, set[str]] = {}
-    for analysis_date, detections in sorted(detections_by_date.items()):
+    for analysis_date, detections in items:
         detected = [
             {
                 "pattern_id": detection.pattern_id,
@@ -86,6 +110,42 @@ def _summarize_detections(detections_by_date):
     return filtered, summary
 
 
+def _fetch_stage(start: datetime | None, end: datetime | None, patient_id: str) -> tuple[str, list[dict]]:
+    return patient_id, fetch_reading_payloads(patient_id, start=start, end=end)
+
+
+def _parse_stage(job: tuple[str, list[dict]]) -> tuple[str, list[CGMDay]]:
+    patient_id, containers = job
+    return patient_id, parse_reading_payloads(patient_id, containers)
+
+
+def _detect_stage(engine: SlidingWindowEngine, job: tuple[str, list[CGMDay]]) -> tuple[dict[str, list[dict]], list[dict]]:
+    patient_id, days = job
+    return _summarize_detections(engine.evaluate_days(patient_id, days, statuses=_DETECTED))
+
+
+def _print_pipeline_report(report: list[dict]) -> None:
+    print("Pipeline stages:", file=sys.stderr)
+    for row in report:
+        print(
+            f"  {row['stage']:<7} workers={row['workers']:<3} items={row['items']:<5} "
+            f"{row['items_per_second']:.2f}/s utilization={row['utilization']:.0%} "
+            f"queue mean={row['mean_queue_depth']:.1f} max={row['max_queue_depth']} "
+            f"starved={row['starved_seconds']:.1f}s blocked={row['blocked_seconds']:.1f}s",
+            file=sys.stderr,
+        )
+
+
+def _print_schedule_report(report: ScheduleReport) -> None:
+    busy = ", ".join(f"{seconds:.1f}s" for seconds in report.worker_busy)
+    print(
+        f"Schedule: predicted makespan {report.predicted_makespan:.1f}s, "
+        f"actual {report.actual_makespan:.1f}s; worker busy [{busy}]; {report.stolen} stolen",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
 def run(
     csv_file: Path,
     *,
@@ -94,9 +154,36 @@ def run(
     allowed_patterns: set[str] | None = None,
     show_progress: bool = False,
     workers: int = 1,
+    summary_store_path: Path | None = None,
+    detection_cache_path: Path | None = None,
+    pipeline: bool = False,
+    fetch_workers: int = 4,
+    parse_workers: int = 1,
+    queue_size: int = 8,
+    metrics_path: Path | None = None,
+    schedule: str = "csv",
+    timings_path: Path | None = None,
+    estimate_from_api: bool = False,
 ) -> dict[str, dict]:
+    """Detect patterns for every patient in ``csv_file``.
+
+    With ``pipeline`` the work runs as fetch -> parse -> detect stages joined by
+    bounded queues of ``queue_size`` patients: ``fetch_workers`` threads call
+    the CGM API, ``parse_workers`` threads build days, and ``workers``
+    processes run detection. Per-stage metrics go to stderr (with progress)
+    and to ``metrics_path`` as JSON.
+
+    With ``schedule="longest-first"`` and several ``workers``, patients are
+    dispatched by estimated cost (earlier timings from ``timings_path``, the
+    summary store's day count, or with ``estimate_from_api`` the API's
+    available dates), with idle workers stealing leftover patients. Measured
+    timings are merged back into ``timings_path``.
+    """
+
     patient_ids = read_patient_ids(csv_file)
-    if not any(True for _ in registry.items()):
+    # Selecting up front imports only the requested rule modules.
+    active_registry = registry.select(allowed_patterns) if allowed_patterns else registry
+    if not any(True for _ in active_registry.items()):
         raise RuntimeError("No CGM pattern rules are registered. Ensure rule modules are imported.")
     rule_filter = build_rule_filter(allowed_patterns)
 
@@ -106,25 +193,68 @@ def run(
         print("No patient IDs to process.", file=sys.stderr, flush=True)
 
     worker_count = max(1, workers)
+    summary_store = PersistentSummaryStore(summary_store_path) if summary_store_path else None
+    detection_cache = SqliteDetectionCache(detection_cache_path) if detection_cache_path else None
 
     def _run_single(patient_id: str) -> tuple[str, dict[str, list[dict]], list[dict]]:
         engine = SlidingWindowEngine(
             CGMSource(start=start, end=end),
-            registry,
+            active_registry,
             analysis_days=14,
             validation_days=30,
             summary_cache=DailySummaryCache(),
+            summary_store=summary_store,
+            detection_cache=detection_cache,
         )
-        detections_by_date = engine.run_patient(patient_id, rule_filter=rule_filter)
-        filtered, summary = _summarize_detections(detections_by_date)
+        detection_stream = engine.iter_patient(patient_id, rule_filter=rule_filter, statuses=_DETECTED)
+        filtered, summary = _summarize_detections(detection_stream)
         return patient_id, filtered, summary
 
+    if pipeline:
+        engine = SlidingWindowEngine(
+            CGMSource(start=start, end=end),
+            active_registry,
+            analysis_days=14,
+            validation_days=30,
+            summary_store=summary_store,
+            detection_cache=detection_cache,
+        )
+        with ProcessPoolExecutor(max_workers=worker_count) as detect_pool:
+            staged = StagedPipeline(
+                [
+                    Stage("fetch", partial(_fetch_stage, start, end), workers=fetch_workers),
+                    Stage("parse", _parse_stage, workers=parse_workers),
+                    Stage("detect", partial(_detect_stage, engine.detached()), workers=worker_count, executor=detect_pool),
+                ],
+                queue_size=queue_size,
+            )
+            for processed, (patient_id, (filtered, summary)) in enumerate(staged.run(patient_ids), start=1):
+                results[patient_id] = {
+                    "detections": filtered,
+                    "summary": summary,
+                }
+                if show_progress:
+                    detected_patterns = sum(len(entries) for entries in filtered.values())
+                    print(
+                        f"[{processed}/{total}] Processed patient {patient_id} -> {detected_patterns} detections across {len(filtered)} day(s)",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+        report = staged.report()
+        if show_progress:
+            _print_pipeline_report(report)
+        if metrics_path is not None:
+            metrics_path.write_text(json.dumps({"elapsed_seconds": staged.elapsed, "stages": report}, indent=2))
+        return results
+
     if worker_count == 1:
         engine = SlidingWindowEngine(
             CGMSource(start=start, end=end),
-            registry,
+            active_registry,
             analysis_days=14,
             validation_days=30,
+            summary_store=summary_store,
+            detection_cache=detection_cache,
         )
         for index, patient_id in enumerate(patient_ids, start=1):
             if show_progress:
@@ -133,8 +263,8 @@ def run(
                     file=sys.stderr,
                     flush=True,
                 )
-            detections_by_date = engine.run_patient(patient_id, rule_filter=rule_filter)
-            filtered, summary = _summarize_detections(detections_by_date)
+            detection_stream = engine.iter_patient(patient_id, rule_filter=rule_filter, statuses=_DETECTED)
+            filtered, summary = _summarize_detections(detection_stream)
             results[patient_id] = {
                 "detections": filtered,
                 "summary": summary,
@@ -154,6 +284,32 @@ def run(
     progress_lock = Lock()
     processed = 0
 
+    if schedule == "longest-first":
+        estimates = estimate_costs(
+            patient_ids,
+            timings=load_timings(timings_path) if timings_path else None,
+            history_days=summary_store.day_count if summary_store else None,
+            available_dates=partial(count_available_dates, start=start, end=end) if estimate_from_api else None,
+        )
+        scheduler = WorkStealingScheduler(plan_longest_first(estimates, worker_count), estimates)
+        for processed, (patient_id, (_, filtered, summary)) in enumerate(scheduler.run(_run_single), start=1):
+            results[patient_id] = {
+                "detections": filtered,
+                "summary": summary,
+            }
+            if show_progress:
+                detected_patterns = sum(len(entries) for entries in filtered.values())
+                print(
+                    f"[{processed}/{total}] Processed patient {patient_id} -> {detected_patterns} detections across {len(filtered)} day(s)",
+                    file=sys.stderr,
+                    flush=True,
+                )
+        if timings_path is not None:
+            save_timings(timings_path, scheduler.report.timings)
+        if show_progress:
+            _print_schedule_report(scheduler.report)
+        return results
+
     with ThreadPoolExecutor(max_workers=worker_count) as executor:
         future_map = {executor.submit(_run_single, pid): pid for pid in patient_ids}
         for future in as_completed(future_map):
@@ -196,6 +352,46 @@ def main(argv: list[str] | None = None) -> int:
         default=1,
         help="Number of concurrent worker threads to use (default: 1).",
     )
+    parser.add_argument(
+        "--summary-store",
+        type=Path,
+        help="Optional SQLite file used to persist daily summaries across runs.",
+    )
+    parser.add_argument(
+        "--detection-cache",
+        type=Path,
+        help="Optional SQLite file caching detections by rule version, config and window content.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap fetching, parsing and detection in staged queues; --workers sets detection processes.",
+    )
+    parser.add_argument("--fetch-workers", type=int, default=4, help="Concurrent CGM API fetches with --pipeline.")
+    parser.add_argument("--parse-workers", type=int, default=1, help="Parse threads with --pipeline.")
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=8,
+        help="Patients buffered between pipeline stages (bounds memory).",
+    )
+    parser.add_argument("--pipeline-metrics", type=Path, help="Write per-stage pipeline metrics as JSON.")
+    parser.add_argument(
+        "--schedule",
+        choices=("csv", "longest-first"),
+        default="csv",
+        help="Dispatch order for --workers > 1: CSV order, or estimated cost with work stealing.",
+    )
+    parser.add_argument(
+        "--timings",
+        type=Path,
+        help="JSON file of per-patient seconds read for estimates and updated after a longest-first run.",
+    )
+    parser.add_argument(
+        "--estimate-available-dates",
+        action="store_true",
+        help="Ask the CGM API for each patient's available dates when no better estimate exists.",
+    )
     args = parser.parse_args(argv)
 
     start = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc) if args.start else None
@@ -209,6 +405,16 @@ def main(argv: list[str] | None = None) -> int:
         allowed_patterns=allowed,
         show_progress=not args.no_progress,
         workers=args.workers,
+        summary_store_path=args.summary_store,
+        detection_cache_path=args.detection_cache,
+        pipeline=args.pipeline,
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        queue_size=args.queue_size,
+        metrics_path=args.pipeline_metrics,
+        schedule=args.schedule,
+        timings_path=args.timings,
+        estimate_from_api=args.estimate_available_dates,
     )
 
     if args.output:
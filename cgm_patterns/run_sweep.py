@@ -0,0 +1,83 @@
+"""Sweep one rule's thresholds across a cohort and write prevalence curves.
+
+Example::
+
+    python -m cgm_patterns.run_sweep patients.csv --rule nocturnal_hypoglycemia_moderate \
+        --param overnight_low_threshold=60,65,70,75 --param overnight_low_minutes=10,15,30 \
+        --workers 8 --output sweep.csv
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import cgm_patterns.rules  # Ensure rules are announced to the registry
+from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.registry import registry
+from cgm_patterns.run_patterns import CGMSource, read_patient_ids
+from cgm_patterns.sweep import run_sweep
+
+
+def parse_param(text: str) -> tuple[str, list[str]]:
+    """Parse ``NAME=V1,V2,...`` into a parameter name and its raw values."""
+
+    name, sep, values = text.partition("=")
+    if not sep or not name.strip() or not values.strip():
+        raise argparse.ArgumentTypeError(f"Expected NAME=V1,V2,... but got {text!r}")
+    return name.strip(), [value.strip() for value in values.split(",") if value.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep a rule's parameters across patients in a CSV")
+    parser.add_argument("csv_file", type=Path, help="CSV file containing patient IDs")
+    parser.add_argument("--rule", required=True, help="Rule ID to sweep")
+    parser.add_argument(
+        "--param",
+        type=parse_param,
+        action="append",
+        required=True,
+        help="Parameter grid as NAME=V1,V2,... (repeat for a multi-dimensional grid)",
+    )
+    parser.add_argument("--start", type=str, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=str, help="End date (YYYY-MM-DD)")
+    parser.add_argument("--analysis-days", type=int, default=14, help="Analysis window length (default: 14)")
+    parser.add_argument("--validation-days", type=int, default=30, help="Validation window length (default: 30)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", type=Path, help="CSV path for the result table (default: stdout)")
+    parser.add_argument(
+        "--per-patient",
+        action="store_true",
+        help="Write per-patient counts per grid point instead of the cohort curve",
+    )
+    args = parser.parse_args(argv)
+
+    start = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc) if args.start else None
+    end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc) if args.end else None
+    active = registry.select([args.rule])
+    try:
+        rule = active.get(args.rule)
+    except KeyError:
+        parser.error(f"Unknown rule {args.rule!r}")
+
+    engine = SlidingWindowEngine(
+        CGMSource(start, end),
+        active,
+        analysis_days=args.analysis_days,
+        validation_days=args.validation_days,
+    )
+    result = run_sweep(
+        engine,
+        rule,
+        dict(args.param),
+        read_patient_ids(args.csv_file),
+        max_workers=args.workers,
+    )
+
+    result.write_csv(args.output or sys.stdout, per_patient=args.per_patient)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
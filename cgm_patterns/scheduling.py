@@ -0,0 +1,244 @@
+"""Longest-job-first patient scheduling with work stealing.
+
+Patients with long histories dominate batch wall time, so submitting them in
+CSV order often leaves one worker finishing a two-year history while the rest
+idle. :func:`estimate_costs` predicts each patient's runtime from a previous
+run's timings, the number of days on record, or the API's available dates;
+:func:`plan_longest_first` assigns patients longest-first to the least-loaded
+worker (LPT); and :class:`WorkStealingScheduler` runs the plan, letting idle
+workers take the cheapest pending patient of the most-loaded worker when
+estimates turn out wrong.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_SECONDS_PER_DAY = 0.05
+
+
+@dataclass(frozen=True)
+class CostEstimate:
+    """Predicted runtime of one patient and what it was derived from."""
+
+    patient_id: str
+    seconds: float
+    source: str  # "timing", "history", "available_dates" or "default"
+
+
+def load_timings(path: Path) -> dict[str, float]:
+    """Read per-patient seconds written by :func:`save_timings` (empty when missing)."""
+
+    if not path.exists():
+        return {}
+    return {str(patient_id): float(seconds) for patient_id, seconds in json.loads(path.read_text()).items()}
+
+
+def save_timings(path: Path, timings: Mapping[str, float]) -> None:
+    """Merge ``timings`` into the file at ``path``, newest values winning."""
+
+    merged = {**load_timings(path), **timings}
+    path.write_text(json.dumps(dict(sorted(merged.items())), indent=2))
+
+
+def estimate_costs(
+    patient_ids: Iterable[str],
+    *,
+    timings: Mapping[str, float] | None = None,
+    history_days: Callable[[str], int | None] | None = None,
+    available_dates: Callable[[str], int | None] | None = None,
+) -> list[CostEstimate]:
+    """Estimate each patient's runtime in seconds.
+
+    A previous timing is used as is. Otherwise a day count (cached history
+    first, then available dates) is scaled by seconds-per-day calibrated on
+    patients that have both a timing and a day count. Patients with nothing
+    known get the median of the other estimates.
+    """
+
+    timings = timings or {}
+    patient_ids = list(patient_ids)
+    day_counts: dict[str, tuple[int, str]] = {}
+    for patient_id in patient_ids:
+        for source, counter in (("history", history_days), ("available_dates", available_dates)):
+            if counter is None or (source == "available_dates" and patient_id in timings):
+                continue
+            days = counter(patient_id)
+            if days:
+                day_counts[patient_id] = (days, source)
+                break
+
+    rates = [timings[pid] / days for pid, (days, _) in day_counts.items() if pid in timings and timings[pid] > 0]
+    seconds_per_day = statistics.median(rates) if rates else DEFAULT_SECONDS_PER_DAY
+
+    estimates: dict[str, CostEstimate] = {}
+    for patient_id in patient_ids:
+        if patient_id in timings:
+            estimates[patient_id] = CostEstimate(patient_id, float(timings[patient_id]), "timing")
+        elif patient_id in day_counts:
+            days, source = day_counts[patient_id]
+            estimates[patient_id] = CostEstimate(patient_id, days * seconds_per_day, source)
+    fallback = statistics.median(e.seconds for e in estimates.values()) if estimates else 1.0
+    return [estimates.get(pid) or CostEstimate(pid, fallback, "default") for pid in patient_ids]
+
+
+@dataclass(frozen=True)
+class SchedulePlan:
+    """Per-worker queues of patient IDs, each ordered longest-first."""
+
+    assignments: tuple[tuple[str, ...], ...]
+    predicted_makespan: float
+
+
+def plan_longest_first(estimates: Sequence[CostEstimate], workers: int) -> SchedulePlan:
+    """Assign patients longest-first to the currently least-loaded worker."""
+
+    workers = max(1, workers)
+    loads = [(0.0, index) for index in range(workers)]
+    assignments: list[list[str]] = [[] for _ in range(workers)]
+    for estimate in sorted(estimates, key=lambda e: e.seconds, reverse=True):
+        load, index = heapq.heappop(loads)
+        assignments[index].append(estimate.patient_id)
+        heapq.heappush(loads, (load + estimate.seconds, index))
+    return SchedulePlan(tuple(tuple(queue) for queue in assignments), max(load for load, _ in loads))
+
+
+@dataclass(frozen=True)
+class ScheduleReport:
+    """Predicted vs. actual outcome of a scheduled run."""
+
+    predicted_makespan: float
+    actual_makespan: float
+    worker_busy: tuple[float, ...]
+    stolen: int
+    timings: Mapping[str, float]
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "predicted_makespan_seconds": self.predicted_makespan,
+            "actual_makespan_seconds": self.actual_makespan,
+            "worker_busy_seconds": list(self.worker_busy),
+            "stolen": self.stolen,
+        }
+
+
+class WorkStealingScheduler:
+    """Execute a :class:`SchedulePlan` on threads, one per worker queue.
+
+    Each worker takes from the front of its own queue (its longest pending
+    patient). An idle worker steals from the back of the queue with the most
+    estimated work left. :meth:`run` yields ``(patient_id, result)`` as
+    patients finish; the first exception stops the run and is re-raised.
+    """
+
+    def __init__(self, plan: SchedulePlan, estimates: Sequence[CostEstimate]) -> None:
+        self._plan = plan
+        self._cost = {estimate.patient_id: estimate.seconds for estimate in estimates}
+        self.report: ScheduleReport | None = None
+
+    def run(self, task: Callable[[str], T]) -> Iterator[tuple[str, T]]:
+        queues = [deque(assignment) for assignment in self._plan.assignments]
+        pending = [sum(self._cost.get(pid, 0.0) for pid in queue) for queue in queues]
+        lock = threading.Lock()
+        finished = threading.Condition(lock)
+        outputs: deque[tuple[str, T]] = deque()
+        errors: list[BaseException] = []
+        busy = [0.0] * len(queues)
+        timings: dict[str, float] = {}
+        stolen = [0]
+        running = [len(queues)]
+
+        def _next(index: int) -> str | None:
+            with lock:
+                if errors:
+                    return None
+                if queues[index]:
+                    patient_id = queues[index].popleft()
+                    pending[index] -= self._cost.get(patient_id, 0.0)
+                    return patient_id
+                victim = max(range(len(queues)), key=lambda other: pending[other] if queues[other] else -1.0)
+                if not queues[victim]:
+                    return None
+                patient_id = queues[victim].pop()
+                pending[victim] -= self._cost.get(patient_id, 0.0)
+                stolen[0] += 1
+                return patient_id
+
+        def _work(index: int) -> None:
+            try:
+                while (patient_id := _next(index)) is not None:
+                    began = time.perf_counter()
+                    try:
+                        result = task(patient_id)
+                    except BaseException as exc:
+                        with lock:
+                            errors.append(exc)
+                        return
+                    elapsed = time.perf_counter() - began
+                    with lock:
+                        busy[index] += elapsed
+                        timings[patient_id] = elapsed
+                        outputs.append((patient_id, result))
+                        finished.notify()
+            finally:
+                with lock:
+                    running[0] -= 1
+                    finished.notify()
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=_work, args=(index,), name=f"scheduler-{index}", daemon=True)
+            for index in range(len(queues))
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                with lock:
+                    while not outputs and running[0] and not errors:
+                        finished.wait()
+                    if errors:
+                        break
+                    batch = list(outputs)
+                    outputs.clear()
+                    done = not running[0]
+                yield from batch
+                if done and not batch:
+                    break
+        finally:
+            with lock:
+                if not errors and running[0]:
+                    errors.append(GeneratorExit())  # Consumer stopped early; let workers drain out.
+            for thread in threads:
+                thread.join()
+            self.report = ScheduleReport(
+                predicted_makespan=self._plan.predicted_makespan,
+                actual_makespan=time.perf_counter() - started,
+                worker_busy=tuple(busy),
+                stolen=stolen[0],
+                timings=dict(timings),
+            )
+        if errors:
+            raise errors[0]
+
+
+__all__ = [
+    "CostEstimate",
+    "DEFAULT_SECONDS_PER_DAY",
+    "ScheduleReport",
+    "SchedulePlan",
+    "WorkStealingScheduler",
+    "estimate_costs",
+    "load_timings",
+    "plan_longest_first",
+    "save_timings",
+]
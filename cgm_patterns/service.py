@@ -0,0 +1,331 @@
+"""Local HTTP detection service with warm per-patient state.
+
+Example::
+
+    python -m cgm_patterns.service --stub --port 8080
+    curl 'http://127.0.0.1:8080/patients/p1/detections?date=2024-02-15'
+
+Each patient is evaluated once with :meth:`SlidingWindowEngine.arun_patient`,
+on a private summary cache so a refetch never reuses summaries of readings
+that have since changed, and its detections are kept, pre-encoded per analysis date, in an LRU bounded
+by a byte budget. Concurrent requests for a patient that is not warm share a
+single in-flight evaluation. Routes:
+
+* ``GET /patients/<id>/detections[?date=YYYY-MM-DD]``
+* ``DELETE /patients/<id>`` drops the warm state so the next request refetches
+* ``GET /stats``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterable, Mapping
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .cache import CacheStats, DailySummaryCache, encode_detection
+from .engine import SlidingWindowEngine
+from .models import CGMDay, PatternDetection
+from .rule_base import PatternRule
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+@dataclass(frozen=True)
+class PatientState:
+    """A patient's detections, each date held as an encoded JSON array."""
+
+    patient_id: str
+    detections: Mapping[date, str]
+    nbytes: int
+
+    @classmethod
+    def from_results(cls, patient_id: str, results: Mapping[date, list[PatternDetection]]) -> "PatientState":
+        encoded = {
+            analysis_date: "[" + ",".join(encode_detection(detection) for detection in detections) + "]"
+            for analysis_date, detections in results.items()
+        }
+        return cls(patient_id, encoded, sum(len(text) for text in encoded.values()))
+
+
+@dataclass
+class PatientStateCache:
+    """LRU of :class:`PatientState` bounded by the total encoded size in bytes.
+
+    A state larger than the whole budget is served once and not kept.
+    """
+
+    max_bytes: int
+    _store: OrderedDict[str, PatientState] = field(default_factory=OrderedDict)
+    nbytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, patient_id: str) -> PatientState | None:
+        state = self._store.get(patient_id)
+        if state is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._store.move_to_end(patient_id)
+        return state
+
+    def put(self, state: PatientState) -> None:
+        self.discard(state.patient_id)
+        if state.nbytes > self.max_bytes:
+            return
+        self._store[state.patient_id] = state
+        self.nbytes += state.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._store.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def discard(self, patient_id: str) -> bool:
+        state = self._store.pop(patient_id, None)
+        if state is None:
+            return False
+        self.nbytes -= state.nbytes
+        return True
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, evictions=self.evictions, entries=len(self._store))
+
+
+class DetectionService:
+    """Answers detection queries from warm state, evaluating each patient once."""
+
+    def __init__(
+        self,
+        engine: SlidingWindowEngine,
+        *,
+        max_state_bytes: int = 64 * 1024 * 1024,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+    ) -> None:
+        self._engine = engine
+        self._rule_filter = rule_filter
+        self._states = PatientStateCache(max_state_bytes)
+        self._inflight: dict[str, asyncio.Future[PatientState]] = {}
+        self.evaluations = 0
+        self.coalesced = 0
+
+    async def patient_state(self, patient_id: str) -> PatientState:
+        """Return warm state, joining an in-flight evaluation when there is one."""
+
+        state = self._states.get(patient_id)
+        if state is not None:
+            return state
+        pending = self._inflight.get(patient_id)
+        if pending is None:
+            pending = self._inflight[patient_id] = asyncio.ensure_future(self._evaluate(patient_id))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(pending)
+
+    async def detections(self, patient_id: str, on: date | None = None) -> str | None:
+        """Return the JSON response body, or None when no window ends on ``on``."""
+
+        state = await self.patient_state(patient_id)
+        if on is not None:
+            encoded = state.detections.get(on)
+            if encoded is None:
+                return None
+            return f'{{"patient_id":{json.dumps(patient_id)},"date":"{on.isoformat()}","detections":{encoded}}}'
+        dates = ",".join(f'"{day.isoformat()}":{encoded}' for day, encoded in state.detections.items())
+        return f'{{"patient_id":{json.dumps(patient_id)},"dates":{{{dates}}}}}'
+
+    def invalidate(self, patient_id: str) -> bool:
+        """Drop the warm state; the next request refetches and resummarizes every day."""
+
+        return self._states.discard(patient_id)
+
+    def stats(self) -> dict[str, int]:
+        stats = self._states.stats()
+        return {
+            "patients": stats.entries,
+            "state_bytes": self._states.nbytes,
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "evictions": stats.evictions,
+            "evaluations": self.evaluations,
+            "coalesced": self.coalesced,
+        }
+
+    async def _evaluate(self, patient_id: str) -> PatientState:
+        try:
+            self.evaluations += 1
+            engine = self._engine.with_summary_cache(DailySummaryCache())
+            results = await engine.arun_patient(patient_id, rule_filter=self._rule_filter)
+            state = PatientState.from_results(patient_id, results)
+            self._states.put(state)
+            return state
+        finally:
+            del self._inflight[patient_id]
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        """Start listening; the returned server is already accepting connections."""
+
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                keep_alive = True
+                while True:
+                    header = await reader.readline()
+                    if not header.strip():
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    status, body = 400, json.dumps({"error": "malformed request line"})
+                    keep_alive = False
+                else:
+                    status, body = await self._route(parts[0].upper(), parts[1])
+                payload = body.encode()
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, target: str) -> tuple[int, str]:
+        url = urlsplit(target)
+        segments = [unquote(segment) for segment in url.path.strip("/").split("/")]
+        if segments == ["stats"] and method == "GET":
+            return 200, json.dumps(self.stats())
+        if len(segments) < 2 or segments[0] != "patients" or not segments[1]:
+            return 404, json.dumps({"error": f"unknown path {url.path}"})
+        patient_id = segments[1]
+        if len(segments) == 2 and method == "DELETE":
+            return 200, json.dumps({"patient_id": patient_id, "evicted": self.invalidate(patient_id)})
+        if segments[2:] != ["detections"]:
+            return 404, json.dumps({"error": f"unknown path {url.path}"})
+        if method != "GET":
+            return 405, json.dumps({"error": f"{method} not allowed"})
+
+        on: date | None = None
+        requested = parse_qs(url.query).get("date")
+        if requested:
+            try:
+                on = date.fromisoformat(requested[0])
+            except ValueError:
+                return 400, json.dumps({"error": f"invalid date {requested[0]!r}"})
+        try:
+            body = await self.detections(patient_id, on)
+        except Exception as exc:
+            return 500, json.dumps({"error": f"{type(exc).__name__}: {exc}"})
+        if body is None:
+            return 404, json.dumps({"error": f"no window for {patient_id} ending on {on.isoformat()}"})
+        return 200, body
+
+
+class StubDaySource:
+    """Deterministic synthetic days per patient, for running the service offline.
+
+    ``latency`` seconds are slept per patient fetch to mimic the CGM API.
+    """
+
+    def __init__(self, days: int = 60, *, start: date = date(2024, 1, 1), latency: float = 0.0) -> None:
+        self._days = days
+        self._start = start
+        self._latency = latency
+
+    def iter_days(self, patient_id: str) -> Iterable[CGMDay]:
+        if self._latency:
+            time.sleep(self._latency)
+        rng = np.random.default_rng(zlib.crc32(patient_id.encode()))
+        center = rng.uniform(100.0, 190.0)
+        for offset in range(self._days):
+            service_date = self._start + timedelta(days=offset)
+            timestamps = pd.date_range(pd.Timestamp(service_date), periods=288, freq="5min", tz="UTC")
+            values = rng.normal(center, 45.0, size=288).clip(40.0, 400.0)
+            yield CGMDay(patient_id, service_date, pd.DataFrame({"timestamp": timestamps, "glucose_mg_dL": values}))
+
+
+def build_service(args: argparse.Namespace) -> DetectionService:
+    import cgm_patterns.rules  # noqa: F401 - ensure rules are announced to the registry
+    from cgm_patterns.registry import registry
+    from cgm_patterns.run_patterns import CGMSource
+
+    if args.stub:
+        source = StubDaySource(args.stub_days, latency=args.stub_latency)
+    else:
+        start = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc) if args.start else None
+        end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc) if args.end else None
+        source = CGMSource(start, end)
+    active = registry.select(args.patterns) if args.patterns else registry
+    engine = SlidingWindowEngine(
+        source,
+        active,
+        analysis_days=args.analysis_days,
+        validation_days=args.validation_days,
+    )
+    return DetectionService(engine, max_state_bytes=int(args.max_state_mb * 1024 * 1024))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve CGM pattern detections over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--max-state-mb", type=float, default=64.0, help="Byte budget of the warm patient state")
+    parser.add_argument("--patterns", nargs="+", help="Only evaluate these pattern IDs")
+    parser.add_argument("--analysis-days", type=int, default=14, help="Analysis window length (default: 14)")
+    parser.add_argument("--validation-days", type=int, default=30, help="Validation window length (default: 30)")
+    parser.add_argument("--start", type=str, help="Start date (YYYY-MM-DD) for fetched readings")
+    parser.add_argument("--end", type=str, help="End date (YYYY-MM-DD) for fetched readings")
+    parser.add_argument("--stub", action="store_true", help="Serve synthetic data instead of calling the CGM API")
+    parser.add_argument("--stub-days", type=int, default=60, help="Days of synthetic data per stub patient")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Seconds slept per stub patient fetch")
+    return parser.parse_args(argv)
+
+
+async def _serve_forever(service: DetectionService, host: str, port: int) -> None:
+    server = await service.serve(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+__all__ = ["DetectionService", "PatientState", "PatientStateCache", "StubDaySource", "build_service"]
+
+
+def main(argv: list[str] | None = None) -> int:  # pragma: no cover - CLI entry point
+    args = parse_args(argv)
+    service = build_service(args)
+    try:
+        asyncio.run(_serve_forever(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
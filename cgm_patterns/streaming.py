@@ -0,0 +1,389 @@
+"""Streaming ingestion: evaluate rules on a partial current day as readings arrive.
+
+A :class:`StreamingSession` keeps, per patient, the last closed days of the
+sliding window plus an open current day. Appended readings update the open
+day's :class:`RunningDaySummary` in place, and only the rules whose declared
+hour windows cover the new readings are re-run against a window ending on the
+partial day. Closed days keep their prepared frames between evaluations, so a
+single reading costs one partial-day preparation plus the selected rules.
+"""
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, tzinfo
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import pandas as pd
+
+from .engine import PatientWindow, SlidingWindowEngine
+from .features import TIME_STEP_MINUTES
+from .models import CGMDay, DailyCGMSummary, PatternDetection
+from .rule_base import PatternRule, RuleConfig
+from .timezones import resolve_timezone
+
+if TYPE_CHECKING:
+    from .rules.utils import PreparedDay
+
+
+@dataclass
+class RunningDaySummary:
+    """Daily summary of a day that is still being filled, updated per reading.
+
+    Keeps running moments (Welford), extremes, threshold counts and a count
+    of each gap between consecutive readings, so that :meth:`snapshot`
+    matches :func:`features.compute_daily_summary` for the readings seen so
+    far without revisiting them. The median cadence is read off the gap
+    counts, which for a CGM hold only a handful of distinct values.
+    """
+
+    patient_id: str
+    service_date: date
+    high_threshold: float = 180.0
+    low_threshold: float = 70.0
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min_glucose: float = math.inf
+    max_glucose: float = -math.inf
+    high_count: int = 0
+    low_count: int = 0
+    _seconds: list[float] = field(default_factory=list, repr=False)
+    _gaps: Counter[float] = field(default_factory=Counter, repr=False)
+    _median_gap: float | None = field(default=None, repr=False)
+
+    def add(self, epoch_seconds: float, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min_glucose = min(self.min_glucose, value)
+        self.max_glucose = max(self.max_glucose, value)
+        if value > self.high_threshold:
+            self.high_count += 1
+        elif value < self.low_threshold:
+            self.low_count += 1
+        position = bisect_right(self._seconds, epoch_seconds)
+        before = self._seconds[position - 1] if position else None
+        after = self._seconds[position] if position < len(self._seconds) else None
+        if before is not None and after is not None:
+            # An out-of-order reading splits an existing gap in two.
+            self._remove_gap(after - before)
+        if before is not None:
+            self._gaps[epoch_seconds - before] += 1
+        if after is not None:
+            self._gaps[after - epoch_seconds] += 1
+        self._seconds.insert(position, epoch_seconds)
+        self._median_gap = None
+
+    def coverage_ratio(self) -> float:
+        """Coverage against the median cadence, as :meth:`CGMDay.coverage_ratio`."""
+
+        if not self.count:
+            return 0.0
+        expected_points = 288
+        if len(self._seconds) > 1:
+            if self._median_gap is None:
+                self._median_gap = self._median_of_gaps()
+            if self._median_gap > 0:
+                expected_points = max(1, int(round(86400.0 / self._median_gap)))
+        return min(1.0, self.count / expected_points)
+
+    def _remove_gap(self, gap: float) -> None:
+        self._gaps[gap] -= 1
+        if not self._gaps[gap]:
+            del self._gaps[gap]
+
+    def _median_of_gaps(self) -> float:
+        total = len(self._seconds) - 1
+        lower_rank, upper_rank = (total - 1) // 2, total // 2
+        lower: float | None = None
+        seen = 0
+        for gap in sorted(self._gaps):
+            seen += self._gaps[gap]
+            if lower is None and seen > lower_rank:
+                lower = gap
+            if seen > upper_rank:
+                return (lower + gap) / 2.0
+        return 0.0
+
+    def snapshot(self) -> DailyCGMSummary:
+        if not self.count:
+            nan = float("nan")
+            return DailyCGMSummary(
+                self.patient_id, self.service_date, nan, nan, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, nan, nan, 0, 0.0
+            )
+        total_minutes = self.count * TIME_STEP_MINUTES
+        minutes_high = self.high_count * TIME_STEP_MINUTES
+        minutes_low = self.low_count * TIME_STEP_MINUTES
+        minutes_in_range = total_minutes - (minutes_high + minutes_low)
+        return DailyCGMSummary(
+            patient_id=self.patient_id,
+            service_date=self.service_date,
+            mean_glucose=self.mean,
+            std_glucose=math.sqrt(self.m2 / self.count),
+            percent_high=minutes_high / total_minutes,
+            percent_low=minutes_low / total_minutes,
+            percent_in_range=minutes_in_range / total_minutes,
+            time_high_minutes=minutes_high,
+            time_low_minutes=minutes_low,
+            time_in_range_minutes=minutes_in_range,
+            max_glucose=self.max_glucose,
+            min_glucose=self.min_glucose,
+            total_readings=self.count,
+            coverage_ratio=self.coverage_ratio(),
+        )
+
+
+def rule_hour_windows(rule: PatternRule, config: RuleConfig) -> tuple[tuple[float, float], ...]:
+    """Return the local-hour windows a rule declares through ``*start*``/``*end*`` parameters.
+
+    An empty tuple means the rule looks at the whole day.
+    """
+
+    windows = []
+    for parameter in rule.parameters:
+        if "start" not in parameter.name:
+            continue
+        end_name = parameter.name.replace("start", "end")
+        if end_name in config:
+            windows.append((float(config[parameter.name]), float(config[end_name])))
+    return tuple(windows)
+
+
+def _covers(windows: tuple[tuple[float, float], ...], hours: Iterable[float]) -> bool:
+    if not windows:
+        return True
+    for hour in hours:
+        for start, end in windows:
+            if (start <= hour < end) if start <= end else (hour >= start or hour < end):
+                return True
+    return False
+
+
+def _crossed(config: RuleConfig, before: float, after: float) -> bool:
+    threshold = config.get("minimum_day_coverage")
+    return threshold is not None and (before >= threshold) != (after >= threshold)
+
+
+@dataclass
+class _OpenDay:
+    summary: RunningDaySummary
+    timestamps: list[pd.Timestamp] = field(default_factory=list)
+    values: list[float] = field(default_factory=list)
+
+    def add(self, timestamp: pd.Timestamp, value: float) -> int:
+        """Insert a reading in time order and return its position."""
+
+        position = bisect_right(self.timestamps, timestamp)
+        self.timestamps.insert(position, timestamp)
+        self.values.insert(position, value)
+        self.summary.add(timestamp.timestamp(), value)
+        return position
+
+    def to_day(self, local_timezone: str | None) -> CGMDay:
+        frame = pd.DataFrame(
+            {"timestamp": pd.DatetimeIndex(self.timestamps), "glucose_mg_dL": self.values}
+        )
+        return CGMDay(self.summary.patient_id, self.summary.service_date, frame, local_timezone)
+
+
+@dataclass
+class _PatientStream:
+    closed: PatientWindow
+    local_timezone: str | None
+    tz: tzinfo | None
+    open_day: _OpenDay | None = None
+    prepared: dict[date, "PreparedDay"] = field(default_factory=dict, repr=False)
+    time_windows: dict[tuple[date, float, float], pd.DataFrame] = field(default_factory=dict, repr=False)
+    latest: dict[str, PatternDetection] = field(default_factory=dict)
+    coverage_seen: dict[str, float] = field(default_factory=dict, repr=False)
+
+
+class StreamingSession:
+    """Push readings as they arrive and keep per-rule detections for the open day.
+
+    Readings are assigned to local days in the patient's timezone. A reading
+    for a later day evaluates the open day with the readings received so far,
+    then closes it into the window; readings for days
+    already closed are rejected (use :meth:`SlidingWindowEngine.refresh_patient`
+    for backfills). Rules declaring hour windows are re-run only when a new
+    reading, or the reading just before it, falls inside one of them, or when
+    the open day's coverage crosses the rule's ``minimum_day_coverage``; every
+    rule re-runs when the day rolls over.
+    """
+
+    def __init__(
+        self,
+        engine: SlidingWindowEngine,
+        *,
+        rule_filter: Callable[[PatternRule], bool] | None = None,
+        high_threshold: float = 180.0,
+        low_threshold: float = 70.0,
+    ) -> None:
+        self._engine = engine
+        self._rule_filter = rule_filter
+        self._high_threshold = high_threshold
+        self._low_threshold = low_threshold
+        self._streams: dict[str, _PatientStream] = {}
+
+    def open_patient(
+        self,
+        patient_id: str,
+        *,
+        history: Iterable[CGMDay] = (),
+        local_timezone: str | None = None,
+    ) -> None:
+        """Start (or restart) a patient's stream, seeding the window with closed days.
+
+        ``local_timezone`` defaults to that of the last history day.
+        """
+
+        closed = self._engine.open_window(patient_id)
+        for day in history:
+            self._engine.push_day(closed, day)
+            local_timezone = local_timezone or day.local_timezone
+        self._streams[patient_id] = _PatientStream(closed, local_timezone, resolve_timezone(local_timezone))
+
+    def append_readings(self, patient_id: str, readings: pd.DataFrame | Iterable[tuple[Any, float]]) -> list[PatternDetection]:
+        """Add readings to the open day and return the detections of the re-run rules.
+
+        When the batch spans midnight, each day it touches is evaluated before
+        the next one opens, so detections for several dates may be returned.
+        ``readings`` is a frame with ``timestamp`` and ``glucose_mg_dL`` columns
+        or an iterable of ``(timestamp, glucose)`` pairs; naive timestamps are
+        taken as UTC and missing glucose values are dropped.
+        """
+
+        if patient_id not in self._streams:
+            self.open_patient(patient_id)
+        stream = self._streams[patient_id]
+
+        detections: list[PatternDetection] = []
+        rolled = stream.open_day is None
+        touched: list[float] = []
+        for timestamp, value in _normalize(readings):
+            local = timestamp.tz_convert(stream.tz) if stream.tz is not None else timestamp
+            service_date = local.date()
+            open_day = stream.open_day
+            if open_day is None or service_date > open_day.summary.service_date:
+                if open_day is not None:
+                    if rolled or touched:
+                        detections.extend(self._evaluate(stream, None if rolled else touched))
+                    self._close(stream)
+                stream.open_day = _OpenDay(
+                    RunningDaySummary(patient_id, service_date, self._high_threshold, self._low_threshold)
+                )
+                rolled = True
+                touched.clear()
+            elif service_date < open_day.summary.service_date:
+                raise ValueError(
+                    f"Reading at {timestamp} is for closed day {service_date} of patient {patient_id}"
+                )
+            position = stream.open_day.add(timestamp, value)
+            touched.append(_local_hour(local))
+            if position > 0:
+                # The previous reading's duration now ends at this one.
+                previous = stream.open_day.timestamps[position - 1]
+                touched.append(_local_hour(previous.tz_convert(stream.tz) if stream.tz is not None else previous))
+
+        if stream.open_day is not None and (rolled or touched):
+            detections.extend(self._evaluate(stream, None if rolled else touched))
+        return detections
+
+    def latest(self, patient_id: str) -> dict[str, PatternDetection]:
+        """Return the most recent detection of every rule for the open day."""
+
+        stream = self._streams.get(patient_id)
+        return dict(stream.latest) if stream is not None else {}
+
+    def current_summary(self, patient_id: str) -> DailyCGMSummary | None:
+        """Return the running summary of the patient's open day."""
+
+        stream = self._streams.get(patient_id)
+        if stream is None or stream.open_day is None:
+            return None
+        return stream.open_day.summary.snapshot()
+
+    def close_patient(self, patient_id: str) -> None:
+        self._streams.pop(patient_id, None)
+
+    def _close(self, stream: _PatientStream) -> None:
+        open_day = stream.open_day
+        stream.closed.raw_days.append(open_day.to_day(stream.local_timezone))
+        stream.closed.summaries.append(open_day.summary.snapshot())
+        stream.latest.clear()
+        stream.coverage_seen.clear()
+        first = self._window_days(stream)[0].service_date
+        stream.prepared = {key: value for key, value in stream.prepared.items() if key >= first}
+        stream.time_windows = {key: value for key, value in stream.time_windows.items() if key[0] >= first}
+
+    def _window_days(self, stream: _PatientStream) -> list[CGMDay]:
+        keep = self._engine.validation_days - 1
+        return list(stream.closed.raw_days)[-keep:] if keep else []
+
+    def _evaluate(self, stream: _PatientStream, touched: list[float] | None) -> list[PatternDetection]:
+        engine = self._engine
+        current = stream.open_day
+        analysis_date = current.summary.service_date
+        keep = engine.validation_days - 1
+
+        context = engine.window_context(stream.closed, analysis_date)
+        selected = engine.applicable_rules(context, self._rule_filter)
+        coverage = current.summary.coverage_ratio()
+        if touched is not None:
+            selected = tuple(
+                rule
+                for rule in selected
+                if _covers(rule_hour_windows(rule, rule.config(context)), touched)
+                or _crossed(rule.config(context), stream.coverage_seen.get(rule.id, 0.0), coverage)
+            )
+        if not selected:
+            return []
+
+        days = [*self._window_days(stream), current.to_day(stream.local_timezone)]
+        summaries = [*(list(stream.closed.summaries)[-keep:] if keep else []), current.summary.snapshot()]
+        window = engine.build_window(stream.closed.patient_id, analysis_date, days, summaries)
+        window.prepared_day_cache.update(stream.prepared)
+        window.time_window_cache.update(stream.time_windows)
+
+        detections = engine.run_rules(selected, window, context)
+
+        stream.prepared.update(
+            (key, value) for key, value in window.prepared_day_cache.items() if key != analysis_date
+        )
+        stream.time_windows.update(
+            (key, value) for key, value in window.time_window_cache.items() if key[0] != analysis_date
+        )
+        for rule, detection in zip(selected, detections):
+            stream.latest[rule.id] = detection
+            stream.coverage_seen[rule.id] = coverage
+        return detections
+
+
+def _local_hour(timestamp: pd.Timestamp) -> float:
+    return timestamp.hour + timestamp.minute / 60.0 + timestamp.second / 3600.0
+
+
+def _normalize(readings: pd.DataFrame | Iterable[tuple[Any, float]]) -> list[tuple[pd.Timestamp, float]]:
+    if isinstance(readings, pd.DataFrame):
+        pairs = zip(readings["timestamp"], readings["glucose_mg_dL"])
+    else:
+        pairs = readings
+    normalized = []
+    for raw_timestamp, raw_value in pairs:
+        timestamp = pd.Timestamp(raw_timestamp)
+        timestamp = timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+        try:
+            value = float(raw_value)
+        except (TypeError, ValueError):
+            continue
+        if not math.isnan(value):
+            normalized.append((timestamp, value))
+    normalized.sort(key=lambda pair: pair[0])
+    return normalized
+
+
+__all__ = ["RunningDaySummary", "StreamingSession", "rule_hour_windows"]
@@ -0,0 +1,192 @@
+"""Threshold sweeps: evaluate one rule over a grid of parameter values.
+
+Each analysis window is built once and the rule is run against it for every
+grid point, so prepared days, time-window slices and summaries are shared
+across the grid instead of being recomputed per threshold combination.
+Patients are spread across worker processes.
+"""
+from __future__ import annotations
+
+import csv
+import itertools
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from functools import partial
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence, TextIO
+
+from .engine import SlidingWindowEngine
+from .models import PatternStatus
+from .rule_base import PatternRule, RuleConfig
+
+
+def expand_grid(
+    rule: PatternRule,
+    grid: Mapping[str, Sequence[Any]],
+    *,
+    thresholds: Mapping[str, Any] | None = None,
+    pattern_settings: Mapping[str, Mapping[str, Any]] | None = None,
+) -> tuple[list[dict[str, Any]], list[RuleConfig]]:
+    """Return the cartesian grid points and the rule config for each.
+
+    Parameters not in ``grid`` resolve as usual from ``thresholds`` and
+    ``pattern_settings``.
+    """
+
+    known = {parameter.name for parameter in rule.parameters}
+    unknown = sorted(set(grid) - known)
+    if unknown:
+        raise ValueError(f"Rule '{rule.id}' has no parameters named {', '.join(unknown)}")
+    thresholds = thresholds or {}
+    pattern_settings = pattern_settings or {}
+    base = dict(pattern_settings.get(rule.id, {}))
+
+    names = list(grid)
+    points: list[dict[str, Any]] = []
+    configs: list[RuleConfig] = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        point = dict(zip(names, values))
+        config = rule.compile_config(thresholds, {**pattern_settings, rule.id: {**base, **point}})
+        points.append({name: config[name] for name in names})
+        configs.append(config)
+    return points, configs
+
+
+@dataclass(frozen=True)
+class SweepCount:
+    """Window outcomes of one patient at one grid point."""
+
+    patient_id: str
+    point: int
+    windows: int
+    detected: int
+    not_detected: int
+    insufficient: int
+
+
+def sweep_patient(
+    engine: SlidingWindowEngine,
+    rule: PatternRule,
+    configs: Sequence[RuleConfig],
+    patient_id: str,
+) -> list[SweepCount]:
+    """Evaluate ``rule`` under every config for each of a patient's windows.
+
+    Windows where a normal run would not evaluate the rule (e.g. its
+    diagnosis context does not match) are skipped; a patient with no such
+    window yields no counts at all.
+    """
+
+    tallies = [[0, 0, 0] for _ in configs]
+    windows = skipped = 0
+    for window, context in engine.iter_windows(patient_id):
+        if all(planned.id != rule.id for planned in engine.applicable_rules(context)):
+            skipped += 1
+            continue
+        windows += 1
+        for tally, config in zip(tallies, configs):
+            swept = replace(context, rule_configs={**context.rule_configs, rule.id: config})
+            status = rule.detect(window, swept).status
+            if status is PatternStatus.DETECTED:
+                tally[0] += 1
+            elif status is PatternStatus.NOT_DETECTED:
+                tally[1] += 1
+            elif status is PatternStatus.INSUFFICIENT_DATA:
+                tally[2] += 1
+    if skipped and not windows:
+        return []
+    return [
+        SweepCount(patient_id, index, windows, detected, not_detected, insufficient)
+        for index, (detected, not_detected, insufficient) in enumerate(tallies)
+    ]
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Per-patient counts for every grid point of a sweep."""
+
+    rule_id: str
+    points: tuple[dict[str, Any], ...]
+    counts: tuple[SweepCount, ...]
+
+    def prevalence(self) -> list[dict[str, Any]]:
+        """Return one row per grid point: the prevalence-vs-threshold curve."""
+
+        rows = []
+        for index, point in enumerate(self.points):
+            counts = [count for count in self.counts if count.point == index]
+            windows = sum(count.windows for count in counts)
+            evaluable = sum(count.detected + count.not_detected for count in counts)
+            detected = sum(count.detected for count in counts)
+            patients_detected = sum(1 for count in counts if count.detected)
+            rows.append(
+                {
+                    **point,
+                    "patients": len(counts),
+                    "patients_detected": patients_detected,
+                    "patient_prevalence": patients_detected / len(counts) if counts else 0.0,
+                    "windows": windows,
+                    "windows_detected": detected,
+                    "window_prevalence": detected / evaluable if evaluable else 0.0,
+                }
+            )
+        return rows
+
+    def table(self, *, per_patient: bool = False) -> list[dict[str, Any]]:
+        """Return the prevalence curve, or per-patient counts with their grid values."""
+
+        if per_patient:
+            return [{**self.points[count.point], **asdict(count)} for count in self.counts]
+        return self.prevalence()
+
+    def write_csv(self, target: Path | TextIO, *, per_patient: bool = False) -> None:
+        """Write :meth:`table` as CSV to a path or an open text stream."""
+
+        rows = self.table(per_patient=per_patient)
+        if isinstance(target, (str, Path)):
+            with Path(target).open("w", newline="") as handle:
+                _write_rows(handle, rows)
+        else:
+            _write_rows(target, rows)
+
+
+def _write_rows(handle: TextIO, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def run_sweep(
+    engine: SlidingWindowEngine,
+    rule: PatternRule,
+    grid: Mapping[str, Sequence[Any]],
+    patient_ids: Iterable[str],
+    *,
+    thresholds: Mapping[str, Any] | None = None,
+    pattern_settings: Mapping[str, Mapping[str, Any]] | None = None,
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+) -> SweepResult:
+    """Sweep ``rule`` over ``grid`` for a cohort, one patient per task.
+
+    Tasks run on ``executor`` (a process pool with ``max_workers`` by
+    default); the engine is shipped via :meth:`SlidingWindowEngine.detached`.
+    """
+
+    points, configs = expand_grid(rule, grid, thresholds=thresholds, pattern_settings=pattern_settings)
+    task = partial(sweep_patient, engine.detached(), rule, configs)
+
+    owns_executor = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        counts = [count for patient_counts in executor.map(task, patient_ids) for count in patient_counts]
+    finally:
+        if owns_executor:
+            executor.shutdown()
+    return SweepResult(rule.id, tuple(points), tuple(counts))
+
+
+__all__ = ["SweepCount", "SweepResult", "expand_grid", "run_sweep", "sweep_patient"]
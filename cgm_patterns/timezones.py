@@ -0,0 +1,84 @@
+"""Cached resolution of day timezone labels and vectorized local clock times."""
+from __future__ import annotations
+
+import re
+from datetime import timedelta, timezone, tzinfo
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from zoneinfo import ZoneInfo
+
+_OFFSET_LABEL = re.compile(r"^UTC(?:([+-])(\d{1,2})(?::(\d{2}))?)?$")
+_NS_PER_MINUTE = 60 * 1_000_000_000
+MINUTES_PER_DAY = 24 * 60
+
+
+@lru_cache(maxsize=256)
+def resolve_zoneinfo(label: str) -> ZoneInfo | None:
+    """Return the IANA zone for ``label`` or None when it is not a known key."""
+
+    try:
+        return ZoneInfo(label)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=256)
+def resolve_timezone(label: str | None) -> tzinfo | None:
+    """Resolve an IANA name or a ``UTC±HH:MM`` label (as emitted by the fetcher).
+
+    Returns None for missing or unrecognised labels.
+    """
+
+    if not label:
+        return None
+    zone = resolve_zoneinfo(label)
+    if zone is not None:
+        return zone
+    match = _OFFSET_LABEL.match(label.strip().upper())
+    if match is None:
+        return None
+    sign, hours, minutes = match.groups()
+    if sign is None:
+        return timezone.utc
+    delta = timedelta(hours=int(hours), minutes=int(minutes or 0))
+    try:
+        return timezone(-delta if sign == "-" else delta)
+    except ValueError:
+        return None
+
+
+def fixed_offset_minutes(tz: tzinfo | None) -> int | None:
+    """Return the UTC offset in minutes when ``tz`` never changes offset."""
+
+    if tz is None:
+        return 0
+    if isinstance(tz, timezone):
+        return int(tz.utcoffset(None).total_seconds() // 60)
+    return None
+
+
+def local_minute_of_day(timestamps: pd.Series, tz: tzinfo | None) -> np.ndarray:
+    """Return the local minute of day (0-1439) for UTC-aware ``timestamps``.
+
+    Fixed offsets are applied with one int64 add; other zones go through a
+    single vectorized ``tz_convert``.
+    """
+
+    offset = fixed_offset_minutes(tz)
+    if offset is not None:
+        utc_ns = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        return (utc_ns // _NS_PER_MINUTE + offset) % MINUTES_PER_DAY
+    local = timestamps.dt.tz_convert(tz).dt.tz_localize(None)
+    local_ns = local.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    return (local_ns // _NS_PER_MINUTE) % MINUTES_PER_DAY
+
+
+__all__ = [
+    "MINUTES_PER_DAY",
+    "fixed_offset_minutes",
+    "local_minute_of_day",
+    "resolve_timezone",
+    "resolve_zoneinfo",
+]
@@ -6,7 +6,7 @@ from typing import Any, Mapping
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 
 
 @register_rule
@@ -16,12 +16,19 @@ class DataInsufficiencyRule(PatternRule):
     description = "<70% active CGM time over 14 days"
     version = "1.0.0"
     metadata = PATTERN_METADATA.get(40, {})
+    parameters = (
+        RuleParameter("data_validation_min_coverage", float, 0.0),
+        RuleParameter("data_window_days", int, 14),
+        RuleParameter("data_active_threshold", float, 0.70),
+        RuleParameter("data_tag_threshold", int, 3),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        coverage_threshold = float(self.resolved_threshold(context, "data_validation_min_coverage", 0.0))
-        evaluation_days = int(self.resolved_threshold(context, "data_window_days", 14))
-        active_threshold = float(self.resolved_threshold(context, "data_active_threshold", 0.70))
-        tag_threshold = int(self.resolved_threshold(context, "data_tag_threshold", 3))
+        config = self.config(context)
+        coverage_threshold = config.data_validation_min_coverage
+        evaluation_days = config.data_window_days
+        active_threshold = config.data_active_threshold
+        tag_threshold = config.data_tag_threshold
 
         recent_days, insufficient_validation = self.ensure_validation_window(
             window,
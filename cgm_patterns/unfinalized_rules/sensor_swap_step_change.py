@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from ..models import PatternContext, PatternDetection, PatternStatus, PatternInputBundle
 from ..pattern_metadata import PATTERN_METADATA
 from ..registry import register_rule
-from ..rule_base import PatternRule
+from ..rule_base import PatternRule, RuleParameter
 from ..rules_v1.utils import prepare_day
 
 
@@ -24,10 +24,15 @@ class SensorSwapStepChangeRule(PatternRule):
     description = "Baseline shift ≥25 mg/dL within ±2h window"
     version = "1.0.0"
     metadata = PATTERN_METADATA[34]
+    parameters = (
+        RuleParameter("step_change_threshold", float, 25.0),
+        RuleParameter("step_change_window_minutes", float, 60.0),
+    )
 
     def detect(self, window: PatternInputBundle, context: PatternContext) -> PatternDetection:
-        delta_threshold = float(self.resolved_threshold(context, "step_change_threshold", 25.0))
-        window_minutes = float(self.resolved_threshold(context, "step_change_window_minutes", 60.0))
+        config = self.config(context)
+        delta_threshold = config.step_change_threshold
+        window_minutes = config.step_change_window_minutes
 
         detections: list[StepChangeResult] = []
         for day in window.validation_days:
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Time decoding and parsing of a raw /cgm/reading dump."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+repo_root = Path(__file__).resolve().parents[1]
+if repo_root.as_posix() not in sys.path:
+    sys.path.insert(0, repo_root.as_posix())
+
+from cgm_patterns.CGM_fetcher import _parse_days  # type: ignore
+from cgm_patterns.parsing import entries_to_columns, loads, orjson, parse_local_times, parse_utc_timestamps
+
+DEFAULT_DUMP = repo_root / "example_cgm_api_output" / "6663751ba288866831d13caf_2024-01-01_2025-12-31_reading.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark CGM reading payload parsing")
+    parser.add_argument("path", type=Path, nargs="?", default=DEFAULT_DUMP, help="Reading API JSON dump")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is reported")
+    return parser.parse_args()
+
+
+def _best_ms(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def _pandas_columns(entries: list[dict]) -> pd.DataFrame:
+    # Reference: the dict-of-records DataFrame plus inferred datetime parsing.
+    frame = pd.DataFrame(entries)
+    frame["timestamp"] = pd.to_datetime(frame["utc"], errors="coerce", utc=True)
+    frame["glucose_mg_dL"] = pd.to_numeric(frame["value"], errors="coerce")
+    frame["local_timestamp"] = pd.to_datetime(frame["localTime"], errors="coerce")
+    return frame
+
+
+def _array_columns(entries: list[dict]) -> None:
+    columns = entries_to_columns(entries)
+    parse_utc_timestamps(columns["utc"])
+    parse_local_times(columns["localTime"])
+
+
+def main() -> None:
+    args = parse_args()
+    raw = args.path.read_bytes()
+    data = loads(raw).get("data") or {}
+    entries = data.get("rawData") or []
+
+    rows = [
+        ("json.loads", _best_ms(lambda: json.loads(raw), args.repeat)),
+        (f"parsing.loads ({'orjson' if orjson else 'json'})", _best_ms(lambda: loads(raw), args.repeat)),
+        ("pandas record columns", _best_ms(lambda: _pandas_columns(entries), args.repeat)),
+        ("array columns", _best_ms(lambda: _array_columns(entries), args.repeat)),
+        ("_parse_days (end to end)", _best_ms(lambda: _parse_days(data, "benchmark"), args.repeat)),
+    ]
+    print(f"{args.path.name}: {len(raw) / 1e6:.1f} MB, {len(entries)} readings")
+    for label, elapsed in rows:
+        print(f"  {label:<28} {elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Load-test the detection service and report request latency percentiles.
+
+Without ``--url`` a stub-backed service is started in a subprocess, so the test
+runs entirely offline. Each of ``--concurrency`` workers keeps one keep-alive
+connection and sends its next request as soon as the previous one completes;
+the client is a bare asyncio HTTP/1.1 loop so its own overhead stays well
+below the service's.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+repo_root = Path(__file__).resolve().parents[1]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load-test the CGM detection service")
+    parser.add_argument("--url", help="Base URL of a running service (default: start a stub service)")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections sending requests at once")
+    parser.add_argument("--patients", type=int, default=50, help="Distinct patient IDs to query")
+    parser.add_argument("--days", type=int, default=60, help="Days per stub patient (dates are drawn from them)")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="Seconds slept per stub patient fetch")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the request mix")
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="Request every patient once before timing, so only warm-state latency is measured",
+    )
+    return parser.parse_args()
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection issuing GET requests in sequence."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._host = host
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "_Connection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, host)
+
+    async def get(self, target: str) -> tuple[int, bytes]:
+        self._writer.write(f"GET {target} HTTP/1.1\r\nHost: {self._host}\r\n\r\n".encode())
+        await self._writer.drain()
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        length = next(int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length"))
+        return status, await self._reader.readexactly(length)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _start_stub_service(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    command = [
+        sys.executable, "-m", "cgm_patterns.service", "--stub", "--port", str(port),
+        "--stub-days", str(args.days), "--stub-latency", str(args.stub_latency),
+    ]
+    return subprocess.Popen(command, cwd=repo_root), f"http://127.0.0.1:{port}"
+
+
+async def _connect(host: str, port: int, timeout: float = 60.0) -> _Connection:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await _Connection.open(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> None:
+    url = urlsplit(base_url)
+    host, port = url.hostname or "127.0.0.1", url.port or 80
+    rng = random.Random(args.seed)
+    start = date(2024, 1, 1)
+    targets = [
+        f"/patients/stub-{rng.randrange(args.patients)}/detections?date={start + timedelta(days=rng.randrange(args.days))}"
+        for _ in range(args.requests)
+    ]
+
+    control = await _connect(host, port)
+    connections = [await _Connection.open(host, port) for _ in range(args.concurrency)]
+    if args.warmup:
+        for first in range(0, args.patients, len(connections)):
+            await asyncio.gather(
+                *(
+                    connection.get(f"/patients/stub-{index}/detections")
+                    for connection, index in zip(connections, range(first, args.patients))
+                )
+            )
+
+    queue = iter(targets)
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async def _worker(connection: _Connection) -> None:
+        for target in queue:
+            began = time.perf_counter()
+            status, _ = await connection.get(target)
+            latencies.append(time.perf_counter() - began)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    began = time.perf_counter()
+    await asyncio.gather(*(_worker(connection) for connection in connections))
+    elapsed = time.perf_counter() - began
+    stats = json.loads((await control.get("/stats"))[1])
+    for connection in (control, *connections):
+        connection.close()
+
+    millis = np.array(latencies) * 1000.0
+    print(f"requests     {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"statuses     {dict(sorted(statuses.items()))}")
+    print(f"p50          {np.percentile(millis, 50):.2f} ms")
+    print(f"p99          {np.percentile(millis, 99):.2f} ms")
+    print(f"max          {millis.max():.2f} ms")
+    print(f"service      {stats}")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.url is not None:
+        asyncio.run(_run(args, args.url))
+        return
+    process, base_url = _start_stub_service(args)
+    try:
+        asyncio.run(_run(args, base_url))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.batch import DONE, FAILED, BatchManifest, run_chunked
+
+
+def test_failed_patients_are_retried_with_backoff(tmp_path):
+    manifest = BatchManifest(tmp_path / "manifest.sqlite")
+    calls: list[str] = []
+    sleeps: list[float] = []
+
+    def _task(patient_id):
+        calls.append(patient_id)
+        if patient_id == "flaky" and calls.count("flaky") < 3:
+            raise ConnectionError("timeout")
+        if patient_id == "broken":
+            raise ValueError("bad payload")
+        return {"id": patient_id}
+
+    report = run_chunked(
+        ["a", "flaky", "b", "broken", "c"], _task, manifest, chunk_size=2, max_attempts=3, backoff=1.5, sleep=sleeps.append
+    )
+
+    assert sleeps == [1.5, 3.0]
+    assert report.completed == 4 and report.retries == 4
+    assert list(report.failed) == ["broken"] and "ValueError: bad payload" in report.failed["broken"]
+    assert manifest.counts(["a", "flaky", "b", "broken", "c"]) == {DONE: 4, FAILED: 1}
+    assert list(manifest.results(["a", "flaky", "b", "broken", "c"])) == ["a", "flaky", "b", "c"]
+
+
+def test_rerun_resumes_without_redoing_finished_patients(tmp_path):
+    path = tmp_path / "manifest.sqlite"
+    patients = [f"p{index}" for index in range(7)]
+
+    def _crash_at_p4(patient_id):
+        if patient_id == "p4":
+            raise KeyboardInterrupt  # Simulated crash: not caught as a patient failure.
+        return patient_id.upper()
+
+    with pytest.raises(KeyboardInterrupt):
+        run_chunked(patients, _crash_at_p4, BatchManifest(path), chunk_size=3)
+
+    calls: list[str] = []
+
+    def _task(patient_id):
+        calls.append(patient_id)
+        return patient_id.upper()
+
+    manifest = BatchManifest(path)
+    report = run_chunked(patients, _task, manifest, chunk_size=3)
+
+    assert calls == ["p4", "p5", "p6"]
+    assert report.already_done == 4 and report.completed == 3
+    assert manifest.results(patients) == {patient_id: patient_id.upper() for patient_id in patients}
+
+
+def test_rerun_with_another_list_ignores_other_patients(tmp_path):
+    manifest = BatchManifest(tmp_path / "manifest.sqlite")
+
+    def _first(patient_id):
+        if patient_id == "old":
+            raise ValueError("bad payload")
+        return patient_id
+
+    run_chunked(["old", "b"], _first, manifest, max_attempts=1, sleep=lambda seconds: None)
+    calls: list[str] = []
+
+    def _task(patient_id):
+        calls.append(patient_id)
+        return patient_id
+
+    report = run_chunked(["b", "c"], _task, manifest)
+
+    assert calls == ["c"]
+    assert report.already_done == 1 and not report.failed
+    assert list(manifest.results(["b", "c"])) == ["b", "c"]
+
+
+def test_workers_are_not_held_at_chunk_boundaries(tmp_path):
+    release = threading.Event()
+
+    def _task(patient_id):
+        # "slow" only finishes once the next chunk has started.
+        if patient_id == "slow":
+            assert release.wait(5)
+        elif patient_id == "next-chunk":
+            release.set()
+        return patient_id
+
+    chunks: list[tuple[int, int]] = []
+    report = run_chunked(
+        ["slow", "fast", "next-chunk"],
+        _task,
+        BatchManifest(tmp_path / "manifest.sqlite"),
+        chunk_size=2,
+        workers=2,
+        on_chunk=lambda chunk, failed: chunks.append((chunk, failed)),
+    )
+
+    assert report.completed == 3 and not report.failed
+    assert chunks == [(1, 0), (0, 0)]
+
+
+def test_rerun_with_other_parameters_is_refused_unless_reset(tmp_path):
+    manifest = BatchManifest(tmp_path / "manifest.sqlite")
+    run_chunked(["a", "b"], str.upper, manifest, parameters={"start": "2024-01-01", "rules": {"r": "1.0.0"}})
+
+    with pytest.raises(ValueError, match="rules"):
+        run_chunked(["a", "b"], str.lower, manifest, parameters={"start": "2024-01-01", "rules": {"r": "2.0.0"}})
+    assert manifest.results(["a", "b"]) == {"a": "A", "b": "B"}
+
+    manifest.bind({"start": "2024-01-01", "rules": {"r": "2.0.0"}}, reset=True)
+    report = run_chunked(["a", "b"], str.lower, manifest, parameters={"rules": {"r": "2.0.0"}, "start": "2024-01-01"})
+
+    assert report.already_done == 0 and report.completed == 2
+    assert manifest.results(["a", "b"]) == {"a": "a", "b": "b"}
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+import math
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.cache import CachedFetcher, DailySummaryCache, PersistentSummaryStore, StripedSummaryCache
+from cgm_patterns.models import DailyCGMSummary
+
+
+def _summary(patient_id: str, service_date: date) -> DailyCGMSummary:
+    return DailyCGMSummary(
+        patient_id=patient_id,
+        service_date=service_date,
+        mean_glucose=120.0,
+        std_glucose=10.0,
+        percent_high=0.0,
+        percent_low=0.0,
+        percent_in_range=1.0,
+        time_high_minutes=0.0,
+        time_low_minutes=0.0,
+        time_in_range_minutes=1440.0,
+        max_glucose=140.0,
+        min_glucose=100.0,
+        total_readings=288,
+        coverage_ratio=1.0,
+    )
+
+
+def test_evict_before_drops_only_older_entries_for_patient():
+    cache = DailySummaryCache()
+    start = date(2024, 1, 1)
+    for offset in range(5):
+        cache.set(_summary("a", start + timedelta(days=offset)))
+    cache.set(_summary("b", start))
+
+    cache.evict_before("a", (start + timedelta(days=3)).isoformat())
+
+    assert cache.get("a", start.isoformat()) is None
+    assert cache.get("a", (start + timedelta(days=3)).isoformat()) is not None
+    assert cache.get("b", start.isoformat()) is not None
+    stats = cache.stats()
+    assert stats.evictions == 3
+    assert stats.entries == 3
+    assert (stats.hits, stats.misses) == (2, 1)
+
+
+def test_max_entries_evicts_least_recently_used_patient_first():
+    cache = DailySummaryCache(max_entries=3)
+    start = date(2024, 1, 1)
+    cache.set(_summary("a", start))
+    cache.set(_summary("b", start))
+    cache.set(_summary("a", start + timedelta(days=1)))
+    cache.set(_summary("c", start))
+
+    assert len(cache) == 3
+    assert cache.get("b", start.isoformat()) is None
+    assert cache.get("a", start.isoformat()) is not None
+
+
+def test_striped_cache_handles_concurrent_patients():
+    cache = StripedSummaryCache(stripes=4)
+    start = date(2024, 1, 1)
+
+    def _fill(patient_id: str) -> None:
+        for offset in range(30):
+            cache.set(_summary(patient_id, start + timedelta(days=offset)))
+            cache.evict_before(patient_id, (start + timedelta(days=offset - 6)).isoformat())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_fill, [f"p{index}" for index in range(16)]))
+
+    assert len(cache) == 16 * 7
+    assert cache.stats().evictions == 16 * 23
+
+
+def test_persistent_store_shares_entries_between_instances(tmp_path: Path):
+    path = tmp_path / "summaries.sqlite"
+    writer = PersistentSummaryStore(path)
+    summary = replace(_summary("a", date(2024, 1, 1)), mean_glucose=float("nan"))
+    writer.save(summary, "key-1")
+
+    reader = PersistentSummaryStore(path)
+    restored = reader.load("a", date(2024, 1, 1), "key-1")
+
+    assert restored is not None
+    assert math.isnan(restored.mean_glucose)
+    assert restored.service_date == summary.service_date
+    # A backfilled day digests differently, so its stale summary is not served.
+    assert reader.load("a", date(2024, 1, 1), "key-2") is None
+    assert reader.load("a", date(2024, 1, 2), "key-1") is None
+    assert reader.day_count("a") == 1
+
+
+def test_cached_fetcher_is_bounded_and_retries_failures():
+    calls: list[str] = []
+
+    def _fetch(patient_id, analysis_date):
+        calls.append(patient_id)
+        if patient_id == "flaky" and calls.count("flaky") == 1:
+            raise ConnectionError("timeout")
+        return patient_id.upper()
+
+    fetcher = CachedFetcher(_fetch, max_entries=2)
+
+    with pytest.raises(ConnectionError):
+        fetcher("flaky", date(2024, 1, 1))
+    assert fetcher("flaky", date(2024, 1, 1)) == "FLAKY"
+    assert fetcher("a", date(2024, 1, 1)) == "A"
+    assert fetcher("flaky", date(2024, 1, 1)) == "FLAKY"
+    fetcher("b", date(2024, 1, 1))
+    fetcher("a", date(2024, 1, 1))
+
+    assert len(fetcher) == 2
+    assert calls == ["flaky", "flaky", "a", "b", "a"]
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cgm_patterns.CGM_fetcher as fetcher
+
+_OFFSET = timedelta(hours=-7)
+_LOCAL_DAYS = [datetime(2025, 5, 10) + timedelta(days=offset) for offset in range(6)]
+_START = datetime(2025, 5, 10, tzinfo=timezone.utc)
+_END = datetime(2025, 5, 17, tzinfo=timezone.utc)
+
+
+def _readings() -> list[dict]:
+    # Four readings per local day; the late-evening one falls on the next UTC date.
+    entries = []
+    for local_day in _LOCAL_DAYS:
+        for hour in (0, 6, 12, 18):
+            local = local_day + timedelta(hours=hour, minutes=10)
+            entries.append(
+                {
+                    "value": 100.0 + hour,
+                    "utc": (local - _OFFSET).strftime("%Y-%m-%dT%H:%M:%S.000"),
+                    "localTime": local.strftime("%Y-%m-%dT%H:%M:%S.000"),
+                }
+            )
+    return entries
+
+
+class _FakeBackend:
+    def __init__(self) -> None:
+        self.sub_requests: list[str] = []
+
+    def __call__(self, path, payload):
+        start = datetime.strptime(payload["startTime"], "%Y-%m-%dT%H:%M:%SZ")
+        end = datetime.strptime(payload["endTime"], "%Y-%m-%dT%H:%M:%SZ")
+        entries = [
+            entry
+            for entry in _readings()
+            if start <= datetime.strptime(entry["utc"], "%Y-%m-%dT%H:%M:%S.000") <= end
+        ]
+        data = {"rawData": entries}
+        if payload.get("includeAvailableDates"):
+            local_dates = sorted({entry["localTime"][:10] for entry in entries}, reverse=True)
+            data["availableDates"] = [f"{value}T00:00:00.000000-07:00" for value in local_dates]
+        else:
+            self.sub_requests.append(payload["startTime"])
+        return {"data": data}
+
+
+def _describe(days):
+    return [(day.service_date.isoformat(), len(day.readings), day.local_timezone) for day in days]
+
+
+def test_chunked_fetch_merges_border_days(monkeypatch):
+    backend = _FakeBackend()
+    monkeypatch.setattr(fetcher, "_request", backend)
+
+    chunked = _describe(fetcher.iter_cgm_days("p", start=_START, end=_END, chunk_days=2, concurrency=3))
+
+    assert chunked == [(day.date().isoformat(), 4, "UTC-07:00") for day in _LOCAL_DAYS]
+    assert backend.sub_requests == []
+
+    monkeypatch.setattr(fetcher, "_request", _FakeBackend())
+    single = _describe(fetcher.iter_cgm_days("p", start=_START, end=_END, chunk_days=30))
+    assert single == chunked
+
+
+def test_aiter_cgm_days_streams_in_sync_order(monkeypatch):
+    monkeypatch.setattr(fetcher, "_request", _FakeBackend())
+
+    async def _collect():
+        return [
+            day
+            async for day in fetcher.aiter_cgm_days("p", start=_START, end=_END, chunk_days=2, concurrency=2)
+        ]
+
+    expected = _describe(fetcher.iter_cgm_days("p", start=_START, end=_END, chunk_days=2))
+    assert _describe(asyncio.run(_collect())) == expected
+
+
+def test_only_days_cut_by_the_range_edge_are_refetched(monkeypatch):
+    backend = _FakeBackend()
+    monkeypatch.setattr(fetcher, "_request", backend)
+    start = datetime(2025, 5, 10, 12, tzinfo=timezone.utc)
+
+    days = _describe(fetcher.iter_cgm_days("p", start=start, end=_END, chunk_days=2))
+
+    assert backend.sub_requests == ["2025-05-10T07:00:00Z"]
+    assert days[0] == ("2025-05-10", 4, "UTC-07:00")
+    assert len(days) == len(_LOCAL_DAYS)
+
+
+def test_reading_payloads_parse_to_the_streamed_days(monkeypatch):
+    monkeypatch.setattr(fetcher, "_request", _FakeBackend())
+    start = datetime(2025, 5, 10, 12, tzinfo=timezone.utc)
+
+    containers = fetcher.fetch_reading_payloads("p", start=start, end=_END, chunk_days=2)
+
+    expected = _describe(fetcher.iter_cgm_days("p", start=start, end=_END, chunk_days=2))
+    assert _describe(fetcher.parse_reading_payloads("p", containers)) == expected
@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.cache import DailySummaryCache
+from cgm_patterns.cohort import CohortEngine
+from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.models import CGMDay
+from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rules_v1.dawn_phenomenon import DawnPhenomenonRule
+from cgm_patterns.rules_v1.high_glycemic_variability import HighGlycemicVariabilityRule
+from cgm_patterns.rules_v1.predominant_hyperglycemia import PredominantHyperglycemiaRule
+from cgm_patterns.rules_v1.predominant_hypoglycemia import PredominantHypoglycemiaRule
+from cgm_patterns.rules_v1.stable_near_target_control import StableNearTargetControlRule
+
+
+class _CohortSource:
+    def __init__(self, days_by_patient):
+        self._days = days_by_patient
+
+    def iter_days(self, patient_id):
+        return iter(self._days[patient_id])
+
+
+def _patient_days(patient_id: str, seed: int, count: int) -> list[CGMDay]:
+    rng = np.random.default_rng(seed)
+    days = []
+    for offset in range(count):
+        service_date = date(2024, 3, 1) + timedelta(days=offset)
+        readings = 150 if offset in (2, 17) else 288  # Days that miss the coverage bar.
+        timestamps = pd.date_range(pd.Timestamp(service_date), periods=readings, freq="5min", tz="UTC")
+        center = rng.choice([95.0, 140.0, 190.0])
+        values = rng.normal(center, rng.choice([15.0, 45.0, 70.0]), size=readings).clip(40.0, 400.0)
+        frame = pd.DataFrame({"timestamp": timestamps, "glucose_mg_dL": values})
+        days.append(CGMDay(patient_id=patient_id, service_date=service_date, readings=frame))
+    return days
+
+
+def _registry() -> RuleRegistry:
+    registry = RuleRegistry()
+    for rule_cls in (
+        PredominantHyperglycemiaRule,
+        DawnPhenomenonRule,
+        PredominantHypoglycemiaRule,
+        HighGlycemicVariabilityRule,
+        StableNearTargetControlRule,
+    ):
+        registry.register(rule_cls)
+    return registry
+
+
+def test_cohort_engine_matches_sliding_window_engine():
+    days = {f"p{index}": _patient_days(f"p{index}", index, 40) for index in range(3)}
+    days["empty"] = []
+    source = _CohortSource(days)
+    registry = _registry()
+    cohort = CohortEngine(registry)
+
+    batched = cohort.run_source(source, days)
+
+    assert set(batched) == set(days)
+    assert batched["empty"] == {}
+    engine = SlidingWindowEngine(source, registry, summary_cache=DailySummaryCache())
+    for patient_id in days:
+        expected = engine.run_patient(patient_id, rule_filter=lambda rule: not isinstance(rule, DawnPhenomenonRule))
+        assert batched[patient_id] == expected
+    statuses = {d.status for by_date in batched.values() for ds in by_date.values() for d in ds}
+    assert len(statuses) == 3  # Detected, not detected and insufficient windows all compared.
+
+
+def test_cohort_engine_supports_only_kernel_rules():
+    registry = _registry()
+
+    assert [rule.id for rule in registry.values() if CohortEngine.supports(rule)] == [
+        "predominant_hyperglycemia",
+        "predominant_hypoglycemia",
+        "high_glycemic_variability",
+        "stable_near_target_control",
+    ]
+
+
+def test_cohort_engine_falls_back_to_detect_when_rule_version_changes(monkeypatch):
+    calls = []
+    original = PredominantHyperglycemiaRule.detect
+
+    def _detect(self, window, context):
+        calls.append(context.analysis_date)
+        return original(self, window, context)
+
+    monkeypatch.setattr(PredominantHyperglycemiaRule, "version", "2.0.0")
+    monkeypatch.setattr(PredominantHyperglycemiaRule, "detect", _detect)
+    days = {"p0": _patient_days("p0", 0, 25)}
+    source = _CohortSource(days)
+    registry = RuleRegistry()
+    registry.register(PredominantHyperglycemiaRule)
+    registry.register(PredominantHypoglycemiaRule)
+
+    batched = CohortEngine(registry).run_source(source, days)
+
+    assert len(calls) == 25
+    engine = SlidingWindowEngine(source, registry, summary_cache=DailySummaryCache())
+    assert batched["p0"] == engine.run_patient("p0")
+    assert {ds[0].version for ds in batched["p0"].values()} == {"2.0.0"}
@@ -1,10 +1,26 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date, timedelta
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+import numpy as np
+import pandas as pd
+
+from cgm_patterns.cache import (
+    DailySummaryCache,
+    DigestLedger,
+    PersistentSummaryStore,
+    SqliteDetectionCache,
+    fetch_key_per_week,
+)
 from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.models import CGMDay, PatternDetection, PatternStatus
 from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rule_base import PatternRule
 
 
 class _EmptySource:
@@ -20,3 +36,330 @@ def test_sliding_window_engine_uses_shared_cache_by_default():
     engine_two = SlidingWindowEngine(source, registry)
 
     assert engine_one._summary_cache is engine_two._summary_cache
+
+
+class _ListSource:
+    def __init__(self, days):
+        self._days = days
+
+    def iter_days(self, patient_id):
+        return iter(self._days)
+
+
+class _WindowEchoRule(PatternRule):
+    id = "window_echo"
+
+    def detect(self, window, context):
+        return PatternDetection(
+            pattern_id=self.id,
+            effective_date=context.analysis_date,
+            status=PatternStatus.NOT_DETECTED,
+            metrics={
+                "validation_days": len(window.validation_days),
+                "first_day": window.validation_days[0].service_date.toordinal(),
+                "mean": sum(s.mean_glucose for s in window.analysis_summaries),
+            },
+        )
+
+
+def _history(patient_id: str, count: int) -> list[CGMDay]:
+    start = date(2024, 1, 1)
+    days = []
+    for offset in range(count):
+        service_date = start + timedelta(days=offset)
+        timestamps = pd.date_range(pd.Timestamp(service_date), periods=288, freq="5min", tz="UTC")
+        values = np.full(288, 100.0 + offset)
+        frame = pd.DataFrame({"timestamp": timestamps, "glucose_mg_dL": values})
+        days.append(CGMDay(patient_id=patient_id, service_date=service_date, readings=frame))
+    return days
+
+
+def test_run_patient_parallel_matches_sequential():
+    registry = RuleRegistry()
+    registry.register(_WindowEchoRule)
+    engine = SlidingWindowEngine(
+        _ListSource(_history("p", 40)),
+        registry,
+        summary_cache=DailySummaryCache(),
+        analysis_days=3,
+        validation_days=5,
+    )
+
+    sequential = engine.run_patient("p")
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = engine.run_patient_parallel("p", chunk_days=7, executor=executor)
+
+    assert parallel == sequential
+
+
+def test_summary_store_skips_recomputing_unchanged_days(tmp_path, monkeypatch):
+    import cgm_patterns.engine as engine_module
+
+    calls = []
+    original = engine_module.compute_daily_summary
+
+    def _counting(day):
+        calls.append(day.service_date)
+        return original(day)
+
+    monkeypatch.setattr(engine_module, "compute_daily_summary", _counting)
+    store = PersistentSummaryStore(tmp_path / "store.sqlite")
+    days = _history("p", 5)
+
+    def _run(history):
+        engine = SlidingWindowEngine(
+            _ListSource(history),
+            RuleRegistry(),
+            summary_cache=DailySummaryCache(),
+            summary_store=store,
+        )
+        return engine.run_patient("p")
+
+    _run(days)
+    assert len(calls) == 5
+
+    edited = list(days)
+    changed = days[2].readings.assign(glucose_mg_dL=50.0)
+    edited[2] = CGMDay(patient_id="p", service_date=days[2].service_date, readings=changed)
+    _run(edited)
+    assert len(calls) == 6
+    assert calls[-1] == days[2].service_date
+
+
+def test_fetcher_results_are_memoized_per_key():
+    calls = []
+
+    def _excursions(patient_id, analysis_date):
+        calls.append(analysis_date)
+        return None
+
+    engine = SlidingWindowEngine(
+        _ListSource(_history("p", 14)),
+        RuleRegistry(),
+        summary_cache=DailySummaryCache(),
+        excursion_fetcher=_excursions,
+        fetcher_cache_key=fetch_key_per_week,
+    )
+    engine.run_patient("p")
+    assert len(calls) == 2  # 2024-01-01 is a Monday, so 14 days span two ISO weeks
+
+    calls.clear()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        engine = SlidingWindowEngine(
+            _ListSource(_history("p", 14)),
+            RuleRegistry(),
+            summary_cache=DailySummaryCache(),
+            excursion_fetcher=_excursions,
+            prefetch_executor=executor,
+        )
+        engine.run_patient("p")
+    assert len(calls) == 1
+
+
+class _EvenDayRule(PatternRule):
+    id = "even_day"
+
+    def detect(self, window, context):
+        status = PatternStatus.DETECTED if context.analysis_date.day % 2 == 0 else PatternStatus.NOT_DETECTED
+        return PatternDetection(self.id, context.analysis_date, status)
+
+
+class _CountingSource:
+    def __init__(self, days):
+        self._days = days
+        self.pulled = 0
+
+    def iter_days(self, patient_id):
+        for day in self._days:
+            self.pulled += 1
+            yield day
+
+
+def test_iter_patient_streams_and_filters_statuses():
+    registry = RuleRegistry()
+    registry.register(_EvenDayRule)
+    source = _CountingSource(_history("p", 6))
+    engine = SlidingWindowEngine(
+        source,
+        registry,
+        summary_cache=DailySummaryCache(),
+        analysis_days=2,
+        validation_days=3,
+    )
+
+    stream = engine.iter_patient("p", statuses={PatternStatus.DETECTED})
+    first_date, first = next(stream)
+
+    assert first_date == date(2024, 1, 2)
+    assert source.pulled == 2
+    assert [det.status for det in first] == [PatternStatus.DETECTED]
+    assert [analysis_date.day for analysis_date, _ in stream] == [4, 6]
+
+
+class _AsyncListSource:
+    def __init__(self, days):
+        self._days = days
+
+    async def aiter_days(self, patient_id):
+        for day in self._days:
+            await asyncio.sleep(0)
+            yield day
+
+
+def test_async_driver_matches_sync_for_async_and_threaded_sources():
+    registry = RuleRegistry()
+    registry.register(_WindowEchoRule)
+    days = _history("p", 8)
+
+    def _engine(source):
+        return SlidingWindowEngine(
+            source,
+            registry,
+            summary_cache=DailySummaryCache(),
+            analysis_days=2,
+            validation_days=3,
+        )
+
+    expected = _engine(_ListSource(days)).run_patient("p")
+
+    async def _collect():
+        streamed = await _engine(_AsyncListSource(days)).arun_patient("p")
+        threaded = await _engine(_ListSource(days)).arun_patient("p")
+        return streamed, threaded
+
+    streamed, threaded = asyncio.run(_collect())
+    assert streamed == expected
+    assert threaded == expected
+
+
+class _CountingEchoRule(_WindowEchoRule):
+    id = "counting_echo"
+    calls = 0
+
+    def detect(self, window, context):
+        _CountingEchoRule.calls += 1
+        return replace(super().detect(window, context), pattern_id=self.id, version=self.version)
+
+
+class _CountingEchoRuleV2(_CountingEchoRule):
+    version = "2.0.0"
+
+
+def test_detection_cache_reruns_only_changed_rule_versions(tmp_path):
+    days = _history("p", 10)
+    cache = SqliteDetectionCache(tmp_path / "detections.sqlite")
+
+    def _run(*rule_classes):
+        registry = RuleRegistry()
+        for rule_cls in rule_classes:
+            registry.register(rule_cls)
+        engine = SlidingWindowEngine(
+            _ListSource(days),
+            registry,
+            summary_cache=DailySummaryCache(),
+            analysis_days=3,
+            validation_days=5,
+            detection_cache=cache,
+        )
+        return engine.run_patient("p")
+
+    first = _run(_WindowEchoRule, _CountingEchoRule)
+    assert _CountingEchoRule.calls == 10
+
+    assert _run(_WindowEchoRule, _CountingEchoRule) == first
+    assert _CountingEchoRule.calls == 10
+    assert cache.stats().hits == 20
+
+    bumped = _run(_WindowEchoRule, _CountingEchoRuleV2)
+    assert _CountingEchoRule.calls == 20
+    assert [dets[0] for dets in bumped.values()] == [dets[0] for dets in first.values()]
+    assert {dets[1].version for dets in bumped.values()} == {"2.0.0"}
+
+
+def test_refresh_patient_recomputes_only_dirty_windows(tmp_path):
+    registry = RuleRegistry()
+    registry.register(_WindowEchoRule)
+    ledger = DigestLedger(tmp_path / "ledger.sqlite")
+    days = _history("p", 30)
+
+    def _engine(history):
+        return SlidingWindowEngine(
+            _ListSource(history),
+            registry,
+            summary_cache=DailySummaryCache(),
+            analysis_days=3,
+            validation_days=5,
+        )
+
+    initial = _engine(days).refresh_patient("p", ledger)
+    assert initial.apply({}) == _engine(days).run_patient("p")
+    assert _engine(days).refresh_patient("p", ledger).recomputed == {}
+
+    edited = list(days)
+    edited[10] = CGMDay("p", days[10].service_date, days[10].readings.assign(glucose_mg_dL=60.0))
+    del edited[20]
+    refresh = _engine(edited).refresh_patient("p", ledger)
+
+    assert sorted(d.day for d in refresh.recomputed) == [11, 12, 13, 14, 15, 22, 23, 24, 25]
+    assert refresh.removed == (days[20].service_date,)
+    assert refresh.apply(initial.apply({})) == _engine(edited).run_patient("p")
+
+
+def test_refresh_patient_on_reused_engine_sees_edited_days(tmp_path):
+    registry = RuleRegistry()
+    registry.register(_WindowEchoRule)
+    ledger = DigestLedger(tmp_path / "ledger.sqlite")
+    days = _history("p", 20)
+    source = _ListSource(days)
+    engine = SlidingWindowEngine(source, registry, summary_cache=DailySummaryCache(), analysis_days=3, validation_days=5)
+
+    initial = engine.refresh_patient("p", ledger)
+    edited = list(days)
+    edited[19] = CGMDay("p", days[19].service_date, days[19].readings.assign(glucose_mg_dL=250.0))
+    source._days = edited
+    refresh = engine.refresh_patient("p", ledger)
+
+    fresh = SlidingWindowEngine(
+        _ListSource(edited), registry, summary_cache=DailySummaryCache(), analysis_days=3, validation_days=5
+    )
+    assert refresh.apply(initial.apply({})) == fresh.run_patient("p")
+    assert refresh.recomputed[days[19].service_date][0].metrics["mean"] == 117.0 + 118.0 + 250.0
+
+
+def test_detection_cache_separates_analysis_splits(tmp_path):
+    registry = RuleRegistry()
+    registry.register(_WindowEchoRule)
+    cache = SqliteDetectionCache(tmp_path / "detections.sqlite")
+
+    def _run(analysis_days):
+        engine = SlidingWindowEngine(
+            _ListSource(_history("p", 3)),
+            registry,
+            summary_cache=DailySummaryCache(),
+            analysis_days=analysis_days,
+            validation_days=5,
+            detection_cache=cache,
+        )
+        return engine.run_patient("p")
+
+    _run(3)
+    narrow = _run(1)
+
+    assert narrow[date(2024, 1, 3)][0].metrics["mean"] == 102.0
+    assert cache.stats().hits == 0
+
+
+def test_rerunning_a_patient_keeps_the_summary_cache_bounded():
+    registry = RuleRegistry()
+    registry.register(_WindowEchoRule)
+    cache = DailySummaryCache()
+    engine = SlidingWindowEngine(
+        _ListSource(_history("p", 100)), registry, summary_cache=cache, analysis_days=7, validation_days=14
+    )
+
+    first = engine.run_patient("p")
+    assert len(cache) == 14
+    assert engine.run_patient("p") == first
+    assert engine.run_patient("p") == first
+
+    assert len(cache) == 14
@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.grid import build_day_grid
+from cgm_patterns.models import CGMDay, PatternContext, PatternInputBundle, PatternStatus
+from cgm_patterns.rules_v1.overnight_hypoglycemia import OvernightHypoglycemiaRule
+from cgm_patterns.rules_v1.utils import filter_time_window, prepare_day, total_minutes
+
+
+def _days(count: int) -> list[CGMDay]:
+    rng = np.random.default_rng(7)
+    days = []
+    for offset in range(count):
+        service_date = date(2024, 1, 1) + timedelta(days=offset)
+        timestamps = pd.date_range(pd.Timestamp(service_date) + pd.Timedelta(hours=8), periods=288, freq="5min", tz="UTC")
+        values = rng.normal(110.0, 35.0, size=288)
+        frame = pd.DataFrame({"timestamp": timestamps, "glucose_mg_dL": values})
+        if offset == 1:
+            frame = frame.drop(index=range(20, 80))  # A sensor gap overnight.
+        days.append(CGMDay(patient_id="p", service_date=service_date, readings=frame, local_timezone="America/Los_Angeles"))
+    return days
+
+
+def test_grid_reductions_match_per_day_frames():
+    days = _days(4)
+    # Seed the prepared-day cache with the v1 helpers so the test stays off the global rules registry.
+    bundle = PatternInputBundle(
+        analysis_days=days,
+        validation_days=days[-2:],
+        analysis_summaries=(),
+        validation_summaries=(),
+        prepared_day_cache={day.service_date: prepare_day(day) for day in days},
+    )
+
+    grid = bundle.day_grid()
+
+    assert grid.values.shape == (4, 288)
+    assert bundle.day_grid() is grid
+    assert grid.coverage[1] == (288 - 60 + 2) / 288  # The gap keeps a 15 minute carry-forward.
+    below = grid.minutes_below(70.0, 0.0, 6.0)
+    above = grid.minutes_above(180.0, 22.0, 2.0)
+    for index, day in enumerate(days):
+        if index == 1:
+            continue
+        prepared = prepare_day(day)
+        night = filter_time_window(prepared, 0.0, 6.0)
+        late = filter_time_window(prepared, 22.0, 2.0)
+        assert below[index] == total_minutes(night[night["glucose_mg_dL"] < 70.0])
+        assert above[index] == total_minutes(late[late["glucose_mg_dL"] > 180.0])
+        assert np.isclose(grid.mean(0.0, 6.0)[index], night["glucose_mg_dL"].mean())
+
+    assert grid.last(2).dates == tuple(day.service_date for day in days[-2:])
+
+
+def test_build_day_grid_handles_empty_days():
+    empty = CGMDay(patient_id="p", service_date=date(2024, 1, 1), readings=pd.DataFrame(columns=["timestamp", "glucose_mg_dL"]))
+    grid = build_day_grid([prepare_day(empty)], [empty.service_date], slot_minutes=15)
+
+    assert grid.values.shape == (1, 96)
+    assert grid.coverage.tolist() == [0.0]
+    assert np.isnan(grid.mean()[0])
+
+
+def _local_days(start: date, count: int, lows: dict[date, list[tuple[pd.Timestamp, pd.Timestamp]]]) -> list[CGMDay]:
+    """Local-midnight days of 5-minute readings, 25 hours long when the clock falls back."""
+
+    rng = np.random.default_rng(11)
+    days = []
+    for offset in range(count):
+        service_date = start + timedelta(days=offset)
+        timestamps = pd.date_range(
+            pd.Timestamp(service_date, tz="America/Los_Angeles"),
+            pd.Timestamp(service_date + timedelta(days=1), tz="America/Los_Angeles"),
+            freq="5min",
+            inclusive="left",
+        ).tz_convert("UTC")
+        values = rng.normal(120.0, 15.0, size=len(timestamps))
+        for low_start, low_end in lows.get(service_date, []):
+            values[(timestamps >= low_start) & (timestamps < low_end)] = 55.0
+        frame = pd.DataFrame({"timestamp": timestamps, "glucose_mg_dL": values})
+        days.append(CGMDay("p", service_date, frame, local_timezone="America/Los_Angeles"))
+    return days
+
+
+def _frame_low_days(days: list[CGMDay], threshold: float, minimum: float) -> list[dict]:
+    """The per-day frame computation the rule used before the grid port."""
+
+    qualifying = []
+    for day in days:
+        overnight = filter_time_window(prepare_day(day), 0.0, 6.0)
+        if overnight.empty:
+            continue
+        minutes = total_minutes(overnight.loc[overnight["glucose_mg_dL"] < threshold])
+        if minutes >= minimum:
+            qualifying.append({"service_date": day.service_date.isoformat(), "minutes_low": minutes})
+    return qualifying
+
+
+def test_overnight_hypoglycemia_grid_port_matches_frame_computation():
+    def _utc(text):
+        return pd.Timestamp(text).tz_convert("UTC")
+
+    fall_back = date(2024, 11, 3)
+    lows = {
+        date(2024, 10, 28): [(_utc("2024-10-28 02:00-07:00"), _utc("2024-10-28 02:30-07:00"))],
+        date(2024, 10, 31): [(_utc("2024-10-31 05:50-07:00"), _utc("2024-10-31 06:20-07:00"))],
+        date(2024, 11, 1): [(_utc("2024-11-01 03:00-07:00"), _utc("2024-11-01 03:20-07:00"))],
+        # 10 low minutes on each pass of the repeated hour: 20 in total.
+        fall_back: [
+            (_utc("2024-11-03 01:00-07:00"), _utc("2024-11-03 01:10-07:00")),
+            (_utc("2024-11-03 01:00-08:00"), _utc("2024-11-03 01:10-08:00")),
+        ],
+        date(2024, 11, 5): [(_utc("2024-11-05 00:00-08:00"), _utc("2024-11-05 00:10-08:00"))],
+    }
+    days = _local_days(date(2024, 10, 18), 28, lows)
+    assert len(days[fall_back.toordinal() - days[0].service_date.toordinal()].readings) == 300
+
+    grid = build_day_grid([prepare_day(day) for day in days], [day.service_date for day in days])
+    assert grid.repeated is not None
+    expected = {row["service_date"]: row["minutes_low"] for row in _frame_low_days(days, 70.0, 0.0)}
+    actual = dict(zip((d.isoformat() for d in grid.dates), grid.minutes_below(70.0, 0.0, 6.0)))
+    assert actual == expected and actual[fall_back.isoformat()] == 20.0
+
+    rule = OvernightHypoglycemiaRule()
+    statuses = []
+    for end in range(14, len(days) + 1):
+        validation = days[end - 14 : end]
+        analysis = validation[-7:]
+        window = PatternInputBundle(analysis, validation, (), ())
+        detection = rule.detect(window, PatternContext("p", analysis[-1].service_date))
+        reference = _frame_low_days(analysis, 70.0, 15.0)
+        assert detection.metrics["overnight_low_days"] == len(reference)
+        assert detection.evidence["examples"] == reference[:5]
+        statuses.append(detection.status)
+    # Three of the seven days ending 2024-11-05 qualify only when both passes count.
+    assert PatternStatus.DETECTED in statuses
@@ -0,0 +1,55 @@
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_HEAVY_MODULES = {"pandas", "numpy", "requests", "pydantic"}
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_importing_rules_defers_heavy_dependencies():
+    result = _run("import cgm_patterns.rules", "-X", "importtime")
+    imported = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+    assert not imported & _HEAVY_MODULES
+    assert "cgm_patterns.pattern_catalog" not in imported
+
+
+def test_select_imports_only_requested_rule_modules():
+    code = (
+        "import sys\n"
+        "import cgm_patterns.rules\n"
+        "from cgm_patterns.registry import registry\n"
+        "subset = registry.select({'Somogyi_Effect'})\n"
+        "loaded = sorted(m for m in sys.modules if m.startswith('cgm_patterns.rules.') and m != 'cgm_patterns.rules.utils')\n"
+        "print([rule_id for rule_id, _ in subset.items()], loaded)\n"
+    )
+    result = _run(code)
+
+    assert result.stdout.strip() == "['somogyi_effect'] ['cgm_patterns.rules.somogyi']"
+
+
+def test_manifest_matches_registered_rules():
+    code = (
+        "import cgm_patterns.rules as rules\n"
+        "from cgm_patterns.registry import registry\n"
+        "rules.register_all_rules()\n"
+        "print(sorted(registry._rules) == sorted(rules.RULE_MANIFEST), not registry._pending)\n"
+    )
+    result = _run(code)
+
+    assert result.stdout.strip() == "True True"
@@ -0,0 +1,40 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.parsing import entries_to_columns, loads, parse_local_times, parse_utc_timestamps
+
+
+def test_entries_to_columns_matches_dataframe_for_ragged_entries():
+    entries = [{"utc": "2025-01-01T00:00:00.000", "value": 100.0}, {"value": None, "trend": 1}]
+
+    columns = entries_to_columns(entries)
+
+    assert list(columns) == list(pd.DataFrame(entries).columns)
+    assert columns["trend"] == [None, 1]
+
+
+def test_fixed_format_and_fallback_timestamps_agree():
+    naive = ["2025-04-16T07:13:37.000", None, "2025-04-16T07:28:37.000"]
+    suffixed = ["2025-04-16T07:13:37Z", None, "2025-04-16T00:28:37-07:00"]
+
+    fast = parse_utc_timestamps(naive)
+    fallback = parse_utc_timestamps(suffixed)
+
+    assert str(fast.tz) == "UTC"
+    assert fast.equals(fallback)
+    assert np.isnat(parse_local_times(naive)[1])
+
+
+def test_local_times_keep_wall_clock_when_offsets_present():
+    parsed = parse_local_times(["2025-04-16T00:13:37-07:00"])
+
+    assert parsed[0] == np.datetime64("2025-04-16T00:13:37")
+
+
+def test_loads_accepts_bytes_and_text():
+    assert loads(b'{"a": [1, 2]}') == loads('{"a": [1, 2]}') == {"a": [1, 2]}
@@ -1,7 +1,10 @@
 from datetime import date
 
+import pytest
+
 from cgm_patterns.models import PatternInputBundle, PatternContext
-from cgm_patterns.rule_base import PatternRule
+from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rule_base import PatternRule, RuleParameter
 
 
 class _StubRule(PatternRule):
@@ -14,6 +17,17 @@ class _StubRule(PatternRule):
         raise NotImplementedError
 
 
+class _ParameterizedRule(PatternRule):
+    id = "parameterized"
+    parameters = (
+        RuleParameter("minimum_day_coverage", float, 0.7),
+        RuleParameter("analysis_days_required", int, 5),
+    )
+
+    def detect(self, window: PatternInputBundle, context: PatternContext):  # pragma: no cover - not used
+        raise NotImplementedError
+
+
 def test_pattern_descriptor_exposes_metadata():
     rule = _StubRule()
     descriptor = rule.descriptor
@@ -21,3 +35,36 @@ def test_pattern_descriptor_exposes_metadata():
     assert descriptor.name == "Stub Pattern"
     assert descriptor.version == "2.0.0"
     assert descriptor.inputs == ("cgm", "rolling")
+
+
+def test_descriptor_lists_parameter_defaults():
+    assert _ParameterizedRule().descriptor.config_defaults == {
+        "minimum_day_coverage": 0.7,
+        "analysis_days_required": 5,
+    }
+
+
+def test_config_prefers_pattern_settings_over_thresholds():
+    context = PatternContext(
+        patient_id="p",
+        analysis_date=date(2024, 1, 1),
+        thresholds={"minimum_day_coverage": "0.5", "analysis_days_required": 3},
+        pattern_settings={"parameterized": {"analysis_days_required": "4"}},
+    )
+    config = _ParameterizedRule().config(context)
+    assert config.minimum_day_coverage == 0.5
+    assert config.analysis_days_required == 4
+
+
+def test_compile_config_rejects_invalid_values():
+    with pytest.raises(ValueError, match="analysis_days_required"):
+        _ParameterizedRule().compile_config({"analysis_days_required": "many"}, {})
+
+
+def test_registry_memoizes_compiled_configs():
+    registry = RuleRegistry()
+    registry.register(_ParameterizedRule)
+    first = registry.compile_configs({"minimum_day_coverage": 0.6}, {})
+    second = registry.compile_configs({"minimum_day_coverage": 0.6}, {})
+    assert first is second
+    assert first["parameterized"].minimum_day_coverage == 0.6
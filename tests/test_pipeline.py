@@ -0,0 +1,98 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cgm_patterns.CGM_fetcher as fetcher
+from cgm_patterns.cache import DailySummaryCache
+from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.models import PatternDetection, PatternStatus
+from cgm_patterns.pipeline import Stage, StagedPipeline
+from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rule_base import PatternRule
+from test_cgm_fetcher import _END, _START, _FakeBackend
+
+
+class _IterSource:
+    def iter_days(self, patient_id):
+        return fetcher.iter_cgm_days(patient_id, start=_START, end=_END, chunk_days=2)
+
+
+def test_pipeline_runs_every_item_with_bounded_queues():
+    def _slow_square(value):
+        time.sleep(0.01)
+        return value * value
+
+    pipeline = StagedPipeline(
+        [Stage("fetch", lambda value: value + 1, workers=3), Stage("detect", _slow_square, workers=2)],
+        queue_size=2,
+    )
+
+    results = dict(pipeline.run(range(20)))
+
+    assert results == {value: (value + 1) ** 2 for value in range(20)}
+    fetch, detect = pipeline.report()
+    assert fetch["items"] == detect["items"] == 20
+    assert fetch["max_queue_depth"] <= 2 and detect["max_queue_depth"] <= 2
+    assert fetch["blocked_seconds"] > 0  # The slow stage pushed back on the fast one.
+
+
+def test_pipeline_reraises_stage_errors():
+    def _fail(value):
+        if value == 3:
+            raise RuntimeError("boom")
+        return value
+
+    pipeline = StagedPipeline([Stage("parse", _fail, workers=2)], queue_size=1)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(pipeline.run(range(10)))
+
+
+class _MeanRule(PatternRule):
+    id = "window_mean"
+
+    def detect(self, window, context):
+        return PatternDetection(
+            pattern_id=self.id,
+            effective_date=context.analysis_date,
+            status=PatternStatus.NOT_DETECTED,
+            metrics={"mean": sum(s.mean_glucose for s in window.analysis_summaries)},
+        )
+
+
+def _detect(engine, job):
+    patient_id, days = job
+    return list(engine.evaluate_days(patient_id, days))
+
+
+def test_fetch_parse_detect_stages_match_engine(monkeypatch):
+    monkeypatch.setattr(fetcher, "_request", _FakeBackend())
+    registry = RuleRegistry()
+    registry.register(_MeanRule)
+    engine = SlidingWindowEngine(_IterSource(), registry, summary_cache=DailySummaryCache())
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        pipeline = StagedPipeline(
+            [
+                Stage(
+                    "fetch",
+                    lambda pid: (pid, fetcher.fetch_reading_payloads(pid, start=_START, end=_END, chunk_days=2)),
+                    workers=2,
+                ),
+                Stage("parse", lambda job: (job[0], fetcher.parse_reading_payloads(*job))),
+                Stage("detect", partial(_detect, engine.detached()), workers=2, executor=pool),
+            ],
+            queue_size=1,
+        )
+        results = dict(pipeline.run(["p1", "p2", "p3"]))
+
+    expected = engine.run_patient("p1")
+    assert set(results) == {"p1", "p2", "p3"}
+    assert dict(results["p2"]) == expected
+    assert [row["items"] for row in pipeline.report()] == [3, 3, 3]
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.models import PatternContext, PatternDetection, PatternInputBundle, PatternStatus
+from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rule_base import PatternRule
+
+
+def _empty_window() -> PatternInputBundle:
+    return PatternInputBundle(
+        analysis_days=(),
+        validation_days=(),
+        analysis_summaries=(),
+        validation_summaries=(),
+    )
+
+
+class _SlowRule(PatternRule):
+    id = "slow"
+
+    def detect(self, window, context):
+        time.sleep(0.05)
+        return PatternDetection(self.id, context.analysis_date, PatternStatus.DETECTED, version=self.version)
+
+
+class _FastRule(PatternRule):
+    id = "fast"
+
+    def detect(self, window, context):
+        return PatternDetection(self.id, context.analysis_date, PatternStatus.NOT_DETECTED, version=self.version)
+
+
+class _BrokenRule(PatternRule):
+    id = "broken"
+
+    def detect(self, window, context):
+        raise RuntimeError("boom")
+
+
+def test_detect_all_with_executor_keeps_registration_order():
+    registry = RuleRegistry()
+    registry.register(_SlowRule)
+    registry.register(_FastRule)
+    context = PatternContext(patient_id="p", analysis_date=date(2024, 1, 1))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        detections = registry.detect_all(_empty_window(), context, executor=executor)
+
+    assert [det.pattern_id for det in detections] == ["slow", "fast"]
+
+
+def test_detect_all_with_executor_isolates_rule_errors():
+    registry = RuleRegistry()
+    registry.register(_BrokenRule)
+    registry.register(_FastRule)
+    context = PatternContext(patient_id="p", analysis_date=date(2024, 1, 1))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        detections = registry.detect_all(_empty_window(), context, executor=executor)
+
+    assert detections[0].status is PatternStatus.ERROR
+    assert "boom" in detections[0].evidence["error"]
+    assert detections[1].status is PatternStatus.NOT_DETECTED
+
+
+def test_detect_all_without_executor_isolates_rule_errors():
+    registry = RuleRegistry()
+    registry.register(_BrokenRule)
+    registry.register(_FastRule)
+    context = PatternContext(patient_id="p", analysis_date=date(2024, 1, 1))
+
+    detections = registry.detect_all(_empty_window(), context)
+
+    assert [det.status for det in detections] == [PatternStatus.ERROR, PatternStatus.NOT_DETECTED]
+    assert "boom" in detections[0].evidence["error"]
+
+
+class _DiabetesOnlyRule(PatternRule):
+    id = "diabetes_only"
+    metadata = {"diagnosis_context": "Type 2 Diabetes"}
+
+    def detect(self, window, context):
+        return PatternDetection(self.id, context.analysis_date, PatternStatus.DETECTED, version=self.version)
+
+
+def test_plan_filters_by_diagnosis_and_is_memoized():
+    registry = RuleRegistry()
+    registry.register(_FastRule)
+    registry.register(_DiabetesOnlyRule)
+    prediabetes = PatternContext(
+        patient_id="p", analysis_date=date(2024, 1, 1), extras={"diagnoses": ["Prediabetes"]}
+    )
+    later = PatternContext(
+        patient_id="p", analysis_date=date(2024, 1, 2), extras={"diagnoses": ["prediabetes"]}
+    )
+
+    plan = registry.plan(prediabetes)
+
+    assert [rule.id for rule in plan] == ["fast"]
+    assert registry.plan(later) is plan
+    assert [rule.id for rule in registry.plan(PatternContext("p", date(2024, 1, 1)))] == ["fast", "diabetes_only"]
+
+
+def test_plan_memo_stays_bounded_for_fresh_predicates():
+    registry = RuleRegistry()
+    registry.register(_FastRule)
+    context = PatternContext("p", date(2024, 1, 1))
+
+    for _ in range(500):
+        registry.plan(context, lambda rule: True)
+
+    assert len(registry._plans) <= 64
@@ -0,0 +1,82 @@
+from pathlib import Path
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.scheduling import (
+    CostEstimate,
+    WorkStealingScheduler,
+    estimate_costs,
+    load_timings,
+    plan_longest_first,
+    save_timings,
+)
+
+
+def test_estimates_prefer_timings_then_history_then_available_dates(tmp_path):
+    path = tmp_path / "timings.json"
+    save_timings(path, {"a": 2.0})
+    history = {"a": 100, "b": 50}.get
+    available = {"b": 999, "c": 200}.get
+
+    estimates = estimate_costs(
+        ["a", "b", "c", "d"], timings=load_timings(path), history_days=history, available_dates=available
+    )
+
+    assert [(e.patient_id, e.source) for e in estimates] == [
+        ("a", "timing"),
+        ("b", "history"),
+        ("c", "available_dates"),
+        ("d", "default"),
+    ]
+    # 2s for 100 days calibrates 0.02s per day.
+    assert estimates[1].seconds == pytest.approx(1.0)
+    assert estimates[2].seconds == pytest.approx(4.0)
+    assert estimates[3].seconds == pytest.approx(2.0)
+
+
+def test_longest_first_plan_balances_workers():
+    estimates = [CostEstimate(pid, seconds, "timing") for pid, seconds in zip("abcdef", (1, 8, 3, 4, 5, 3))]
+
+    plan = plan_longest_first(estimates, workers=2)
+
+    assert plan.assignments == (("b", "c", "a"), ("e", "d", "f"))
+    assert plan.predicted_makespan == 12
+
+
+def test_idle_workers_steal_when_estimates_are_wrong():
+    # Equal estimates queue "a", "c", "e" on one worker, but "a" alone takes longer
+    # than everything else, so the other worker should take "c" and "e" over.
+    actual = {"a": 0.3, "b": 0.05, "c": 0.05, "d": 0.05, "e": 0.05}
+    estimates = [CostEstimate(pid, 1.0, "timing") for pid in actual]
+    plan = plan_longest_first(estimates, workers=2)
+    assert plan.assignments == (("a", "c", "e"), ("b", "d"))
+    scheduler = WorkStealingScheduler(plan, estimates)
+
+    def _task(patient_id):
+        time.sleep(actual[patient_id])
+        return patient_id.upper()
+
+    results = dict(scheduler.run(_task))
+
+    assert results == {pid: pid.upper() for pid in actual}
+    report = scheduler.report
+    assert report.stolen == 2
+    assert report.actual_makespan < sum(actual.values())
+    assert set(report.timings) == set(actual)
+
+
+def test_scheduler_reraises_task_errors():
+    estimates = [CostEstimate(pid, 1.0, "default") for pid in "abc"]
+    scheduler = WorkStealingScheduler(plan_longest_first(estimates, workers=2), estimates)
+
+    def _task(patient_id):
+        if patient_id == "b":
+            raise RuntimeError("boom")
+        return patient_id
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(scheduler.run(_task))
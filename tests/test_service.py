@@ -0,0 +1,122 @@
+import asyncio
+from datetime import date
+from pathlib import Path
+import json
+import sys
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.cache import DailySummaryCache
+from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.models import CGMDay, PatternDetection, PatternStatus
+from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rule_base import PatternRule
+from cgm_patterns.service import DetectionService, PatientState, PatientStateCache, StubDaySource
+
+
+class _CountingSource(StubDaySource):
+    def __init__(self, days):
+        super().__init__(days, latency=0.05)
+        self.fetches = []
+
+    def iter_days(self, patient_id):
+        self.fetches.append(patient_id)
+        return super().iter_days(patient_id)
+
+
+class _MeanRule(PatternRule):
+    id = "window_mean"
+
+    def detect(self, window, context):
+        return PatternDetection(
+            pattern_id=self.id,
+            effective_date=context.analysis_date,
+            status=PatternStatus.NOT_DETECTED,
+            metrics={"mean": sum(s.mean_glucose for s in window.analysis_summaries)},
+        )
+
+
+def _service(source, **kwargs) -> DetectionService:
+    registry = RuleRegistry()
+    registry.register(_MeanRule)
+    engine = SlidingWindowEngine(source, registry, summary_cache=DailySummaryCache())
+    return DetectionService(engine, **kwargs)
+
+
+def test_concurrent_requests_share_one_evaluation_and_warm_state():
+    source = _CountingSource(10)
+    service = _service(source)
+
+    async def _scenario():
+        server = await service.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server, httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            urls = [f"/patients/p1/detections?date=2024-01-{day:02d}" for day in range(1, 11)]
+            responses = await asyncio.gather(*(client.get(url) for url in urls))
+            missing = await client.get("/patients/p1/detections?date=2023-12-31")
+            full = await client.get("/patients/p1/detections")
+            stats = (await client.get("/stats")).json()
+        return responses, missing, full, stats
+
+    responses, missing, full, stats = asyncio.run(_scenario())
+
+    assert source.fetches == ["p1"]
+    assert all(response.status_code == 200 for response in responses)
+    body = responses[3].json()
+    assert body["date"] == "2024-01-04"
+    assert body["detections"][0]["pattern_id"] == "window_mean"
+    assert missing.status_code == 404
+    assert len(full.json()["dates"]) == 10
+    assert stats["evaluations"] == 1 and stats["coalesced"] == 9
+
+
+def test_state_cache_evicts_least_recent_patient_past_byte_budget():
+    states = [PatientState(f"p{index}", {date(2024, 1, 1): "[]" * 50}, 100) for index in range(3)]
+    cache = PatientStateCache(max_bytes=250)
+    cache.put(states[0])
+    cache.put(states[1])
+    assert cache.get("p0") is states[0]
+    cache.put(states[2])
+
+    assert cache.get("p1") is None
+    assert cache.nbytes == 200 and len(cache) == 2
+    cache.put(PatientState("big", {}, 300))
+    assert cache.get("big") is None and cache.stats().evictions == 1
+
+
+def test_detections_body_is_valid_json():
+    service = _service(StubDaySource(3))
+
+    body = asyncio.run(service.detections("p9", date(2024, 1, 3)))
+
+    assert json.loads(body)["detections"][0]["effective_date"] == "2024-01-03"
+
+
+class _LevelSource(StubDaySource):
+    def __init__(self, days, level):
+        super().__init__(days)
+        self.level = level
+
+    def iter_days(self, patient_id):
+        for day in super().iter_days(patient_id):
+            yield CGMDay(patient_id, day.service_date, day.readings.assign(glucose_mg_dL=self.level))
+
+
+def test_invalidate_recomputes_summaries_of_changed_readings():
+    source = _LevelSource(3, 110.0)
+    registry = RuleRegistry()
+    registry.register(_MeanRule)
+    # The engine's default, process-wide summary cache must not leak across evaluations.
+    service = DetectionService(SlidingWindowEngine(source, registry))
+
+    def _mean():
+        body = asyncio.run(service.detections("p-invalidate", date(2024, 1, 1)))
+        return json.loads(body)["detections"][0]["metrics"]["mean"]
+
+    assert _mean() == 110.0
+    source.level = 250.0
+    assert _mean() == 110.0
+    assert service.invalidate("p-invalidate")
+    assert _mean() == 250.0
@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.cache import DailySummaryCache
+from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.features import compute_daily_summary
+from cgm_patterns.models import CGMDay
+from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rules_v1.dawn_phenomenon import DawnPhenomenonRule
+from cgm_patterns.rules_v1.predominant_hyperglycemia import PredominantHyperglycemiaRule
+from cgm_patterns.streaming import RunningDaySummary, StreamingSession
+
+
+class _ListSource:
+    def __init__(self, days):
+        self._days = days
+
+    def iter_days(self, patient_id):
+        return iter(self._days)
+
+
+def _days(count: int) -> list[CGMDay]:
+    rng = np.random.default_rng(7)
+    days = []
+    for offset in range(count):
+        service_date = date(2024, 6, 1) + timedelta(days=offset)
+        timestamps = pd.date_range(pd.Timestamp(service_date), periods=288, freq="5min", tz="UTC")
+        values = rng.normal(160.0, 50.0, size=288).clip(40.0, 400.0)
+        values[36:90] += 45.0  # Dawn rise.
+        frame = pd.DataFrame({"timestamp": timestamps, "glucose_mg_dL": values})
+        days.append(CGMDay("p1", service_date, frame))
+    return days
+
+
+def _engine(days) -> SlidingWindowEngine:
+    registry = RuleRegistry()
+    registry.register(DawnPhenomenonRule)
+    registry.register(PredominantHyperglycemiaRule)
+    return SlidingWindowEngine(_ListSource(days), registry, summary_cache=DailySummaryCache())
+
+
+def test_running_summary_matches_daily_summary():
+    day = _days(1)[0]
+    running = RunningDaySummary("p1", day.service_date)
+    for timestamp, value in zip(day.readings["timestamp"][::-1], day.readings["glucose_mg_dL"][::-1]):
+        running.add(timestamp.timestamp(), float(value))
+
+    expected = compute_daily_summary(day)
+    snapshot = running.snapshot()
+    for name in expected.__dataclass_fields__:
+        assert getattr(snapshot, name) == pytest.approx(getattr(expected, name))
+
+
+def test_streamed_day_matches_batch_window():
+    days = _days(15)
+    engine = _engine(days)
+    session = StreamingSession(engine)
+    session.open_patient("p1", history=days[:13])
+
+    for day in days[13:]:
+        readings = day.readings
+        for start in range(0, len(readings), 6):
+            session.append_readings("p1", readings.iloc[start : start + 6])
+
+    expected = engine.run_patient("p1")[days[-1].service_date]
+    latest = session.latest("p1")
+    assert [latest[d.pattern_id].status for d in expected] == [d.status for d in expected]
+    for detection in expected:
+        for name, value in detection.metrics.items():
+            assert latest[detection.pattern_id].metrics[name] == pytest.approx(value)
+    assert session.current_summary("p1").total_readings == 288
+
+
+def test_only_rules_covering_new_readings_rerun():
+    days = _days(3)
+    session = StreamingSession(_engine(days))
+    session.open_patient("p1", history=days[:2])
+    midnight = pd.Timestamp(date(2024, 6, 3), tz="UTC")
+
+    first = session.append_readings("p1", [(midnight + timedelta(hours=10), 120.0)])
+    assert {d.pattern_id for d in first} == {"dawn_phenomenon", "predominant_hyperglycemia"}
+    noon = session.append_readings("p1", [(midnight + timedelta(hours=12), 150.0)])
+    assert [d.pattern_id for d in noon] == ["predominant_hyperglycemia"]
+    dawn = session.append_readings("p1", [(midnight + timedelta(hours=4), 150.0)])
+    assert {d.pattern_id for d in dawn} == {"dawn_phenomenon", "predominant_hyperglycemia"}
+
+    with pytest.raises(ValueError, match="closed day"):
+        session.append_readings("p1", [(midnight - timedelta(hours=1), 100.0)])
+
+
+def test_batch_spanning_midnight_evaluates_each_day():
+    days = _days(15)
+    engine = _engine(days)
+    session = StreamingSession(engine)
+    session.open_patient("p1", history=days[:13])
+
+    both = pd.concat([days[13].readings, days[14].readings], ignore_index=True)
+    detections = session.append_readings("p1", both)
+
+    expected = engine.run_patient("p1")
+    by_date = {}
+    for detection in detections:
+        by_date.setdefault(detection.effective_date, []).append(detection)
+    assert sorted(by_date) == [days[13].service_date, days[14].service_date]
+    for service_date, streamed in by_date.items():
+        assert [d.status for d in streamed] == [d.status for d in expected[service_date]]
+        assert [d.metrics for d in streamed] == pytest.approx([d.metrics for d in expected[service_date]])
@@ -0,0 +1,85 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.cache import DailySummaryCache
+from cgm_patterns.engine import SlidingWindowEngine
+from cgm_patterns.models import CGMDay, PatternContext, PatternStatus
+from cgm_patterns.registry import RuleRegistry
+from cgm_patterns.rules_v1.predominant_hyperglycemia import PredominantHyperglycemiaRule
+from cgm_patterns.sweep import expand_grid, run_sweep
+
+
+class _SyntheticSource:
+    def iter_days(self, patient_id):
+        rng = np.random.default_rng(int(patient_id[1:]))
+        for offset in range(20):
+            service_date = date(2024, 5, 1) + timedelta(days=offset)
+            timestamps = pd.date_range(pd.Timestamp(service_date), periods=288, freq="5min", tz="UTC")
+            values = rng.normal(rng.choice([120.0, 170.0]), 50.0, size=288)
+            yield CGMDay(patient_id, service_date, pd.DataFrame({"timestamp": timestamps, "glucose_mg_dL": values}))
+
+
+def _engine(**kwargs) -> SlidingWindowEngine:
+    registry = RuleRegistry()
+    registry.register(PredominantHyperglycemiaRule)
+    return SlidingWindowEngine(_SyntheticSource(), registry, summary_cache=DailySummaryCache(), **kwargs)
+
+
+def test_sweep_matches_one_run_per_threshold():
+    engine = _engine()
+    rule = PredominantHyperglycemiaRule()
+    grid = {"tar_threshold": [0.1, "0.3", 0.6], "tar_days_fraction_threshold": [0.4, 0.8]}
+    patients = ["p1", "p2", "p3"]
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = run_sweep(engine, rule, grid, patients, executor=executor)
+
+    assert result.points[1] == {"tar_threshold": 0.1, "tar_days_fraction_threshold": 0.8}
+    curve = result.prevalence()
+    assert [row["patients"] for row in curve] == [3] * 6
+    for index, point in enumerate(result.points):
+        reference = _engine(default_pattern_settings={rule.id: point})
+        for patient_id in patients:
+            statuses = [ds[0].status for ds in reference.run_patient(patient_id).values()]
+            count = next(c for c in result.counts if c.point == index and c.patient_id == patient_id)
+            assert count.windows == len(statuses)
+            assert count.detected == statuses.count(PatternStatus.DETECTED)
+            assert count.insufficient == statuses.count(PatternStatus.INSUFFICIENT_DATA)
+    assert curve[0]["windows_detected"] >= curve[4]["windows_detected"]
+
+
+def test_expand_grid_rejects_unknown_parameters():
+    with pytest.raises(ValueError, match="no parameters named bogus"):
+        expand_grid(PredominantHyperglycemiaRule(), {"bogus": [1]})
+
+
+class _Type2OnlyRule(PredominantHyperglycemiaRule):
+    metadata = {"diagnosis_context": "t2d"}
+
+
+def test_sweep_skips_patients_the_rule_does_not_apply_to():
+    registry = RuleRegistry()
+    registry.register(_Type2OnlyRule)
+    diagnoses = {"p1": "t2d", "p2": "t1d"}
+
+    def _context(patient_id, analysis_date):
+        return PatternContext(patient_id, analysis_date, extras={"diagnosis_context": diagnoses[patient_id]})
+
+    engine = SlidingWindowEngine(
+        _SyntheticSource(), registry, summary_cache=DailySummaryCache(), context_builder=_context
+    )
+    rule = registry.get(_Type2OnlyRule.id)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = run_sweep(engine, rule, {"tar_threshold": [0.1, 0.3]}, ["p1", "p2"], executor=executor)
+
+    assert {count.patient_id for count in result.counts} == {"p1"}
+    assert [row["patients"] for row in result.prevalence()] == [1, 1]
@@ -0,0 +1,27 @@
+from datetime import timedelta, timezone
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cgm_patterns.timezones import local_minute_of_day, resolve_timezone
+
+
+def test_resolve_timezone_handles_iana_and_offset_labels():
+    assert resolve_timezone("UTC-07:00") == timezone(-timedelta(hours=7))
+    assert resolve_timezone("UTC+05:30") == timezone(timedelta(hours=5, minutes=30))
+    assert str(resolve_timezone("America/New_York")) == "America/New_York"
+    assert resolve_timezone("Not/A_Zone") is None
+    assert resolve_timezone("UTC-07:00") is resolve_timezone("UTC-07:00")
+
+
+def test_local_minute_of_day_matches_tz_convert():
+    timestamps = pd.Series(pd.date_range("2024-03-09T00:00Z", periods=300, freq="17min"))
+    for label in ("UTC-07:00", "UTC+05:30", "America/New_York"):
+        tz = resolve_timezone(label)
+        local = timestamps.dt.tz_convert(tz)
+        expected = (local.dt.hour * 60 + local.dt.minute).to_numpy()
+
+        assert (local_minute_of_day(timestamps, tz) == expected).all()